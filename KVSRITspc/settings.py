@@ -12,6 +12,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +45,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'portal.middleware.PrecompressedStaticMiddleware',
+    'portal.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -86,6 +89,96 @@ DATABASES = {
     }
 }
 
+# Read replicas (see portal/routers.py): add each replica to DATABASES with
+# the same credentials it would have on the primary, and list its alias here.
+# GET/HEAD requests then read from a random replica; writes, POST flows
+# (login, team create/join) and a browser's requests for
+# REPLICA_STICKY_SECONDS after it last wrote stay on 'default'.
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ['portal.routers.PrimaryReplicaRouter']
+REPLICA_STICKY_SECONDS = 10
+
+# KVS_DATABASE=sqlite_replica stands two local SQLite files in for a primary
+# and one replica, e.g. to run the routing tests without MySQL:
+#   KVS_DATABASE=sqlite_replica python manage.py test portal.tests.ReplicaRoutingTest
+# Nothing replicates between them; migrate both with --database.
+if os.environ.get('KVS_DATABASE') == 'sqlite_replica':
+    DATABASES = {
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'db.sqlite3'},
+        'replica': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'db_replica.sqlite3'},
+    }
+    DATABASE_REPLICAS = ['replica']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# LocMemCache is per-process: with several workers, point this at a shared
+# backend (Redis/Memcached) so signal invalidation reaches every process.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'kvsritspc',
+    }
+}
+
+# Seconds an anonymous landing/event page stays cached. Admin edits to event
+# content invalidate it immediately (see portal/signals.py).
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Seconds a cached unread-notification count may live; it is also kept
+# current by the Notification/Announcement signals (see portal/notifications.py)
+UNREAD_COUNT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Seconds precomputed teammate suggestions stay cached. `manage.py
+# recommend_teammates` should run well within it (e.g. every 15 minutes from
+# cron) so the dashboard never falls back to showing none.
+RECOMMENDATION_CACHE_TIMEOUT = 60 * 60 * 2
+
+# Upper bound on how long browsers and proxies may cache an event's
+# timeline.json. It normally expires at the next phase boundary; the cap
+# lets an admin's date change reach open tabs before then.
+TIMELINE_MAX_AGE = 60 * 60
+
+# Live updates pushed over Server-Sent Events (see portal/live.py). The stream
+# is only served under KVSRITspc.asgi; WSGI deployments answer it with 204 and
+# pages fall back to their own refresh timers. LocalBroker reaches streams in
+# the publishing process only: with several ASGI workers, or with writes made
+# through a WSGI deployment, use
+#   {'BACKEND': 'portal.live.RedisBroker', 'OPTIONS': {'url': 'redis://...'}}
+LIVE_BROKER = {'BACKEND': 'portal.live.LocalBroker'}
+# Seconds between keepalive comments on an idle stream
+LIVE_KEEPALIVE = 15
+# Milliseconds a browser waits before reconnecting a dropped stream
+LIVE_RETRY_MS = 3000
+
+# Judges each submission is queued for by `manage.py assign_judges`
+JUDGES_PER_SUBMISSION = 3
+
+
+# Sessions and messages
+# https://docs.djangoproject.com/en/5.2/topics/http/sessions/#configuring-the-session-engine
+# KVS_SESSION_ENGINE picks the session store per environment:
+#   db              default; every logged-in request reads django_session.
+#   cached_db       reads are served from CACHES and writes go through to the
+#                   DB. Needs a shared cache (Redis/Memcached) with several
+#                   workers, or each process warms its own copy.
+#   signed_cookies  no server-side storage at all. A session cannot be revoked
+#                   (logout only clears that browser's cookie) and its content
+#                   is signed, not encrypted.
+# `manage.py benchmark_sessions` compares them on this deployment, and
+# `manage.py clear_expired_sessions` prunes django_session in batches.
+SESSION_ENGINE = 'django.contrib.sessions.backends.' + os.environ.get('KVS_SESSION_ENGINE', 'db')
+
+# Flash messages travel in a signed cookie, so messages.success() in the
+# login and team views never reads or writes the session.
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+
+# The session's user is loaded with its profile in a single query (see
+# portal/backends.py). Changing this logs out sessions created under a
+# backend that is no longer listed.
+AUTHENTICATION_BACKENDS = ['portal.backends.ProfileModelBackend']
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -122,6 +215,23 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# With DEBUG off, `manage.py collectstatic` writes content-hashed names plus
+# .gz (and, with the brotli package installed, .br) copies, which
+# portal.middleware.PrecompressedStaticMiddleware serves with far-future
+# immutable caching. Run collectstatic on every deploy.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'portal.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
 
 
 # Media files (User-uploaded content)
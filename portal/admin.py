@@ -1,4 +1,6 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.shortcuts import render
 admin.site.site_header = 'CampusInnovate administration'
 admin.site.site_title = 'CampusInnovate administration'
 admin.site.index_title = 'CampusInnovate Dashboard'
@@ -8,8 +10,11 @@ from .models import (
     UserProfile, Event, FAQ, Schedule, SubSchedule, Team, TeamMember, 
     Submission, TeamInvite, Eligibility, HowToParticipateStep, Organizer, 
     ProblemStatement, JudgingScore, Announcement, Notification, 
-    Certificate, Resource, Feedback, EventMedia, InviteCode
+    Certificate, Resource, Feedback, EventMedia, InviteCode, LeaderboardEntry
 )
+from . import bulk, exports, routers, skills
+from .forms import TeamNotificationForm
+from .pagination import EstimatedCountPaginator
 
 # --- User Profile Management ---
 class UserProfileInline(admin.StackedInline):
@@ -22,12 +27,148 @@ class CustomUserAdmin(BaseUserAdmin):
     list_display = ('username', 'email', 'get_user_role', 'is_staff')
     list_select_related = ('userprofile',)
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # The inline edits the skill fields outside UserProfileForm
+        if hasattr(form.instance, 'userprofile'):
+            skills.index_profile(form.instance.userprofile)
+
     def get_user_role(self, instance):
         if hasattr(instance, 'userprofile'):
             return instance.userprofile.get_user_role_display()
         return 'No Profile'
     get_user_role.short_description = 'Role'
 
+# --- Streaming Exports ---
+class ExportActionsMixin:
+    """Admin actions streaming the selected rows through portal/exports.py."""
+    export_kind = None
+    actions = ['export_csv', 'export_jsonl']
+
+    @admin.action(description='Export selected rows as CSV')
+    def export_csv(self, request, queryset):
+        # Read-only despite the POST, so it can use a replica
+        with routers.replica_reads():
+            return exports.streaming_response(self.export_kind, 'csv', queryset)
+
+    @admin.action(description='Export selected rows as JSON Lines')
+    def export_jsonl(self, request, queryset):
+        with routers.replica_reads():
+            return exports.streaming_response(self.export_kind, 'jsonl', queryset)
+
+# --- Bulk Actions ---
+def confirm_bulk_action(model_admin, request, queryset, action, form=None, warning=None):
+    """
+    Intermediate page of a bulk action: reposts the selection with 'apply'
+    (and the form's fields) to run it.
+    """
+    select_across = request.POST.get('select_across') == '1'
+    return render(request, 'admin/portal/confirm_bulk_action.html', {
+        **model_admin.admin_site.each_context(request),
+        'title': model_admin.get_action(action)[2],
+        'opts': model_admin.model._meta,
+        'action': action,
+        'form': form,
+        'warning': warning,
+        'count': queryset.count(),
+        'select_across': select_across,
+        # Reposted even with select_across: changelist_view only runs an
+        # action when some rows are checked, as delete_selected does too
+        'selected': request.POST.getlist(ACTION_CHECKBOX_NAME),
+        'action_checkbox_name': ACTION_CHECKBOX_NAME,
+    })
+
+# --- Large Tables ---
+# These grow with every participant. Listings join their foreign keys in the
+# list query, search only indexed columns (exact or prefix matches), skip the
+# second full-table COUNT(*) and estimate the count of unfiltered listings.
+# Foreign keys are edited with autocomplete widgets instead of a <select> of
+# every User.
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+@admin.register(Team)
+class TeamAdmin(ExportActionsMixin, LargeTableAdmin):
+    export_kind = 'teams'
+    actions = ['notify_members', 'disband_teams', *ExportActionsMixin.actions]
+    list_display = ('team_name', 'team_code', 'event', 'leader', 'member_count', 'max_size', 'created_at')
+    list_select_related = ('event', 'leader')
+    search_fields = ('=team_code', '^team_name', '^leader__username')
+    autocomplete_fields = ('event', 'leader')
+
+    @admin.action(description='Notify the members of the selected teams')
+    def notify_members(self, request, queryset):
+        form = TeamNotificationForm(request.POST if 'apply' in request.POST else None)
+        if not form.is_valid():
+            return confirm_bulk_action(self, request, queryset, 'notify_members', form=form)
+        sent = bulk.notify_team_members(queryset, form.cleaned_data['message'])
+        self.message_user(request, f"Sent {sent} notifications.", messages.SUCCESS)
+
+    @admin.action(description='Disband the selected teams', permissions=['delete'])
+    def disband_teams(self, request, queryset):
+        if 'apply' not in request.POST:
+            return confirm_bulk_action(
+                self, request, queryset, 'disband_teams',
+                warning="Their members, submissions and scores are deleted as well.",
+            )
+        disbanded = bulk.disband_teams(queryset)
+        self.message_user(request, f"Disbanded {disbanded} teams.", messages.SUCCESS)
+
+@admin.register(TeamMember)
+class TeamMemberAdmin(ExportActionsMixin, LargeTableAdmin):
+    export_kind = 'members'
+    list_display = ('participant', 'team', 'role', 'status', 'joined_at')
+    list_select_related = ('participant', 'team')
+    list_filter = ('status',)
+    search_fields = ('^participant__username', '=team__team_code')
+    autocomplete_fields = ('team', 'participant')
+
+@admin.register(Submission)
+class SubmissionAdmin(ExportActionsMixin, LargeTableAdmin):
+    export_kind = 'submissions'
+    list_display = ('project_title', 'team', 'problem_statement', 'submitted_at', 'is_disqualified')
+    list_select_related = ('team', 'problem_statement')
+    search_fields = ('=team__team_code', '^team__team_name')
+    list_filter = ('is_disqualified',)
+    autocomplete_fields = ('team',)
+    raw_id_fields = ('problem_statement',)
+    actions = ['disqualify', *ExportActionsMixin.actions]
+
+    @admin.action(description='Disqualify the selected submissions', permissions=['change'])
+    def disqualify(self, request, queryset):
+        disqualified = bulk.disqualify_submissions(queryset)
+        self.message_user(request, f"Disqualified {disqualified} submissions.", messages.SUCCESS)
+
+@admin.register(JudgingScore)
+class JudgingScoreAdmin(ExportActionsMixin, LargeTableAdmin):
+    export_kind = 'scores'
+    list_display = ('submission', 'judge', 'score')
+    list_select_related = ('submission', 'judge')
+    search_fields = ('^judge__username', '=submission__team__team_code')
+    autocomplete_fields = ('judge', 'submission')
+
+@admin.register(Notification)
+class NotificationAdmin(LargeTableAdmin):
+    list_display = ('user', 'short_message', 'is_read', 'created_at')
+    list_select_related = ('user',)
+    list_filter = ('is_read',)
+    search_fields = ('^user__username',)
+    autocomplete_fields = ('user',)
+
+    def short_message(self, instance):
+        return instance.message[:80]
+    short_message.short_description = 'Message'
+
+@admin.register(Feedback)
+class FeedbackAdmin(LargeTableAdmin):
+    list_display = ('event', 'participant', 'rating')
+    list_select_related = ('event', 'participant')
+    list_filter = ('rating',)
+    search_fields = ('^participant__username',)
+    autocomplete_fields = ('event', 'participant')
+
 # --- Event Management Inlines ---
 class SubScheduleInline(admin.TabularInline):
     model = SubSchedule
@@ -45,6 +186,7 @@ class EventMediaInline(admin.StackedInline): model = EventMedia; can_delete = Fa
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
     list_display = ('event_name', 'title', 'registration_link', 'about_item_name', 'what_item_name')
+    search_fields = ('event_name', 'title')
     fields = [
         'event_name', 'title', 'hero_section_details', 'registration_link',
         'registration_start', 'registration_end', 'event_start', 'event_end',
@@ -57,6 +199,23 @@ class EventAdmin(admin.ModelAdmin):
         EventMediaInline, ScheduleInline, ProblemStatementInline, EligibilityInline,
         HowToParticipateStepInline, OrganizerInline, FAQInline,
     ]
+    actions = ['publish_events', 'complete_events', 'cancel_events']
+
+    def _set_status(self, request, queryset, status):
+        updated = bulk.set_event_status(queryset, status)
+        self.message_user(request, f"Marked {updated} events as {status}.", messages.SUCCESS)
+
+    @admin.action(description='Publish the selected events', permissions=['change'])
+    def publish_events(self, request, queryset):
+        self._set_status(request, queryset, 'published')
+
+    @admin.action(description='Mark the selected events completed', permissions=['change'])
+    def complete_events(self, request, queryset):
+        self._set_status(request, queryset, 'completed')
+
+    @admin.action(description='Cancel the selected events', permissions=['change'])
+    def cancel_events(self, request, queryset):
+        self._set_status(request, queryset, 'canceled')
 
 @admin.register(Schedule)
 class ScheduleAdmin(admin.ModelAdmin):
@@ -67,19 +226,27 @@ class ScheduleAdmin(admin.ModelAdmin):
 class SubScheduleAdmin(admin.ModelAdmin):
     list_display = ('title', 'time', 'schedule')
 
+@admin.register(LeaderboardEntry)
+class LeaderboardEntryAdmin(admin.ModelAdmin):
+    list_display = ('submission', 'team_name', 'score_count', 'score_mean', 'score_min', 'score_max', 'normalized_score')
+    list_select_related = ('submission__team',)
+    ordering = ('-score_mean', 'submission_id')
+    readonly_fields = [f.name for f in LeaderboardEntry._meta.fields]
+
+    def team_name(self, instance):
+        return instance.submission.team.team_name
+    team_name.short_description = 'Team'
+
+    def has_add_permission(self, request):
+        return False
+
 # Re-register User admin
 admin.site.unregister(User)
 admin.site.register(User, CustomUserAdmin)
 
 # Register other models
-admin.site.register(Team)
-admin.site.register(TeamMember)
-admin.site.register(Submission)
 admin.site.register(TeamInvite)
-admin.site.register(JudgingScore)
 admin.site.register(Announcement)
-admin.site.register(Notification)
 admin.site.register(Certificate)
 admin.site.register(Resource)
-admin.site.register(Feedback)
 admin.site.register(InviteCode)
\ No newline at end of file
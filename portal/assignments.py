@@ -0,0 +1,98 @@
+import heapq
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Subquery
+
+from .models import JudgeAssignment, JudgingScore, ProblemStatement, Submission, TeamMember, User
+
+# ==============================================================================
+# JUDGE ASSIGNMENT SCHEDULER
+# ==============================================================================
+def judge_ids():
+    return list(
+        User.objects.filter(userprofile__user_role='Judge', is_active=True)
+        .order_by('id').values_list('id', flat=True)
+    )
+
+
+def assign_submissions(judges_per_submission=None, batch_size=1000):
+    """
+    Gives every submission to `judges_per_submission` judges (capped at the
+    number of eligible judges), always picking the least-loaded ones. A judge
+    who is a member of the submitting team is never assigned to it.
+    Existing assignments are kept, so this is safe to re-run after new
+    submissions or judges arrive. Returns the number of assignments created.
+    """
+    per_submission = judges_per_submission or settings.JUDGES_PER_SUBMISSION
+    judges = judge_ids()
+    if not judges:
+        return 0
+
+    loads = dict.fromkeys(judges, 0)
+    loads.update(
+        JudgeAssignment.objects.filter(judge_id__in=judges)
+        .values_list('judge_id').annotate(load=Count('id')).order_by()
+    )
+    # Min-heap of (load, judge id): the next pick is always the idlest judge.
+    heap = [(load, judge_id) for judge_id, load in loads.items()]
+    heapq.heapify(heap)
+
+    conflicts = set(
+        TeamMember.objects.filter(participant_id__in=judges).values_list('participant_id', 'team_id')
+    )
+    assigned = {}
+    for judge_id, submission_id in JudgeAssignment.objects.values_list('judge_id', 'submission_id'):
+        assigned.setdefault(submission_id, set()).add(judge_id)
+
+    pending = (
+        Submission.objects.annotate(assigned_count=Count('judge_assignments'))
+        .filter(assigned_count__lt=per_submission)
+        .order_by('id').values_list('id', 'team_id')
+    )
+    new_assignments = []
+    for submission_id, team_id in pending:
+        already = assigned.get(submission_id, set())
+        skipped, picked = [], []
+        while heap and len(already) + len(picked) < per_submission:
+            load, judge_id = heapq.heappop(heap)
+            if judge_id in already or (judge_id, team_id) in conflicts:
+                skipped.append((load, judge_id))
+            else:
+                picked.append((load + 1, judge_id))
+        for item in skipped + picked:
+            heapq.heappush(heap, item)
+        new_assignments.extend(
+            JudgeAssignment(judge_id=judge_id, submission_id=submission_id) for _, judge_id in picked
+        )
+
+    with transaction.atomic():
+        JudgeAssignment.objects.bulk_create(new_assignments, batch_size=batch_size, ignore_conflicts=True)
+    return len(new_assignments)
+
+
+# ==============================================================================
+# JUDGE WORK QUEUE
+# ==============================================================================
+def unscored_queue(judge, after=None, page_size=20):
+    """
+    One page of the judge's assigned submissions they have not scored yet,
+    keyset-paginated on submission id so every page costs the same single
+    query no matter how deep the judge is in the queue.
+    Returns (submissions, next_cursor); next_cursor is None on the last page.
+    """
+    queue = (
+        Submission.objects.filter(judge_assignments__judge=judge)
+        .filter(~Exists(JudgingScore.objects.filter(judge=judge, submission=OuterRef('pk'))))
+        .select_related('team__event')
+        .annotate(first_unlock=Subquery(
+            ProblemStatement.objects.filter(event=OuterRef('team__event')).order_by('pk').values('time_to_unlock')[:1]
+        ))
+        .order_by('pk')
+    )
+    if after is not None:
+        queue = queue.filter(pk__gt=after)
+    submissions = list(queue[:page_size + 1])
+    if len(submissions) > page_size:
+        return submissions[:page_size], submissions[page_size - 1].pk
+    return submissions, None
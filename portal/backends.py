@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    ModelBackend that loads the session's user together with its UserProfile
+    in one joined query. role_required and the templates then read
+    user.userprofile without querying it again on every request, which in an
+    async view (request.auser()) is also what keeps that read out of the
+    event loop.
+    """
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related('userprofile').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = await UserModel._default_manager.select_related('userprofile').aget(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,120 @@
+from django.db import connections, transaction
+
+from . import images, leaderboard, live, notifications
+from .cache import invalidate_event_pages
+from .models import (
+    Event, JudgeAssignment, JudgingScore, LeaderboardEntry, Notification,
+    Submission, Team, TeamMember
+)
+
+# ==============================================================================
+# SET-BASED BULK OPERATIONS (admin actions)
+# ==============================================================================
+# Each operation is a handful of statements however many rows are selected:
+# update() and bulk_create() instead of a save() per row. Work the per-row
+# signals would have done (cache invalidation, counters, leaderboard) is done
+# once for the whole set instead. Every function returns the affected count.
+NOTIFY_BATCH_SIZE = 1000
+
+
+def set_event_status(events, status):
+    """Moves the events to status (published/completed/canceled)."""
+    with transaction.atomic():
+        event_ids = list(events.exclude(event_status=status).values_list('pk', flat=True))
+        updated = Event.objects.filter(pk__in=event_ids).update(event_status=status)
+
+        def invalidate():
+            for event_id in event_ids:
+                invalidate_event_pages(event_id)
+                # What publish_timeline_change would have sent per save()
+                live.publish(live.event_channel(event_id), 'timeline')
+            # Only published events' announcements are counted as unread
+            notifications.announcements_changed()
+        transaction.on_commit(invalidate)
+    return updated
+
+
+def notify_team_members(teams, message):
+    """Sends one personal notification to every accepted member of the teams."""
+    with transaction.atomic():
+        user_ids = list(
+            TeamMember.objects.filter(team__in=teams, status='accepted')
+            .values_list('participant_id', flat=True).distinct().order_by()
+        )
+        Notification.objects.bulk_create(
+            (Notification(user_id=user_id, message=message) for user_id in user_ids),
+            batch_size=NOTIFY_BATCH_SIZE,
+        )
+        transaction.on_commit(lambda: notifications.personal_unread_reset(user_ids))
+    return len(user_ids)
+
+
+def _delete_without_signals(model, column, parents):
+    """
+    DELETE FROM model's table WHERE column IN (parents' primary keys), as one
+    statement: no rows are loaded and no post_delete receivers run, so the
+    caller does their work for the whole set. parents is a queryset of
+    another table (MySQL cannot delete from a table it selects from).
+    """
+    subquery, params = parents.values('pk').query.sql_with_params()
+    connection = connections[parents.db]
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(model._meta.db_table)} WHERE {quote(column)} IN ({subquery})", params,
+        )
+
+
+def disband_teams(teams):
+    """
+    Deletes the teams with their members, submissions and scores.
+
+    Members, submissions and scores are deleted with one DELETE per table.
+    Going through the ORM's collector instead would load each of those rows
+    to fire its post_delete receivers, which cost a query per member (the
+    team counter) and per score (the leaderboard); what those receivers do
+    is done here once for the whole set instead.
+    """
+    with transaction.atomic():
+        team_ids = list(teams.values_list('pk', flat=True))
+        disbanded = Team.objects.filter(pk__in=team_ids)
+        submissions = Submission.objects.filter(team_id__in=team_ids)
+        scores = JudgingScore.objects.filter(submission__in=submissions)
+        judge_ids = list(scores.values_list('judge_id', flat=True).distinct().order_by())
+        uploads = list(submissions.exclude(image_upload='').exclude(image_upload=None)
+                       .values_list('image_upload', flat=True))
+        members = list(
+            TeamMember.objects.filter(team_id__in=team_ids)
+            .values('team_id', 'participant_id', 'status', 'team__team_name', 'team__leader_id')
+        )
+
+        # Children first. Entries and assignments have no receivers, so
+        # delete() removes them in one statement too.
+        LeaderboardEntry.objects.filter(submission__in=submissions).delete()
+        JudgeAssignment.objects.filter(submission__in=submissions).delete()
+        _delete_without_signals(JudgingScore, 'submission_id', submissions)
+        _delete_without_signals(Submission, 'team_id', disbanded)
+        _delete_without_signals(TeamMember, 'team_id', disbanded)
+        # What is left (invites) has no receivers and is deleted set-based too
+        deleted = disbanded.delete()[1].get(Team._meta.label, 0)
+
+        # The work of the skipped receivers: the leaderboard, upload
+        # cleanup and the members' live "left" messages
+        if judge_ids:
+            leaderboard.judges_changed(judge_ids)
+        for name in uploads:
+            transaction.on_commit(lambda name=name: images.schedule_cleanup(name))
+
+        def publish_departures():
+            for member in members:
+                data = {'team_id': member['team_id'], 'participant_id': member['participant_id'],
+                        'status': member['status'], 'change': 'left', 'team_name': member['team__team_name']}
+                for user_id in {member['participant_id'], member['team__leader_id']}:
+                    live.publish(live.user_channel(user_id), 'membership', data)
+        transaction.on_commit(publish_departures)
+    return deleted
+
+
+def disqualify_submissions(submissions):
+    """Flags the submissions as disqualified, which drops them from the leaderboard."""
+    return submissions.filter(is_disqualified=False).update(is_disqualified=True)
@@ -0,0 +1,193 @@
+import asyncio
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .routers import primary_reads
+
+# ==============================================================================
+# SINGLE-FLIGHT REBUILDS
+# ==============================================================================
+# Seconds one worker may hold a rebuild lock; others wait at most this long.
+REBUILD_LOCK_TIMEOUT = 10
+REBUILD_POLL_INTERVAL = 0.01
+
+
+def _fresh(entry):
+    return entry is not None and (entry[0] is None or timezone.now() < entry[0])
+
+
+def _entry(value, expires_at, timeout):
+    """The (expires_at, value) entry to cache and its timeout, or None when already stale."""
+    if expires_at is None:
+        return (None, value), timeout
+    remaining = (expires_at - timezone.now()).total_seconds()
+    if remaining > 0:
+        return (expires_at, value), min(timeout, remaining + 1)
+    return None
+
+
+def _rebuild(key, rebuild, timeout):
+    # A lagging replica would cache the rows the invalidating write replaced
+    with primary_reads():
+        value, expires_at = rebuild()
+    entry = _entry(value, expires_at, timeout)
+    if entry is not None:
+        cache.set(key, *entry)
+    return value
+
+
+async def _arebuild(key, rebuild, timeout):
+    with primary_reads():
+        value, expires_at = await rebuild()
+    entry = _entry(value, expires_at, timeout)
+    if entry is not None:
+        await cache.aset(key, *entry)
+    return value
+
+
+def single_flight(key, rebuild, timeout):
+    """
+    Returns the value cached under key. On a miss only one worker calls
+    rebuild(); concurrent misses wait for its result instead of all hitting
+    the database at once.
+
+    rebuild() returns (value, expires_at). A value with an expires_at (an
+    aware datetime) goes stale at exactly that instant, even if the cache
+    timeout has not run out; one that is already stale is returned but not
+    cached.
+    """
+    entry = cache.get(key)
+    if _fresh(entry):
+        return entry[1]
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, REBUILD_LOCK_TIMEOUT):
+        try:
+            return _rebuild(key, rebuild, timeout)
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + REBUILD_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(REBUILD_POLL_INTERVAL)
+        entry = cache.get(key)
+        if _fresh(entry):
+            return entry[1]
+        if cache.get(lock_key) is None:
+            break
+    # The rebuilt value was not cacheable, or the rebuild is stuck
+    entry = cache.get(key)
+    if _fresh(entry):
+        return entry[1]
+    return _rebuild(key, rebuild, timeout)
+
+
+async def asingle_flight(key, rebuild, timeout):
+    """
+    single_flight() for async views: rebuild is a coroutine function, and
+    waiting for another worker's rebuild does not block the event loop.
+    """
+    entry = await cache.aget(key)
+    if _fresh(entry):
+        return entry[1]
+
+    lock_key = f"{key}:lock"
+    if await cache.aadd(lock_key, 1, REBUILD_LOCK_TIMEOUT):
+        try:
+            return await _arebuild(key, rebuild, timeout)
+        finally:
+            await cache.adelete(lock_key)
+
+    deadline = time.monotonic() + REBUILD_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(REBUILD_POLL_INTERVAL)
+        entry = await cache.aget(key)
+        if _fresh(entry):
+            return entry[1]
+        if await cache.aget(lock_key) is None:
+            break
+    entry = await cache.aget(key)
+    if _fresh(entry):
+        return entry[1]
+    return await _arebuild(key, rebuild, timeout)
+
+
+# ==============================================================================
+# RENDERED PAGE CACHE (anonymous visitors only)
+# ==============================================================================
+PAGE_CACHE_PREFIX = 'portal:page'
+
+
+def page_cache_key(page, event_id=None):
+    """
+    Builds the cache key for a rendered public page, e.g. 'portal:page:event:3'.
+    """
+    if event_id is None:
+        return f"{PAGE_CACHE_PREFIX}:{page}"
+    return f"{PAGE_CACHE_PREFIX}:{page}:{event_id}"
+
+
+def cache_anonymous_page(page):
+    """
+    Decorator that serves a fully rendered response from the cache to anonymous
+    GET requests. Logged-in users always get a freshly rendered page.
+    The cached copy is dropped by the model signals in portal/signals.py, and
+    expires at the response's page_cache_expires_at if the view sets one.
+    Works on both sync and async views.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped_view(request, *args, **kwargs):
+                if request.method != 'GET' or (await request.auser()).is_authenticated:
+                    return await view_func(request, *args, **kwargs)
+
+                async def render():
+                    response = await view_func(request, *args, **kwargs)
+                    return response, _cacheable_until(response)
+
+                key = page_cache_key(page, kwargs.get('event_id'))
+                return await asingle_flight(key, render, settings.PAGE_CACHE_TIMEOUT)
+            return _wrapped_view
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if request.method != 'GET' or request.user.is_authenticated:
+                return view_func(request, *args, **kwargs)
+
+            def render():
+                response = view_func(request, *args, **kwargs)
+                return response, _cacheable_until(response)
+
+            key = page_cache_key(page, kwargs.get('event_id'))
+            return single_flight(key, render, settings.PAGE_CACHE_TIMEOUT)
+        return _wrapped_view
+    return decorator
+
+
+def _cacheable_until(response):
+    """When a rendered page stops being cacheable: now if it must not be cached at all."""
+    # Only cache plain successful pages; anything that sets a cookie
+    # (CSRF, session, messages) is specific to this visitor.
+    if response.status_code != 200 or response.cookies:
+        return timezone.now()
+    return getattr(response, 'page_cache_expires_at', None)
+
+
+def invalidate_event_pages(event_id):
+    """
+    Drops every cached page that renders the given event, and its timeline.
+    The landing page shows the latest published event, so it is dropped
+    along with it.
+    """
+    cache.delete_many([
+        page_cache_key('index'),
+        page_cache_key('event', event_id),
+        page_cache_key('timeline', event_id),
+        page_cache_key('problems', event_id),
+    ])
@@ -0,0 +1,151 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import JudgingScore, Submission, Team, TeamMember
+
+# ==============================================================================
+# STREAMING EXPORTS
+# ==============================================================================
+# Rosters and results are streamed straight from values_list() tuples, read
+# from the database in primary key pages of EXPORT_CHUNK_SIZE rows, so no
+# model instance is built and memory stays flat however many teams the event
+# has. Related columns come from joins in the same query, never from per-row
+# lookups.
+EXPORT_CHUNK_SIZE = 2000
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+# kind -> (model, lookup from the model to its event, [(column, lookup), ...])
+EXPORTS = {
+    'teams': (Team, 'event', [
+        ('team_id', 'id'),
+        ('team_name', 'team_name'),
+        ('team_code', 'team_code'),
+        ('leader', 'leader__username'),
+        ('leader_email', 'leader__email'),
+        ('member_count', 'member_count'),
+        ('max_size', 'max_size'),
+        ('project_title', 'submission__project_title'),
+        ('created_at', 'created_at'),
+    ]),
+    'members': (TeamMember, 'team__event', [
+        ('team_code', 'team__team_code'),
+        ('team_name', 'team__team_name'),
+        ('username', 'participant__username'),
+        ('first_name', 'participant__first_name'),
+        ('last_name', 'participant__last_name'),
+        ('email', 'participant__email'),
+        ('roll_number', 'participant__userprofile__student_roll_number'),
+        ('branch', 'participant__userprofile__branch'),
+        ('year_of_study', 'participant__userprofile__year_of_study'),
+        ('role', 'role'),
+        ('status', 'status'),
+        ('joined_at', 'joined_at'),
+    ]),
+    'submissions': (Submission, 'team__event', [
+        ('submission_id', 'id'),
+        ('team_code', 'team__team_code'),
+        ('team_name', 'team__team_name'),
+        ('project_title', 'project_title'),
+        ('problem_statement', 'problem_statement__title'),
+        ('repo_link', 'repo_link'),
+        ('demo_link', 'demo_link'),
+        ('submitted_at', 'submitted_at'),
+        ('disqualified', 'is_disqualified'),
+        # Read from the materialized leaderboard, not aggregated per export
+        ('score_count', 'leaderboard_entry__score_count'),
+        ('score_mean', 'leaderboard_entry__score_mean'),
+        ('score_min', 'leaderboard_entry__score_min'),
+        ('score_max', 'leaderboard_entry__score_max'),
+        ('normalized_score', 'leaderboard_entry__normalized_score'),
+    ]),
+    'scores': (JudgingScore, 'submission__team__event', [
+        ('submission_id', 'submission_id'),
+        ('team_code', 'submission__team__team_code'),
+        ('team_name', 'submission__team__team_name'),
+        ('project_title', 'submission__project_title'),
+        ('judge', 'judge__username'),
+        ('score', 'score'),
+        ('feedback', 'feedback'),
+    ]),
+}
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back to csv.writer's caller."""
+    def write(self, value):
+        return value
+
+
+def export_rows(kind, queryset=None, event_id=None):
+    """
+    Yields the header, then one tuple per row of an export. queryset narrows
+    the rows (e.g. an admin selection); it must be of the export's model.
+    """
+    model, event_lookup, columns = EXPORTS[kind]
+    if queryset is None:
+        queryset = model.objects.all()
+    if event_id is not None:
+        queryset = queryset.filter(**{event_lookup: event_id})
+    yield tuple(column for column, _ in columns)
+    # Keyset pages in primary key order, walking the clustered index. Each
+    # page is its own LIMITed query: mysqlclient has no server-side cursors
+    # and would buffer a single query's whole result set in the client.
+    rows = queryset.order_by('pk').values_list('pk', *(lookup for _, lookup in columns))
+    last = None
+    while True:
+        page = list((rows if last is None else rows.filter(pk__gt=last))[:EXPORT_CHUNK_SIZE])
+        for row in page:
+            yield row[1:]
+        if len(page) < EXPORT_CHUNK_SIZE:
+            return
+        last = page[-1][0]
+
+
+def _csv_lines(rows):
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _jsonl_lines(rows):
+    header = next(rows)
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def _batched(lines):
+    """Joins lines into one chunk per EXPORT_CHUNK_SIZE rows, so the server writes big blocks."""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= EXPORT_CHUNK_SIZE:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def streaming_response(kind, fmt, queryset=None, event_id=None, filename=None):
+    """StreamingHttpResponse downloading one export as CSV or JSON Lines."""
+    format_lines = _csv_lines if fmt == 'csv' else _jsonl_lines
+    if queryset is None:
+        queryset = EXPORTS[kind][0].objects.all()
+    # The rows are read after the view has returned, so pick the database
+    # (a replica, see portal/routers.py) while the request's routing applies.
+    queryset = queryset.using(queryset.db)
+    response = StreamingHttpResponse(
+        _batched(format_lines(export_rows(kind, queryset, event_id))),
+        content_type=FORMATS[fmt],
+    )
+    if filename is None:
+        filename = f"{kind}-{timezone.now():%Y%m%d-%H%M%S}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    # The rows are per request; keep them out of shared caches
+    response['Cache-Control'] = 'private, no-store'
+    return response
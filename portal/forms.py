@@ -1,7 +1,9 @@
 from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
-from .models import UserProfile, Team, Submission, Announcement
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from .models import UserProfile, Team, Submission, Announcement, normalize_team_code
+from .skills import index_profile
 
 class ParticipantRegistrationForm(UserCreationForm):
     """A detailed registration form for new participants."""
@@ -21,7 +23,7 @@ class ParticipantRegistrationForm(UserCreationForm):
         user.first_name = self.cleaned_data["full_name"]
         if commit:
             user.save()
-            UserProfile.objects.create(
+            profile = UserProfile.objects.create(
                 user=user,
                 user_role='Participant',
                 student_roll_number=self.cleaned_data.get('student_roll_number'),
@@ -30,14 +32,34 @@ class ParticipantRegistrationForm(UserCreationForm):
                 phone_number=self.cleaned_data.get('phone_number'),
                 skills=self.cleaned_data.get('skills')
             )
+            index_profile(profile)
         return user
 
+class ParticipantImportForm(forms.Form):
+    """Validates one roster row for `manage.py import_participants`."""
+    username = forms.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = forms.EmailField(required=False)
+    full_name = forms.CharField(max_length=100)
+    student_roll_number = forms.CharField(max_length=20)
+    branch = forms.CharField(max_length=50)
+    year_of_study = forms.IntegerField(min_value=1, max_value=4)
+    phone_number = forms.CharField(max_length=15, required=False)
+    skills = forms.CharField(required=False)
+    technical_skills = forms.CharField(required=False)
+    password = forms.CharField(required=False, strip=False)
+
 class UserProfileForm(forms.ModelForm):
     """Form for participants to edit their own profile."""
     class Meta:
         model = UserProfile
         fields = ['about', 'highlight', 'skills', 'technical_skills', 'github_link', 'linkedin_link', 'phone_number']
 
+    def save(self, commit=True):
+        profile = super().save(commit)
+        if commit and {'skills', 'technical_skills'} & set(self.changed_data):
+            index_profile(profile)
+        return profile
+
 class TeamCreateForm(forms.ModelForm):
     """Form for a participant to create a new team."""
     class Meta:
@@ -48,12 +70,28 @@ class TeamJoinForm(forms.Form):
     """Form for a participant to join a team using an invite code."""
     team_code = forms.CharField(label="Team Invitation Code", max_length=8)
 
+    def clean_team_code(self):
+        return normalize_team_code(self.cleaned_data['team_code'])
+
 class SubmissionForm(forms.ModelForm):
     """Form for a team leader to submit their project."""
     class Meta:
         model = Submission
         fields = ['project_title', 'project_description', 'repo_link', 'demo_link', 'image_upload']
 
+class ParticipantSearchForm(forms.Form):
+    """Filters of the participant search, see portal/skills.py."""
+    skills = forms.CharField(max_length=200, required=False, help_text="Comma-separated")
+    match = forms.ChoiceField(choices=[('all', 'All of them'), ('any', 'Any of them')], required=False)
+    branch = forms.CharField(max_length=50, required=False)
+    year_of_study = forms.IntegerField(min_value=1, max_value=4, required=False)
+    unteamed = forms.BooleanField(required=False, label="Not yet in a team for the active event")
+    after = forms.IntegerField(min_value=0, required=False)
+
+class TeamNotificationForm(forms.Form):
+    """Message the admin's 'Notify members' action sends to the selected teams."""
+    message = forms.CharField(widget=forms.Textarea(attrs={'rows': 4}))
+
 class AnnouncementForm(forms.ModelForm):
     """Form for Event Managers to create announcements."""
     class Meta:
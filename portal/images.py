@@ -0,0 +1,135 @@
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# ==============================================================================
+# RESPONSIVE IMAGE VARIANTS
+# ==============================================================================
+# Every uploaded image gets downscaled copies at a few widths, as WebP and in
+# its own format, next to it under variants/ (submissions/shot.png ->
+# submissions/variants/shot.png.640w.webp; the source's extension keeps
+# shot.png and shot.jpg apart). The variants are generated on a
+# background thread once the upload is committed, and deleted again when the
+# source is replaced or removed. The {% responsive_image %} tag turns them
+# into a srcset.
+VARIANT_WIDTHS = (320, 640, 1280)
+VARIANT_DIR = 'variants'
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+# Pillow format of the non-WebP fallback, by source extension
+FALLBACK_FORMATS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG'}
+# Image fields that get variants, by model label
+IMAGE_FIELDS = {
+    'portal.EventMedia': ('banner_image', 'logo'),
+    'portal.Submission': ('image_upload',),
+}
+
+logger = logging.getLogger(__name__)
+
+# A single worker keeps variant generation from competing with requests for CPU
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-variants')
+
+
+def variant_name(name, width, ext):
+    """Storage name of one variant, e.g. variant_name('a/b.jpg', 640, '.webp') -> 'a/variants/b.jpg.640w.webp'."""
+    directory, filename = posixpath.split(name)
+    return posixpath.join(directory, VARIANT_DIR, f"{filename}.{width}w{ext}")
+
+
+def variant_exts(name):
+    ext = posixpath.splitext(name)[1].lower()
+    return ('.webp', ext) if ext in FALLBACK_FORMATS else ('.webp',)
+
+
+def _widths_key(name):
+    return f"portal:image-variants:{name}"
+
+
+def _save(name, image, fmt):
+    buffer = BytesIO()
+    if fmt == 'WEBP':
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+    elif fmt == 'JPEG':
+        image.convert('RGB').save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        image.save(buffer, fmt, optimize=True)
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def generate_variants(name):
+    """
+    Writes the variants of one stored image and returns the widths produced.
+    Widths at or above the source's own width are skipped.
+    """
+    with default_storage.open(name) as handle:
+        source = ImageOps.exif_transpose(Image.open(handle))
+        source.load()
+    if source.mode not in ('RGB', 'RGBA'):
+        source = source.convert('RGBA' if 'transparency' in source.info or source.mode in ('LA', 'PA') else 'RGB')
+
+    widths = []
+    for width in VARIANT_WIDTHS:
+        if width >= source.width:
+            break
+        resized = source.resize((width, round(source.height * width / source.width)), Image.LANCZOS)
+        for ext in variant_exts(name):
+            _save(variant_name(name, width, ext), resized, 'WEBP' if ext == '.webp' else FALLBACK_FORMATS[ext])
+        widths.append(width)
+    cache.set(_widths_key(name), widths, None)
+    return widths
+
+
+def delete_variants(name):
+    """Removes every variant of a source image, e.g. after it was replaced."""
+    for width in VARIANT_WIDTHS:
+        for ext in variant_exts(name):
+            variant = variant_name(name, width, ext)
+            if default_storage.exists(variant):
+                default_storage.delete(variant)
+    cache.delete(_widths_key(name))
+
+
+def available_widths(name):
+    """Widths whose variants exist for a source image, cached per name."""
+    widths = cache.get(_widths_key(name))
+    if widths is None:
+        widths = [width for width in VARIANT_WIDTHS if default_storage.exists(variant_name(name, width, '.webp'))]
+        # Not forever: the variants may still be being generated
+        cache.set(_widths_key(name), widths, settings.PAGE_CACHE_TIMEOUT)
+    return widths
+
+
+def _generate_in_background(name, on_done):
+    try:
+        generate_variants(name)
+    except Exception:
+        # A corrupt upload must not take the worker down; the page just
+        # keeps serving the original.
+        logger.exception("Could not generate image variants for %s", name)
+        return
+    if on_done is not None:
+        on_done()
+
+
+def schedule_variants(name, on_done=None):
+    """Generates the variants of name on the background worker, then calls on_done()."""
+    return _executor.submit(_generate_in_background, name, on_done)
+
+
+def schedule_cleanup(name):
+    """Deletes the variants of name on the background worker."""
+    return _executor.submit(delete_variants, name)
+
+
+def wait_for_pending():
+    """Blocks until every variant job scheduled so far has finished."""
+    _executor.submit(int).result()
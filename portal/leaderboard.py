@@ -0,0 +1,145 @@
+from django.db import transaction
+from django.db.models import (
+    Avg, Count, F, FloatField, IntegerField, Max, Min, OuterRef, Q, StdDev,
+    Subquery, Sum, Value
+)
+from django.db.models.functions import Coalesce, NullIf
+from django.utils import timezone
+
+from .models import JudgingScore, JudgeScoreStats, LeaderboardEntry, Submission
+
+# ==============================================================================
+# MATERIALIZED LEADERBOARD
+# ==============================================================================
+# LeaderboardEntry holds one row of aggregates per scored submission and
+# JudgeScoreStats one row per judge. Both are kept current by the JudgingScore
+# signals in portal/signals.py; rebuild() recomputes everything from scratch.
+
+
+def _submission_scores_subquery(aggregate, output_field):
+    """Correlated subquery aggregating the scores of the outer entry's submission."""
+    return Coalesce(
+        Subquery(
+            JudgingScore.objects.filter(submission=OuterRef('submission'))
+            .values('submission')
+            .annotate(value=aggregate)
+            .values('value'),
+            output_field=output_field,
+        ),
+        Value(0, output_field=output_field),
+    )
+
+
+def _entry_updates():
+    """UPDATE expressions recomputing every LeaderboardEntry column from JudgingScore."""
+    # A judge whose scores are all equal has no spread, so counts as average (0).
+    z_score = Coalesce(
+        (F('score') - F('judge__score_stats__score_mean'))
+        / NullIf(F('judge__score_stats__score_stddev'), Value(0.0)),
+        Value(0.0),
+    )
+    return {
+        'score_count': _submission_scores_subquery(Count('id'), IntegerField()),
+        'score_sum': _submission_scores_subquery(Sum('score'), FloatField()),
+        'score_mean': _submission_scores_subquery(Avg('score'), FloatField()),
+        'score_min': _submission_scores_subquery(Min('score'), FloatField()),
+        'score_max': _submission_scores_subquery(Max('score'), FloatField()),
+        'normalized_score': _submission_scores_subquery(Avg(z_score), FloatField()),
+        'updated_at': timezone.now(),
+    }
+
+
+def refresh_judge_stats(judge_id):
+    stats = JudgingScore.objects.filter(judge_id=judge_id).aggregate(
+        score_count=Count('id'), score_mean=Avg('score'), score_stddev=StdDev('score'),
+    )
+    if not stats['score_count']:
+        JudgeScoreStats.objects.filter(judge_id=judge_id).delete()
+        return
+    JudgeScoreStats.objects.update_or_create(
+        judge_id=judge_id,
+        defaults={
+            'score_count': stats['score_count'],
+            'score_mean': stats['score_mean'],
+            'score_stddev': stats['score_stddev'] or 0,
+        },
+    )
+
+
+def score_changed(judge_id, submission_id, deleted=False):
+    """
+    Applies one saved or deleted JudgingScore to the leaderboard.
+
+    The submission's own aggregates are recomputed from its scores, and since
+    the judge's mean/stddev moved, so are the normalized scores of every other
+    submission that judge scored. Both happen in a single UPDATE.
+    """
+    with transaction.atomic():
+        refresh_judge_stats(judge_id)
+        if not deleted:
+            LeaderboardEntry.objects.get_or_create(submission_id=submission_id, defaults={
+                'event_id': Subquery(Submission.objects.filter(pk=submission_id).values('team__event_id')),
+            })
+        affected = LeaderboardEntry.objects.filter(
+            Q(submission_id=submission_id)
+            | Q(submission_id__in=JudgingScore.objects.filter(judge_id=judge_id).values('submission_id'))
+        )
+        affected.update(**_entry_updates())
+        affected.filter(score_count=0).delete()
+
+
+def judges_changed(judge_ids):
+    """
+    Applies scores of several judges removed in bulk, without their signals:
+    each judge's stats are recomputed, then every entry they still score.
+    """
+    with transaction.atomic():
+        for judge_id in judge_ids:
+            refresh_judge_stats(judge_id)
+        LeaderboardEntry.objects.filter(
+            submission_id__in=JudgingScore.objects.filter(judge_id__in=judge_ids).values('submission_id')
+        ).update(**_entry_updates())
+
+
+def rebuild():
+    """
+    Recomputes the whole leaderboard from JudgingScore. Used for recovery and
+    after bulk loads that bypass the model signals. Returns the entry count.
+    """
+    with transaction.atomic():
+        JudgeScoreStats.objects.all().delete()
+        JudgeScoreStats.objects.bulk_create(
+            JudgeScoreStats(
+                judge_id=row['judge'],
+                score_count=row['score_count'],
+                score_mean=row['score_mean'],
+                score_stddev=row['score_stddev'] or 0,
+            )
+            for row in JudgingScore.objects.values('judge').annotate(
+                score_count=Count('id'), score_mean=Avg('score'), score_stddev=StdDev('score'),
+            ).order_by()
+        )
+        LeaderboardEntry.objects.all().delete()
+        LeaderboardEntry.objects.bulk_create(
+            (
+                LeaderboardEntry(submission_id=submission_id, event_id=event_id)
+                for submission_id, event_id in JudgingScore.objects.values_list(
+                    'submission', 'submission__team__event').distinct().order_by()
+            ),
+            batch_size=1000,
+        )
+        LeaderboardEntry.objects.update(**_entry_updates())
+        return LeaderboardEntry.objects.count()
+
+
+def ranked_entries(event, normalized=False):
+    """
+    The event's ranked leaderboard, best first. Served straight from the
+    (event, score) ranking index; ties are broken by submission id so
+    pagination is stable.
+    """
+    order = '-normalized_score' if normalized else '-score_mean'
+    return (
+        LeaderboardEntry.objects.filter(event=event, submission__is_disqualified=False)
+        .select_related('submission__team').order_by(order, 'submission_id')
+    )
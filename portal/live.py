@@ -0,0 +1,179 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from functools import cache as memoize
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import timeline
+
+# ==============================================================================
+# LIVE UPDATES (Server-Sent Events)
+# ==============================================================================
+# Changes are published to named channels and pushed to every open tab over a
+# single EventSource connection (live_updates_view):
+#   event:<id>  announcements, phase changes and problem statement releases
+#   user:<id>   the user's team membership changes
+# Each message is {'type': ..., 'data': {...}}, sent as an SSE event of that
+# type. The broker is chosen by settings.LIVE_BROKER.
+
+# Messages a slow tab may fall behind by before newer ones are dropped for it
+SUBSCRIBER_QUEUE_SIZE = 100
+
+logger = logging.getLogger(__name__)
+
+
+def event_channel(event_id):
+    return f"event:{event_id}"
+
+
+def user_channel(user_id):
+    return f"user:{user_id}"
+
+
+def _offer(queue, message):
+    try:
+        queue.put_nowait(message)
+    except asyncio.QueueFull:
+        logger.warning("Dropped a live update for a subscriber that is not reading")
+
+
+class LocalBroker:
+    """
+    In-process pub/sub. Only reaches streams served by the same process that
+    publishes, so it suits a single ASGI worker, development and the tests.
+    publish() may be called from any thread.
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+
+    def publish(self, channel, message):
+        for loop, queue in list(self._subscribers.get(channel, ())):
+            loop.call_soon_threadsafe(_offer, queue, message)
+
+    @asynccontextmanager
+    async def subscribe(self, channels):
+        """Yields an asyncio.Queue receiving every message published to channels until exit."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(SUBSCRIBER_QUEUE_SIZE))
+        for channel in channels:
+            self._subscribers.setdefault(channel, set()).add(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            for channel in channels:
+                self._subscribers[channel].discard(subscriber)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+
+class RedisBroker:
+    """
+    Pub/sub through Redis, for several ASGI workers, or writes made by a WSGI
+    deployment (e.g. the admin). Needs the redis package.
+    """
+
+    def __init__(self, url='redis://localhost:6379/0', prefix='portal:live:'):
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured("RedisBroker needs the redis package: pip install redis")
+        self.url, self.prefix = url, prefix
+        self._publisher = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        self._publisher.publish(self.prefix + channel, json.dumps(message, cls=DjangoJSONEncoder))
+
+    @asynccontextmanager
+    async def subscribe(self, channels):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(*(self.prefix + channel for channel in channels))
+        queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+
+        async def pump():
+            async for item in pubsub.listen():
+                if item['type'] == 'message':
+                    _offer(queue, json.loads(item['data']))
+
+        task = asyncio.create_task(pump())
+        try:
+            yield queue
+        finally:
+            task.cancel()
+            await pubsub.aclose()
+            await client.aclose()
+
+
+@memoize
+def get_broker():
+    config = settings.LIVE_BROKER
+    return import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+
+
+def publish(channel, kind, data=None):
+    """Publishes a message of type kind to every subscriber of channel."""
+    get_broker().publish(channel, {'type': kind, 'data': data or {}})
+
+
+# ==============================================================================
+# EVENT STREAM
+# ==============================================================================
+def _event_state(event_id):
+    """(phase, next_boundary, released problem count, next unlock), read from the cache."""
+    bounds = timeline.boundaries(event_id)
+    if bounds is None:
+        return None, None, 0, None
+    now = timezone.now()
+    phase, next_boundary = timeline.current_phase(bounds, now)
+    released, next_unlock = timeline.released_problems(event_id, now)
+    return phase, next_boundary, len(released), next_unlock
+
+
+def _sse(kind, data):
+    return f"event: {kind}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def stream(channels, event_id=None):
+    """
+    Yields the SSE body for one connection: the messages published to
+    channels, plus 'phase' and 'problems' events when the event's phase or
+    released problem statements change. Those happen at a point in time
+    without any write, so the stream wakes itself at the next boundary;
+    a published 'timeline' message (dates edited) makes it recheck too.
+    """
+    async with get_broker().subscribe(channels) as queue:
+        # Let a dropped connection come back quickly
+        yield f"retry: {settings.LIVE_RETRY_MS}\n\n"
+        state = await sync_to_async(_event_state)(event_id) if event_id else None
+        while True:
+            wake_at = None
+            if state is not None:
+                wake_at = min((at for at in (state[1], state[3]) if at is not None), default=None)
+            timeout = settings.LIVE_KEEPALIVE
+            if wake_at is not None:
+                timeout = min(timeout, max(0, (wake_at - timezone.now()).total_seconds()))
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                message = None
+
+            if message is None and (wake_at is None or timezone.now() < wake_at):
+                # Comment line: keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+            elif message is not None and message['type'] != 'timeline':
+                yield _sse(message['type'], message['data'])
+            elif state is not None:
+                previous, state = state, await sync_to_async(_event_state)(event_id)
+                if state[:2] != previous[:2]:
+                    yield _sse('phase', {'phase': state[0], 'next_boundary': state[1]})
+                if state[2] != previous[2]:
+                    yield _sse('problems', {'released': state[2], 'next_unlock': state[3]})
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from portal.assignments import assign_submissions
+
+
+class Command(BaseCommand):
+    help = (
+        "Queues every submission for N judges, balancing load across all users "
+        "with the Judge role and skipping judges who are members of the team."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--per-submission', type=int, default=settings.JUDGES_PER_SUBMISSION)
+
+    def handle(self, *args, **options):
+        created = assign_submissions(options['per_submission'])
+        self.stdout.write(self.style.SUCCESS(f"Created {created} judge assignments."))
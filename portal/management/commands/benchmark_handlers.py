@@ -0,0 +1,151 @@
+import asyncio
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from portal.models import Event
+
+HANDLERS = ('wsgi', 'asgi')
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the WSGI and ASGI deployments of the read-heavy pages: fires "
+        "N requests at the real handlers (KVSRITspc.wsgi / KVSRITspc.asgi "
+        "stacks, middleware included) with C in flight at once, and reports "
+        "throughput and latency percentiles. WSGI gets C threads, like a "
+        "threaded server; ASGI runs everything on one event loop. The HTTP "
+        "server itself is left out, so run it against the production database "
+        "and cache to see what each deployment saves at that concurrency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append',
+                            help="Path to request (repeatable); defaults to the landing, latest event, "
+                                 "home and, with --user, notifications pages.")
+        parser.add_argument('--user', help="Browse as this username instead of anonymously.")
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=200, help="Requests in flight at once.")
+        parser.add_argument('--handler', action='append', choices=HANDLERS,
+                            help="Handler to measure (repeatable); defaults to both.")
+
+    def handle(self, *args, **options):
+        self.host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        self.cookie = ''
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"No user named '{options['user']}'.")
+            client = Client(HTTP_HOST=self.host)
+            client.force_login(user)
+            self.cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+        paths = options['path'] or self._default_paths(options['user'])
+        requests = [paths[i % len(paths)] for i in range(options['requests'])]
+        self.stdout.write(f"{len(requests)} requests over {', '.join(paths)}, {options['concurrency']} in flight")
+        self.stdout.write(f"{'handler':<9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'errors':>8}")
+        for handler in options['handler'] or HANDLERS:
+            # Warm up once so neither side pays for URL resolution and template loading
+            run = self._run_wsgi if handler == 'wsgi' else self._run_asgi
+            run(paths, options['concurrency'])
+            started = time.perf_counter()
+            results = run(requests, options['concurrency'])
+            elapsed = time.perf_counter() - started
+            connection.close()
+            self.stdout.write(self._row(handler, results, elapsed))
+
+    # ==========================================================================
+    # HELPERS
+    # ==========================================================================
+    def _default_paths(self, username):
+        paths = [reverse('index'), reverse('home')]
+        event_id = Event.objects.filter(event_status='published').order_by('-id').values_list('id', flat=True).first()
+        if event_id is not None:
+            paths.append(reverse('event_detail', args=[event_id]))
+        if username:
+            paths.append(reverse('notifications'))
+        return paths
+
+    def _row(self, handler, results, elapsed):
+        latencies = sorted(latency for latency, _ in results)
+        errors = sum(1 for _, status in results if status is None or status >= 400)
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        return (
+            f"{handler:<9}{len(results) / elapsed:>9.0f}{quantiles[49] * 1000:>9.1f}{quantiles[94] * 1000:>9.1f}"
+            f"{quantiles[98] * 1000:>9.1f}{latencies[-1] * 1000:>9.1f}{errors:>8}"
+        )
+
+    def _run_wsgi(self, paths, concurrency):
+        application = get_wsgi_application()
+
+        def get(path):
+            statuses = []
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+                'SERVER_NAME': self.host, 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+                'HTTP_HOST': self.host, 'HTTP_COOKIE': self.cookie, 'REMOTE_ADDR': '127.0.0.1',
+                'wsgi.input': BytesIO(), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+                'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+            }
+            started = time.perf_counter()
+            body = application(environ, lambda status, headers, exc_info=None: statuses.append(int(status[:3])))
+            try:
+                for _ in body:
+                    pass
+            finally:
+                # Fires request_finished, which releases this thread's connection
+                body.close()
+            return time.perf_counter() - started, statuses[0] if statuses else None
+
+        with ThreadPoolExecutor(concurrency) as pool:
+            return list(pool.map(get, paths))
+
+    def _run_asgi(self, paths, concurrency):
+        application = get_asgi_application()
+        headers = [(b'host', self.host.encode())]
+        if self.cookie:
+            headers.append((b'cookie', self.cookie.encode()))
+
+        async def get(path, slots):
+            async with slots:
+                scope = {
+                    'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+                    'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+                    'query_string': b'', 'root_path': '', 'headers': headers,
+                    'client': ('127.0.0.1', 0), 'server': (self.host, 80),
+                }
+                body = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+                statuses = []
+
+                async def receive():
+                    if body:
+                        return body.pop()
+                    # The client never disconnects; Django stops listening once it has responded
+                    await asyncio.Event().wait()
+
+                async def send(message):
+                    if message['type'] == 'http.response.start':
+                        statuses.append(message['status'])
+
+                started = time.perf_counter()
+                await application(scope, receive, send)
+                return time.perf_counter() - started, statuses[0] if statuses else None
+
+        async def run():
+            slots = asyncio.Semaphore(concurrency)
+            return await asyncio.gather(*(get(path, slots) for path in paths))
+
+        return asyncio.run(run())
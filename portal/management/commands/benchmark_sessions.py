@@ -0,0 +1,66 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, reverse
+
+ENGINES = ('db', 'cached_db', 'signed_cookies')
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the session engines on this deployment: logs a user in under "
+        "each one, requests a page repeatedly and reports the mean latency and "
+        "the django_session reads and writes per request, plus the writes a "
+        "login costs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('user', help="Username to browse as.")
+        parser.add_argument('--url', default='home', help="URL name of the page to request.")
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--engine', action='append', choices=ENGINES,
+                            help="Engine to measure (repeatable); defaults to all of them.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+            path = reverse(options['url'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named '{options['user']}'.")
+        except NoReverseMatch:
+            raise CommandError(f"'{options['url']}' is not a URL name without arguments.")
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+
+        self.stdout.write(f"{'engine':<16}{'ms/request':>12}{'reads/req':>12}{'writes/req':>12}{'login writes':>14}")
+        for engine in options['engine'] or ENGINES:
+            with override_settings(SESSION_ENGINE=f'django.contrib.sessions.backends.{engine}'):
+                client = Client(HTTP_HOST=host)
+                with CaptureQueriesContext(connection) as login_queries:
+                    client.force_login(user)
+                latencies, reads, writes = [], 0, 0
+                for _ in range(options['requests']):
+                    with CaptureQueriesContext(connection) as queries:
+                        started = time.perf_counter()
+                        client.get(path)
+                        latencies.append(time.perf_counter() - started)
+                    session_reads, session_writes = self._session_queries(queries)
+                    reads += session_reads
+                    writes += session_writes
+                client.logout()
+            self.stdout.write(
+                f"{engine:<16}{statistics.mean(latencies) * 1000:>12.2f}"
+                f"{reads / options['requests']:>12.2f}{writes / options['requests']:>12.2f}"
+                f"{self._session_queries(login_queries)[1]:>14}"
+            )
+
+    def _session_queries(self, queries):
+        """(reads, writes) against django_session among the captured queries."""
+        statements = [q['sql'].lstrip().upper() for q in queries if 'django_session' in q['sql']]
+        reads = sum(1 for sql in statements if sql.startswith('SELECT'))
+        return reads, len(statements) - reads
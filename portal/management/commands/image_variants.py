@@ -0,0 +1,64 @@
+import posixpath
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from portal import images
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates the responsive variants of every uploaded image that lacks "
+        "them (e.g. uploads from before variants existed). With --prune, also "
+        "deletes variant files whose source image is no longer referenced."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Regenerate variants that already exist.")
+        parser.add_argument('--prune', action='store_true', help="Delete orphaned variants.")
+
+    def handle(self, *args, **options):
+        sources = set()
+        for label, fields in images.IMAGE_FIELDS.items():
+            model = apps.get_model(label)
+            for row in model.objects.values_list(*fields).iterator():
+                sources.update(name for name in row if name)
+
+        generated = failed = 0
+        for name in sorted(sources):
+            if not options['force'] and images.available_widths(name):
+                continue
+            try:
+                images.generate_variants(name)
+                generated += 1
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"{name}: {exc}")
+        self.stdout.write(f"Generated variants for {generated} images, {failed} failed.")
+
+        if options['prune']:
+            self.stdout.write(f"Deleted {self._prune(sources)} orphaned variants.")
+
+    def _prune(self, sources):
+        """Deletes files under each upload directory's variants/ that belong to no current source."""
+        expected = {
+            images.variant_name(name, width, ext)
+            for name in sources for width in images.VARIANT_WIDTHS for ext in images.variant_exts(name)
+        }
+        directories = {posixpath.dirname(name) for name in sources}
+        for label, fields in images.IMAGE_FIELDS.items():
+            model = apps.get_model(label)
+            directories.update(model._meta.get_field(field).upload_to.rstrip('/') for field in fields)
+
+        deleted = 0
+        for directory in sorted(directories):
+            variant_dir = posixpath.join(directory, images.VARIANT_DIR)
+            if not default_storage.exists(variant_dir):
+                continue
+            for filename in default_storage.listdir(variant_dir)[1]:
+                name = posixpath.join(variant_dir, filename)
+                if name not in expected:
+                    default_storage.delete(name)
+                    deleted += 1
+        return deleted
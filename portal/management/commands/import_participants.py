@@ -0,0 +1,187 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from portal import skills
+from portal.forms import ParticipantImportForm
+from portal.models import UserProfile
+
+
+def _init_worker():
+    # Spawned (non-forked) workers start without Django configured.
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'KVSRITspc.settings')
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports participants from a CSV or JSONL roster. Rows are validated with "
+        "ParticipantImportForm, written with bulk_create in batches, and their "
+        "passwords hashed in a process pool. Progress is checkpointed after every "
+        "batch so an interrupted import can be resumed; the checkpoint is removed "
+        "once the whole file is imported."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Roster file (.csv or .jsonl).")
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help="Input format; guessed from the file extension by default.")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help="Password hashing processes; 0 hashes in this process.")
+        parser.add_argument('--default-password',
+                            help="Password for rows without one. Without it, such accounts get an unusable password.")
+        parser.add_argument('--skip-existing', action='store_true',
+                            help="Idempotent mode: silently skip rows whose student_roll_number "
+                                 "(or username) is already registered instead of reporting them.")
+        parser.add_argument('--resume', action='store_true',
+                            help="Continue after the last batch recorded in the checkpoint file.")
+        parser.add_argument('--checkpoint',
+                            help="Checkpoint file; defaults to <path>.progress.")
+        parser.add_argument('--errors', help="Write per-row errors to this CSV file.")
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+        fmt = options['format'] or ('jsonl' if path.suffix in ('.jsonl', '.ndjson') else 'csv')
+        checkpoint = Path(options['checkpoint'] or f"{path}.progress")
+        self.default_password = options['default_password']
+        self.skip_existing = options['skip_existing']
+
+        start = 0
+        if options['resume'] and checkpoint.exists():
+            start = int(checkpoint.read_text().strip() or 0)
+            self.stdout.write(f"Resuming after row {start}.")
+
+        self.errors = []
+        self.created = self.skipped = 0
+        pool = ProcessPoolExecutor(options['workers'], initializer=_init_worker) if options['workers'] else None
+        try:
+            with path.open(newline='', encoding='utf-8') as handle:
+                rows = islice(enumerate(self._read_rows(handle, fmt), start=1), start, None)
+                while True:
+                    batch = list(islice(rows, options['batch_size']))
+                    if not batch:
+                        break
+                    self._import_batch(batch, pool)
+                    checkpoint.write_text(str(batch[-1][0]))
+            # Finished: a later run of the same file starts from the top again
+            checkpoint.unlink(missing_ok=True)
+        finally:
+            if pool:
+                pool.shutdown()
+
+        for line, message in self.errors:
+            self.stderr.write(f"row {line}: {message}")
+        if options['errors']:
+            with open(options['errors'], 'w', newline='', encoding='utf-8') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(['row', 'error'])
+                writer.writerows(self.errors)
+
+        summary = f"Created {self.created}, skipped {self.skipped}, {len(self.errors)} rows with errors."
+        self.stdout.write(self.style.WARNING(summary) if self.errors else self.style.SUCCESS(summary))
+
+    # ==========================================================================
+    # HELPERS
+    # ==========================================================================
+    def _read_rows(self, handle, fmt):
+        """Yields one dict per roster row, streaming the file."""
+        if fmt == 'csv':
+            yield from csv.DictReader(handle)
+            return
+        for line in handle:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield {'__error__': f"invalid JSON ({exc})"}
+                continue
+            if isinstance(row, dict):
+                yield row
+            else:
+                yield {'__error__': f"expected a JSON object, got {type(row).__name__}"}
+
+    def _validate(self, batch):
+        """Returns the cleaned rows of a batch that are safe to insert, recording the rest."""
+        valid = []
+        for line, row in batch:
+            if '__error__' in row:
+                self.errors.append((line, row['__error__']))
+                continue
+            form = ParticipantImportForm(row)
+            if not form.is_valid():
+                message = "; ".join(f"{field}: {' '.join(errs)}" for field, errs in form.errors.items())
+                self.errors.append((line, message))
+                continue
+            valid.append((line, form.cleaned_data))
+
+        roll_numbers = [data['student_roll_number'] for _, data in valid]
+        usernames = [data['username'] for _, data in valid]
+        taken_rolls = set(UserProfile.objects.filter(student_roll_number__in=roll_numbers)
+                          .values_list('student_roll_number', flat=True))
+        taken_names = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+
+        accepted = []
+        for line, data in valid:
+            roll, username = data['student_roll_number'], data['username']
+            if roll in taken_rolls or username in taken_names:
+                if self.skip_existing:
+                    self.skipped += 1
+                else:
+                    field = 'student_roll_number' if roll in taken_rolls else 'username'
+                    self.errors.append((line, f"{field}: already registered"))
+                continue
+            # Also guards against the same student appearing twice in one batch
+            taken_rolls.add(roll)
+            taken_names.add(username)
+            accepted.append(data)
+        return accepted
+
+    def _hash_passwords(self, rows, pool):
+        # make_password(None) gives an unusable password, and is cheap.
+        passwords = [row['password'] or self.default_password for row in rows]
+        if pool is None:
+            return [make_password(password) for password in passwords]
+        return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // 32)))
+
+    def _import_batch(self, batch, pool):
+        rows = self._validate(batch)
+        if not rows:
+            return
+        hashes = self._hash_passwords(rows, pool)
+        with transaction.atomic():
+            User.objects.bulk_create(
+                User(username=row['username'], email=row['email'], first_name=row['full_name'], password=password)
+                for row, password in zip(rows, hashes)
+            )
+            # bulk_create does not return primary keys on every backend (MySQL).
+            ids = dict(User.objects.filter(username__in=[row['username'] for row in rows])
+                       .values_list('username', 'id'))
+            UserProfile.objects.bulk_create(
+                UserProfile(
+                    user_id=ids[row['username']],
+                    user_role='Participant',
+                    student_roll_number=row['student_roll_number'],
+                    branch=row['branch'],
+                    year_of_study=row['year_of_study'],
+                    phone_number=row['phone_number'] or None,
+                    skills=row['skills'] or None,
+                    technical_skills=row['technical_skills'] or None,
+                )
+                for row in rows
+            )
+            # bulk_create skips UserProfileForm, which keeps the skill index
+            skills.index_profiles(ids.values())
+        self.created += len(rows)
@@ -0,0 +1,122 @@
+import logging
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from portal import urls as portal_urls
+from portal.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders every parameterless portal view (plus the latest event page), "
+        "captures the queries each one issues and runs EXPLAIN on them, flagging "
+        "full table scans and sorts that do not come from an index. Works on MySQL "
+        "and SQLite. Each request runs in a rolled-back transaction with caching disabled."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', default=[],
+                            help="Also render the views as this username (repeatable).")
+        parser.add_argument('--fail-on-scans', action='store_true',
+                            help="Exit with an error if any query does a full table scan, for CI.")
+        parser.add_argument('--verbose-sql', action='store_true', help="Print every query, not only flagged ones.")
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('mysql', 'sqlite'):
+            raise CommandError(f"EXPLAIN parsing is only implemented for MySQL and SQLite, not {connection.vendor}.")
+        users = [None]
+        for username in options['user']:
+            try:
+                users.append(User.objects.get(username=username))
+            except User.DoesNotExist:
+                raise CommandError(f"No user named '{username}'.")
+
+        scans = 0
+        # DummyCache so the page cache cannot hide a view's queries, and no
+        # django.request logging for the 403s of views outside a user's role.
+        request_logger = logging.getLogger('django.request')
+        previous_level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        try:
+            with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+                for user in users:
+                    label = user.username if user else 'anonymous'
+                    for url_name, path in self._paths():
+                        status_code, queries = self._capture(path, user)
+                        issues = [(q['sql'], self._explain(q['sql'])) for q in queries]
+                        issues = [(sql, problems) for sql, problems in issues if problems]
+                        scans += sum(1 for _, problems in issues if any(p.startswith('full scan') for p in problems))
+                        status = self.style.WARNING(f"{len(issues)} flagged") if issues else self.style.SUCCESS("ok")
+                        self.stdout.write(f"{url_name} [{label}] {status_code}: {len(queries)} queries, {status}")
+                        for sql, problems in issues:
+                            self.stdout.write(f"    {', '.join(problems)}: {sql}")
+                        if options['verbose_sql']:
+                            for query in queries:
+                                self.stdout.write(f"    {query['sql']}")
+        finally:
+            request_logger.setLevel(previous_level)
+
+        if scans and options['fail_on_scans']:
+            raise CommandError(f"{scans} queries scan a whole table.")
+
+    # ==========================================================================
+    # HELPERS
+    # ==========================================================================
+    def _paths(self):
+        latest_event = Event.objects.order_by('-id').values_list('id', flat=True).first()
+        for pattern in portal_urls.urlpatterns:
+            params = set(pattern.pattern.converters)
+            if not params:
+                yield pattern.name, reverse(pattern.name)
+            elif params == {'event_id'} and latest_event:
+                yield pattern.name, reverse(pattern.name, kwargs={'event_id': latest_event})
+
+    def _client(self, user):
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        client = Client(HTTP_HOST=host, raise_request_exception=False)
+        if user is not None:
+            client.force_login(user)
+        return client
+
+    def _capture(self, path, user):
+        """Renders one GET inside a transaction that is rolled back afterwards."""
+        with transaction.atomic():
+            client = self._client(user)
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(path)
+            transaction.set_rollback(True)
+        selects = [q for q in context.captured_queries if q['sql'].lstrip().upper().startswith('SELECT')]
+        return response.status_code, selects
+
+    def _explain(self, sql):
+        """Returns the problems EXPLAIN reports for a query, e.g. ['full scan of portal_team']."""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                details = [row[-1] for row in cursor.fetchall()]
+                problems = ["filesort" for detail in details if 'TEMP B-TREE' in detail]
+                # A LIMITed scan that needs no sort walks the table in key
+                # order and stops early (e.g. ORDER BY id DESC LIMIT 1).
+                if problems or ' LIMIT ' not in sql.upper():
+                    problems += [f"full scan of {detail.split()[1]}" for detail in details
+                                 if detail.startswith('SCAN ') and ' USING ' not in detail]
+                return problems
+            cursor.execute(f"EXPLAIN {sql}")
+            columns = [col[0] for col in cursor.description]
+            problems = []
+            for row in cursor.fetchall():
+                plan = dict(zip(columns, row))
+                extra = plan.get('Extra') or ''
+                if plan.get('type') == 'ALL':
+                    problems.append(f"full scan of {plan.get('table')}")
+                if 'filesort' in extra:
+                    problems.append("filesort")
+                if 'temporary' in extra:
+                    problems.append("temporary table")
+            return problems
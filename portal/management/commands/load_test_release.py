@@ -0,0 +1,108 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from portal.cache import invalidate_event_pages
+from portal.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulates the refresh spike at a problem statement unlock: N clients "
+        "request the event page at the same instant, right as the event's "
+        "cached content is dropped. Reports latency percentiles and how many "
+        "database queries touched the problem statement table. Threads stand "
+        "in for workers, so run it against a shared cache (Redis/Memcached) "
+        "to measure a multi-process deployment."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int, help="Event id; defaults to the latest published event.")
+        parser.add_argument('--requests', type=int, default=5000)
+        parser.add_argument('--concurrency', type=int, default=64,
+                            help="Requests in flight at once.")
+        parser.add_argument('--user', help="Refresh as this username instead of anonymously.")
+        parser.add_argument('--wait-for-unlock', action='store_true',
+                            help="Sleep until the event's next problem statement unlocks and fire then, "
+                                 "instead of firing now against a cold cache.")
+
+    def handle(self, *args, **options):
+        events = Event.objects.filter(event_status='published')
+        event = (events.filter(id=options['event']) if options['event'] else events.order_by('-id')).first()
+        if event is None:
+            raise CommandError("No published event to load test.")
+        session_key = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"No user named '{options['user']}'.")
+            client = self._client()
+            client.force_login(user)
+            session_key = client.cookies[settings.SESSION_COOKIE_NAME].value
+
+        path = reverse('event_detail', args=[event.id])
+        if options['wait_for_unlock']:
+            unlock = event.problem_statements.filter(time_to_unlock__gt=timezone.now()).order_by('time_to_unlock').first()
+            if unlock is None:
+                raise CommandError("Every problem statement of this event is already unlocked.")
+            self.stdout.write(f"Waiting until {unlock.time_to_unlock} for '{unlock.title}' to unlock...")
+            time.sleep(max(0, (unlock.time_to_unlock - timezone.now()).total_seconds()))
+        else:
+            invalidate_event_pages(event.id)
+
+        self.problem_queries = 0
+        self.lock = threading.Lock()
+        # Every request waits at the barrier so the first wave starts together
+        barrier = threading.Barrier(min(options['concurrency'], options['requests']))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            results = list(pool.map(lambda i: self._refresh(path, session_key, barrier, i),
+                                    range(options['requests'])))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for latency, _ in results)
+        errors = sum(1 for _, status in results if status >= 400)
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        self.stdout.write(
+            f"{len(results)} refreshes of {path} in {elapsed:.2f}s ({len(results) / elapsed:.0f}/s), {errors} errors\n"
+            f"  p50 {quantiles[49] * 1000:.1f}ms  p95 {quantiles[94] * 1000:.1f}ms  "
+            f"p99 {quantiles[98] * 1000:.1f}ms  max {latencies[-1] * 1000:.1f}ms\n"
+            f"  problem statement queries: {self.problem_queries}"
+        )
+
+    # ==========================================================================
+    # HELPERS
+    # ==========================================================================
+    def _client(self):
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        return Client(HTTP_HOST=host, raise_request_exception=False)
+
+    def _count_queries(self, execute, sql, params, many, context):
+        if 'portal_problemstatement' in sql:
+            with self.lock:
+                self.problem_queries += 1
+        return execute(sql, params, many, context)
+
+    def _refresh(self, path, session_key, barrier, index):
+        client = self._client()
+        if session_key is not None:
+            client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+        if index < barrier.parties:
+            barrier.wait()
+        try:
+            with connection.execute_wrapper(self._count_queries):
+                started = time.perf_counter()
+                response = client.get(path)
+                return time.perf_counter() - started, response.status_code
+        finally:
+            connection.close()
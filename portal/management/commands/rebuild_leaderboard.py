@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from portal import leaderboard
+
+
+class Command(BaseCommand):
+    help = "Recomputes the materialized leaderboard and judge statistics from every JudgingScore."
+
+    def handle(self, *args, **options):
+        count = leaderboard.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt leaderboard with {count} entries."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from portal import skills
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the participant skill index (ProfileSkill) from every UserProfile."
+
+    def handle(self, *args, **options):
+        count = skills.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt skill index with {count} entries."))
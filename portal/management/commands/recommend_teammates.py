@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portal import recommendations, routers
+from portal.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Precomputes the teammate and open-team suggestions shown on the "
+        "participant dashboard and caches them. Meant to run periodically "
+        "(well within RECOMMENDATION_CACHE_TIMEOUT), e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int,
+                            help="Event id; defaults to the published event the dashboard shows.")
+
+    def handle(self, *args, **options):
+        events = Event.objects.filter(event_status='published')
+        if options['event'] is not None:
+            events = Event.objects.filter(pk=options['event'])
+        event_id = events.values_list('id', flat=True).first()
+        if event_id is None:
+            raise CommandError("No such event." if options['event'] is not None else "No published event.")
+        started = time.perf_counter()
+        # Only reads the database (and writes the cache), so a replica will do
+        with routers.replica_reads():
+            count = recommendations.precompute(event_id)
+        self.stdout.write(self.style.SUCCESS(
+            f"Cached suggestions for {count} participants of event #{event_id} in {time.perf_counter() - started:.1f}s."
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from portal.models import ReservedTeamCode
+from portal.teams import reserve_team_codes
+
+
+class Command(BaseCommand):
+    help = "Pre-generates unique team codes so team creation during registration bursts never collides."
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int, help="Number of codes to add to the pool.")
+
+    def handle(self, *args, **options):
+        added = reserve_team_codes(options['count'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Reserved {added} team codes ({ReservedTeamCode.objects.count()} in the pool)."
+        ))
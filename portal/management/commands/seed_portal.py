@@ -0,0 +1,237 @@
+import random
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from portal import leaderboard, skills
+from portal.cache import invalidate_event_pages
+from portal.models import (
+    UserProfile, Event, EventBenefit, ProblemStatement, Schedule, SubSchedule,
+    Eligibility, HowToParticipateStep, FAQ, Organizer, Team, TeamMember,
+    Submission, JudgingScore, Notification, TEAM_CODE_ALPHABET, TEAM_CODE_LENGTH
+)
+
+BRANCHES = ['CSE', 'ECE', 'EEE', 'IT', 'MECH', 'CIVIL', 'AIML']
+SKILLS = [
+    'Python', 'Django', 'React', 'Java', 'C++', 'SQL', 'Machine Learning',
+    'Figma', 'Flutter', 'Node.js', 'Docker', 'IoT', 'Data Analysis',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds the portal with production-scale synthetic data for benchmarking. "
+        "Rows are written with bulk_create and a fixed random seed, so two runs "
+        "with the same options produce the same dataset."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--participants', type=int, default=50000)
+        parser.add_argument('--teams', type=int, default=10000)
+        parser.add_argument('--judges', type=int, default=40)
+        parser.add_argument('--judges-per-submission', type=int, default=3)
+        parser.add_argument('--submission-ratio', type=float, default=0.8,
+                            help="Fraction of teams that submit a project.")
+        parser.add_argument('--notifications', type=int, default=2,
+                            help="Notifications per participant.")
+        parser.add_argument('--max-team-size', type=int, default=5)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--prefix', default='seed',
+                            help="Prefix for generated usernames, roll numbers and team names.")
+        parser.add_argument('--password', default='password',
+                            help="Password shared by every generated account.")
+        parser.add_argument('--hasher', default=None,
+                            help="Password hasher algorithm, e.g. 'md5' when MD5PasswordHasher is "
+                                 "in PASSWORD_HASHERS. Defaults to the first configured hasher.")
+
+    def handle(self, *args, **options):
+        if options['teams'] > options['participants']:
+            raise CommandError("Every team needs a leader: --teams cannot exceed --participants.")
+        if options['judges_per_submission'] > options['judges']:
+            raise CommandError("--judges-per-submission cannot exceed --judges.")
+        if User.objects.filter(username__startswith=f"{options['prefix']}_").exists():
+            raise CommandError(f"Data with prefix '{options['prefix']}' already exists; pick another --prefix.")
+        try:
+            hasher = get_hasher(options['hasher'] or 'default')
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        # The prefix is part of the seed so that two seeded datasets in one
+        # database do not draw the same (unique) team codes.
+        self.rng = random.Random(f"{options['seed']}:{options['prefix']}")
+        self.batch_size = options['batch_size']
+        self.prefix = options['prefix']
+        # The password is hashed once and shared, so the slow hash is paid once
+        # instead of once per account.
+        self.password = hasher.encode(options['password'], hasher.salt())
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            event = self._stage("event content", self.seed_event)
+            participant_ids = self._stage("participants", self.seed_users, 'p', options['participants'], 'Participant')
+            judge_ids = self._stage("judges", self.seed_users, 'j', options['judges'], 'Judge')
+            team_ids = self._stage("teams", self.seed_teams, event, participant_ids,
+                                   options['teams'], options['max_team_size'])
+            submission_ids = self._stage("submissions", self.seed_submissions, event, team_ids,
+                                         options['submission_ratio'])
+            self._stage("judging scores", self.seed_scores, submission_ids, judge_ids,
+                        options['judges_per_submission'])
+            self._stage("notifications", self.seed_notifications, participant_ids, options['notifications'])
+            self._stage("leaderboard", leaderboard.rebuild)
+            self._stage("skill index", skills.rebuild)
+        # bulk_create skips post_save, so drop the cached pages by hand.
+        invalidate_event_pages(event.id)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded event #{event.id} in {time.perf_counter() - started:.1f}s."
+        ))
+
+    # ==========================================================================
+    # HELPERS
+    # ==========================================================================
+    def _stage(self, label, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        self.stdout.write(f"  {label}: {time.perf_counter() - started:.2f}s")
+        return result
+
+    def _bulk_create(self, model, objs):
+        """Inserts objs in batches without materializing the whole iterable."""
+        objs = iter(objs)
+        while True:
+            batch = list(islice(objs, self.batch_size))
+            if not batch:
+                return
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+
+    # ==========================================================================
+    # SEEDERS
+    # ==========================================================================
+    def seed_event(self):
+        now = timezone.now()
+        event = Event.objects.create(
+            event_name=f"{self.prefix.title()} Hackathon",
+            title=f"{self.prefix.title()} Hackathon",
+            hero_section_details="Synthetic event for load testing.",
+            event_status='published',
+            registration_start=now - timedelta(days=7),
+            registration_end=now + timedelta(days=1),
+            event_start=now + timedelta(days=2),
+            event_end=now + timedelta(days=3),
+        )
+        self._bulk_create(EventBenefit, (
+            EventBenefit(event=event, item_name=f"Benefit {i}", description="Prizes and swag.") for i in range(6)
+        ))
+        self._bulk_create(ProblemStatement, (
+            ProblemStatement(event=event, title=f"Problem {i}", description="Build something useful.",
+                             time_to_unlock=event.event_start + timedelta(hours=i)) for i in range(10)
+        ))
+        self._bulk_create(Schedule, (
+            Schedule(event=event, day_number=day, title=f"Day {day}", date=(event.event_start + timedelta(days=day - 1)).date())
+            for day in (1, 2, 3)
+        ))
+        self._bulk_create(SubSchedule, (
+            SubSchedule(schedule=schedule, title=f"Session {slot}", time=f"{9 + slot}:00", description="Hacking time.")
+            for schedule in Schedule.objects.filter(event=event) for slot in range(6)
+        ))
+        self._bulk_create(Eligibility, (Eligibility(event=event, description=f"Rule {i}") for i in range(3)))
+        self._bulk_create(HowToParticipateStep, (
+            HowToParticipateStep(event=event, step_number=i, step_description=f"Step {i}") for i in range(1, 5)
+        ))
+        self._bulk_create(FAQ, (FAQ(event=event, question=f"Question {i}?", answer="Yes.") for i in range(20)))
+        self._bulk_create(Organizer, (Organizer(event=event, name=f"Organizer {i}", role="Coordinator") for i in range(5)))
+        return event
+
+    def seed_users(self, kind, count, role):
+        """Creates `count` users with profiles and returns their ids in creation order."""
+        usernames = [f"{self.prefix}_{kind}{i:06d}" for i in range(count)]
+        self._bulk_create(User, (
+            User(username=username, first_name=f"{kind.upper()}{i}", email=f"{username}@example.com",
+                 password=self.password)
+            for i, username in enumerate(usernames)
+        ))
+        # bulk_create does not return primary keys on every backend (MySQL).
+        ids_by_username = dict(
+            User.objects.filter(username__startswith=f"{self.prefix}_{kind}").values_list('username', 'id')
+        )
+        user_ids = [ids_by_username[username] for username in usernames]
+        self._bulk_create(UserProfile, (
+            UserProfile(
+                user_id=user_id,
+                user_role=role,
+                student_roll_number=f"{self.prefix.upper()}{kind.upper()}{i:06d}"[:20],
+                branch=self.rng.choice(BRANCHES),
+                year_of_study=self.rng.randint(1, 4),
+                skills=", ".join(self.rng.sample(SKILLS, 3)),
+                technical_skills=", ".join(self.rng.sample(SKILLS, 2)),
+            )
+            for i, user_id in enumerate(user_ids)
+        ))
+        return user_ids
+
+    def seed_teams(self, event, participant_ids, count, max_size):
+        pool = list(participant_ids)
+        self.rng.shuffle(pool)
+        leaders, pool = pool[:count], pool[count:]
+
+        codes = set()
+        while len(codes) < count:
+            codes.add(''.join(self.rng.choices(TEAM_CODE_ALPHABET, k=TEAM_CODE_LENGTH)))
+        codes = sorted(codes)
+        self.rng.shuffle(codes)
+
+        # Team sizes are drawn up front so member_count is right on insert;
+        # max_size counts the leader too.
+        remaining = iter(pool)
+        rosters = [
+            [leader_id] + list(islice(remaining, self.rng.randint(0, max_size - 1)))
+            for leader_id in leaders
+        ]
+        self._bulk_create(Team, (
+            Team(event=event, team_name=f"{self.prefix.title()} Team {i}", team_code=codes[i],
+                 leader_id=roster[0], max_size=max_size, member_count=len(roster))
+            for i, roster in enumerate(rosters)
+        ))
+        ids_by_code = dict(Team.objects.filter(event=event).values_list('team_code', 'id'))
+        team_ids = [ids_by_code[code] for code in codes]
+
+        def members():
+            for team_id, roster in zip(team_ids, rosters):
+                yield TeamMember(team_id=team_id, participant_id=roster[0], role='Leader', status='accepted')
+                for participant_id in roster[1:]:
+                    yield TeamMember(team_id=team_id, participant_id=participant_id, status='accepted')
+        self._bulk_create(TeamMember, members())
+        return team_ids
+
+    def seed_submissions(self, event, team_ids, ratio):
+        problem_ids = list(event.problem_statements.values_list('id', flat=True))
+        submitting = self.rng.sample(team_ids, int(len(team_ids) * ratio))
+        self._bulk_create(Submission, (
+            Submission(team_id=team_id, problem_statement_id=self.rng.choice(problem_ids),
+                       project_title=f"Project {i}", project_description="A synthetic project.",
+                       repo_link=f"https://github.com/example/project-{i}")
+            for i, team_id in enumerate(submitting)
+        ))
+        ids_by_team = dict(Submission.objects.filter(team__event=event).values_list('team_id', 'id'))
+        return [ids_by_team[team_id] for team_id in submitting]
+
+    def seed_scores(self, submission_ids, judge_ids, per_submission):
+        self._bulk_create(JudgingScore, (
+            JudgingScore(judge_id=judge_id, submission_id=submission_id,
+                         score=round(self.rng.uniform(1, 10), 1))
+            for submission_id in submission_ids
+            for judge_id in self.rng.sample(judge_ids, per_submission)
+        ))
+
+    def seed_notifications(self, user_ids, per_user):
+        self._bulk_create(Notification, (
+            Notification(user_id=user_id, message=f"Update {n} for your team.", is_read=self.rng.random() < 0.5)
+            for user_id in user_ids for n in range(per_user)
+        ))
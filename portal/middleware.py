@@ -0,0 +1,154 @@
+import mimetypes
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from . import routers
+
+# Seconds browsers may keep a content-hashed file without asking again
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+# Unhashed names can change in place on the next deploy
+MUTABLE_MAX_AGE = 60
+
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def accepted_encodings(header):
+    """
+    The content codings of an Accept-Encoding header with their q-values;
+    '*' stands for any coding not listed. A coding with q=0 is refused.
+    """
+    accepted = {}
+    for item in header.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.lower()] = quality
+    return accepted
+
+
+class PrecompressedStaticMiddleware:
+    """
+    Serves collected static files from STATIC_ROOT ahead of the session and
+    auth middleware. Picks the .br or .gz copy written by collectstatic when
+    the client accepts it, and marks content-hashed names immutable so repeat
+    visitors fetch nothing. Switches itself off unless STATIC_ROOT is set and
+    the staticfiles storage keeps a manifest of hashed names. Runs natively
+    under both WSGI and ASGI, so it adds no thread switch to async views.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        hashed_files = getattr(staticfiles_storage, 'hashed_files', None)
+        if not settings.STATIC_ROOT or not hashed_files:
+            raise MiddlewareNotUsed
+        self.root = Path(settings.STATIC_ROOT).resolve()
+        self.prefix = settings.STATIC_URL
+        self.immutable = set(hashed_files.values())
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.serve_static(request)
+        return self.get_response(request) if response is None else response
+
+    async def __acall__(self, request):
+        response = self.serve_static(request)
+        return await self.get_response(request) if response is None else response
+
+    def serve_static(self, request):
+        if request.method in ('GET', 'HEAD') and request.path.startswith(self.prefix):
+            return self.serve(request, request.path[len(self.prefix):])
+        return None
+
+    def serve(self, request, name):
+        path = (self.root / name).resolve()
+        if not path.is_relative_to(self.root) or not path.is_file():
+            return None
+
+        served, content_encoding = path, None
+        accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+        # The client's most preferred coding we have a copy for; ours breaks ties
+        candidates = sorted(
+            ((accepted.get(encoding, accepted.get('*', 0)), encoding, suffix) for encoding, suffix in ENCODINGS),
+            key=lambda candidate: -candidate[0],
+        )
+        for quality, encoding, suffix in candidates:
+            variant = path.with_name(path.name + suffix)
+            if quality > 0 and variant.is_file():
+                served, content_encoding = variant, encoding
+                break
+
+        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        response = FileResponse(served.open('rb'), content_type=content_type, filename=path.name)
+        if content_encoding:
+            response.headers['Content-Encoding'] = content_encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if name in self.immutable:
+            patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+        else:
+            patch_cache_control(response, public=True, max_age=MUTABLE_MAX_AGE)
+            response.headers['Last-Modified'] = http_date(path.stat().st_mtime)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets portal/routers.py send the reads of GET/HEAD requests to the read
+    replicas, and keeps a browser on the primary for REPLICA_STICKY_SECONDS
+    after any request of it that wrote, so it reads its own writes despite
+    replication lag. Switches itself off without DATABASE_REPLICAS.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = routers.begin_request(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = routers.end_request(token)
+        return self.mark_sticky(response, wrote)
+
+    async def __acall__(self, request):
+        token = routers.begin_request(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            wrote = routers.end_request(token)
+        return self.mark_sticky(response, wrote)
+
+    def mark_sticky(self, response, wrote):
+        if wrote:
+            response.set_cookie(
+                routers.STICKY_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True, samesite='Lax', secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('portal', '0006_remove_eventbenefit_benefits_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JudgeScoreStats',
+            fields=[
+                ('judge', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('score_count', models.PositiveIntegerField(default=0)),
+                ('score_mean', models.FloatField(default=0)),
+                ('score_stddev', models.FloatField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='team',
+            name='team_code',
+            field=models.CharField(default='BEE053D8', max_length=8, unique=True),
+        ),
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('submission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='leaderboard_entry', serialize=False, to='portal.submission')),
+                ('score_count', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0)),
+                ('score_mean', models.FloatField(default=0)),
+                ('score_min', models.FloatField(default=0)),
+                ('score_max', models.FloatField(default=0)),
+                ('normalized_score', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-score_mean'],
+                'indexes': [models.Index(fields=['-score_mean', 'submission'], name='leaderboard_mean_idx'), models.Index(fields=['-normalized_score', 'submission'], name='leaderboard_normalized_idx')],
+            },
+        ),
+    ]
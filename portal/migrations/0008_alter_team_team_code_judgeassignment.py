@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0007_judgescorestats_alter_team_team_code_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='team',
+            name='team_code',
+            field=models.CharField(default='8A44DFF6', max_length=8, unique=True),
+        ),
+        migrations.CreateModel(
+            name='JudgeAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('assigned_at', models.DateTimeField(auto_now_add=True)),
+                ('judge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='judge_assignments', to=settings.AUTH_USER_MODEL)),
+                ('submission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='judge_assignments', to='portal.submission')),
+            ],
+            options={
+                'unique_together': {('judge', 'submission')},
+            },
+        ),
+    ]
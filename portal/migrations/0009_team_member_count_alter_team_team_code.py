@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:06
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_member_count(apps, schema_editor):
+    Team = apps.get_model('portal', 'Team')
+    TeamMember = apps.get_model('portal', 'TeamMember')
+    counts = TeamMember.objects.filter(team=OuterRef('pk')).values('team').annotate(n=Count('id')).values('n')
+    Team.objects.update(member_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0008_alter_team_team_code_judgeassignment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='team',
+            name='team_code',
+            field=models.CharField(default='A7BE0EA8', max_length=8, unique=True),
+        ),
+        migrations.RunPython(backfill_member_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:07
+
+import portal.models
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+
+def uppercase_team_codes(apps, schema_editor):
+    Team = apps.get_model('portal', 'Team')
+    Team.objects.update(team_code=Upper('team_code'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0009_team_member_count_alter_team_team_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservedTeamCode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=8, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='team',
+            name='team_code',
+            field=models.CharField(default=portal.models.generate_team_code, max_length=8, unique=True),
+        ),
+        migrations.RunPython(uppercase_team_codes, migrations.RunPython.noop),
+    ]
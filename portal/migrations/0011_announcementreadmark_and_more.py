@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0010_reservedteamcode_alter_team_team_code'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnouncementReadMark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['event', 'created_at'], name='announcement_event_time_idx'),
+        ),
+        migrations.AddField(
+            model_name='announcementreadmark',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portal.event'),
+        ),
+        migrations.AddField(
+            model_name='announcementreadmark',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='announcement_read_marks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='announcementreadmark',
+            unique_together={('user', 'event')},
+        ),
+    ]
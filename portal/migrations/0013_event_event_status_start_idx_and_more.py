@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0012_notification_notification_unread_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['event_status', 'event_start'], name='event_status_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='howtoparticipatestep',
+            index=models.Index(fields=['event', 'step_number'], name='step_event_number_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='problemstatement',
+            index=models.Index(fields=['event', 'time_to_unlock'], name='problem_event_unlock_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['event', 'day_number'], name='schedule_event_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subschedule',
+            index=models.Index(fields=['schedule', 'time'], name='subschedule_schedule_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(fields=['participant', 'team'], name='teammember_participant_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0013_event_event_status_start_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['team_name'], name='team_name_idx'),
+        ),
+    ]
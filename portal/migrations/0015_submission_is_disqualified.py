@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0014_team_team_name_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='is_disqualified',
+            field=models.BooleanField(default=False),
+        ),
+    ]
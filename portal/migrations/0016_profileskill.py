@@ -0,0 +1,87 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:39
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# A frozen copy of the tokenizer in portal/skills.py as of this migration, so
+# the backfill does not change when the app's does. Profiles indexed here
+# pick up later tokenizer changes with `manage.py rebuild_skill_index`.
+SKILL_MAX_LENGTH = 50
+SKILL_SEPARATORS = re.compile(r'[,;|\n]+')
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'react.js': 'react',
+    'reactjs': 'react',
+    'react js': 'react',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'node js': 'node.js',
+    'vue.js': 'vue',
+    'vuejs': 'vue',
+    'next.js': 'nextjs',
+    'py': 'python',
+    'python3': 'python',
+    'cpp': 'c++',
+    'golang': 'go',
+    'postgres': 'postgresql',
+    'mongo': 'mongodb',
+    'k8s': 'kubernetes',
+    'tf': 'tensorflow',
+    'sklearn': 'scikit-learn',
+    'html5': 'html',
+    'css3': 'css',
+    'ml': 'machine learning',
+    'dl': 'deep learning',
+    'ai': 'artificial intelligence',
+    'nlp': 'natural language processing',
+    'cv': 'computer vision',
+    'dsa': 'data structures and algorithms',
+}
+
+
+def parse_skills(*texts):
+    skills = set()
+    for text in texts:
+        for token in SKILL_SEPARATORS.split(text or ''):
+            skill = ' '.join(token.split()).casefold().lstrip('-*• ').rstrip('. ')
+            skill = SKILL_ALIASES.get(skill, skill)
+            if skill and len(skill) <= SKILL_MAX_LENGTH:
+                skills.add(skill)
+    return skills
+
+
+def backfill_skill_index(apps, schema_editor):
+    UserProfile = apps.get_model('portal', 'UserProfile')
+    ProfileSkill = apps.get_model('portal', 'ProfileSkill')
+    ProfileSkill.objects.bulk_create(
+        (
+            ProfileSkill(profile_id=profile_id, skill=skill)
+            for profile_id, skills, technical in UserProfile.objects.values_list('pk', 'skills', 'technical_skills').iterator()
+            for skill in parse_skills(skills, technical)
+        ),
+        batch_size=2000,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0015_submission_is_disqualified'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(max_length=50)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='indexed_skills', to='portal.userprofile')),
+            ],
+            options={
+                'unique_together': {('skill', 'profile')},
+            },
+        ),
+        migrations.RunPython(backfill_skill_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_event_ids(apps, schema_editor):
+    LeaderboardEntry = apps.get_model('portal', 'LeaderboardEntry')
+    Submission = apps.get_model('portal', 'Submission')
+    LeaderboardEntry.objects.update(
+        event_id=Subquery(Submission.objects.filter(pk=OuterRef('submission')).values('team__event_id'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0016_profileskill'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='event',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='portal.event'),
+        ),
+        migrations.RunPython(copy_event_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='leaderboardentry',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='portal.event'),
+        ),
+        migrations.RemoveIndex(
+            model_name='leaderboardentry',
+            name='leaderboard_mean_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='leaderboardentry',
+            name='leaderboard_normalized_idx',
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['event', '-score_mean', 'submission'], name='leaderboard_event_mean_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['event', '-normalized_score', 'submission'], name='leaderboard_event_norm_idx'),
+        ),
+    ]
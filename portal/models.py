@@ -1,6 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
-import uuid
+import secrets
 
 # Event mode and status choices (module level)
 MODE_CHOICES = [
@@ -43,6 +43,20 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.user.username} ({self.get_user_role_display()})"
 
+class ProfileSkill(models.Model):
+    """
+    Inverted index of UserProfile.skills and technical_skills: one row per
+    normalized skill a profile lists, maintained by portal/skills.py.
+    """
+    skill = models.CharField(max_length=50)
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='indexed_skills')
+    class Meta:
+        # Leads with the skill: "who knows X" is a range scan of this index
+        unique_together = ('skill', 'profile')
+
+    def __str__(self):
+        return self.skill
+
 # ==============================================================================
 # 2. CORE EVENT MODELS
 # ==============================================================================
@@ -79,6 +93,9 @@ class Event(models.Model):
     event_start = models.DateTimeField(null=True, blank=True)
     event_end = models.DateTimeField(null=True, blank=True)
     event_mode = models.CharField(max_length=10, choices=MODE_CHOICES, default='physical')
+    class Meta:
+        # home_view: published events, newest start first
+        indexes = [models.Index(fields=['event_status', 'event_start'], name='event_status_start_idx')]
 
 class EventBenefit(models.Model):
     event = models.ForeignKey(Event, related_name='benefits', on_delete=models.CASCADE)
@@ -99,6 +116,9 @@ class ProblemStatement(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     time_to_unlock = models.DateTimeField(help_text="The problem statement will be visible after this time.")
+    class Meta:
+        # index_view: the event's problem statements in unlock order
+        indexes = [models.Index(fields=['event', 'time_to_unlock'], name='problem_event_unlock_idx')]
 
 class Schedule(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='schedules')
@@ -109,6 +129,8 @@ class Schedule(models.Model):
     description = models.TextField(blank=True, null=True)
     class Meta:
         ordering = ['day_number']
+        # event pages prefetch each event's days in order
+        indexes = [models.Index(fields=['event', 'day_number'], name='schedule_event_day_idx')]
 
 class SubSchedule(models.Model):
     schedule = models.ForeignKey(Schedule, on_delete=models.CASCADE, related_name='sub_schedules')
@@ -117,6 +139,7 @@ class SubSchedule(models.Model):
     description = models.TextField()
     class Meta:
         ordering = ['time']
+        indexes = [models.Index(fields=['schedule', 'time'], name='subschedule_schedule_time_idx')]
     def __str__(self):
         return f"{self.title} ({self.time})"
 
@@ -128,7 +151,9 @@ class HowToParticipateStep(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='steps')
     step_number = models.PositiveIntegerField()
     step_description = models.TextField()
-    class Meta: ordering = ['step_number']
+    class Meta:
+        ordering = ['step_number']
+        indexes = [models.Index(fields=['event', 'step_number'], name='step_event_number_idx')]
 
 class FAQ(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='faqs')
@@ -165,14 +190,48 @@ class Feedback(models.Model):
 # ==============================================================================
 # 4. TEAM & SUBMISSION MODELS
 # ==============================================================================
+# Team codes are typed in by hand, so look-alike characters (0/O, 1/I/L) are left out
+TEAM_CODE_ALPHABET = 'ABCDEFGHJKMNPQRSTUVWXYZ23456789'
+TEAM_CODE_LENGTH = 8
+
+def generate_team_code():
+    """A fresh random team code; called per team, unlike an import-time default."""
+    return ''.join(secrets.choice(TEAM_CODE_ALPHABET) for _ in range(TEAM_CODE_LENGTH))
+
+def normalize_team_code(code):
+    """Team codes are stored upper-case; normalize user input the same way."""
+    return code.strip().upper()
+
 class Team(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='teams')
     team_name = models.CharField(max_length=100)
-    team_code = models.CharField(max_length=8, unique=True, default=uuid.uuid4().hex.upper()[0:8])
+    # Always stored upper-case (see save()), so lookups are exact matches on the unique index
+    team_code = models.CharField(max_length=8, unique=True, default=generate_team_code)
     leader = models.ForeignKey(User, on_delete=models.CASCADE, related_name='led_teams')
     max_size = models.PositiveIntegerField(default=5)
+    # Denormalized TeamMember count; portal/teams.py enforces max_size with it
+    member_count = models.PositiveIntegerField(default=0, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    class Meta:
+        unique_together = ('event', 'team_name')
+        # Admin prefix search on team names across events
+        indexes = [models.Index(fields=['team_name'], name='team_name_idx')]
+
+    def __str__(self):
+        return self.team_name
+
+    def save(self, *args, **kwargs):
+        # Codes typed in the admin too
+        self.team_code = normalize_team_code(self.team_code)
+        super().save(*args, **kwargs)
+
+class ReservedTeamCode(models.Model):
+    """
+    Pool of pre-generated codes known not to clash with any team, filled by
+    `manage.py reserve_team_codes` and drawn down by portal/teams.py.
+    """
+    code = models.CharField(max_length=8, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    class Meta: unique_together = ('event', 'team_name')
 
 class TeamMember(models.Model):
     STATUS_CHOICES = [('pending', 'Pending'), ('accepted', 'Accepted')]
@@ -181,7 +240,10 @@ class TeamMember(models.Model):
     role = models.CharField(max_length=50, default='Member')
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     joined_at = models.DateTimeField(auto_now_add=True)
-    class Meta: unique_together = ('team', 'participant')
+    class Meta:
+        unique_together = ('team', 'participant')
+        # "Already in a team for this event?": participant first, then join to team
+        indexes = [models.Index(fields=['participant', 'team'], name='teammember_participant_idx')]
 
 class Submission(models.Model):
     team = models.OneToOneField(Team, on_delete=models.CASCADE, related_name='submission')
@@ -192,6 +254,11 @@ class Submission(models.Model):
     demo_link = models.URLField(blank=True, null=True)
     image_upload = models.ImageField(upload_to='submissions/', blank=True, null=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
+    # Disqualified submissions keep their scores but are left off the leaderboard
+    is_disqualified = models.BooleanField(default=False)
+
+    def __str__(self):
+        return self.project_title
 
 class TeamInvite(models.Model):
     STATUS_CHOICES = [('pending', 'Pending'), ('accepted', 'Accepted'), ('declined', 'Declined')]
@@ -210,17 +277,80 @@ class JudgingScore(models.Model):
     feedback = models.TextField(blank=True, null=True)
     class Meta: unique_together = ('judge', 'submission')
 
+class JudgeAssignment(models.Model):
+    """
+    A submission queued for a judge. Created by portal/assignments.py, which
+    balances the load across judges and skips conflicts of interest.
+    """
+    judge = models.ForeignKey(User, on_delete=models.CASCADE, related_name='judge_assignments')
+    submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name='judge_assignments')
+    assigned_at = models.DateTimeField(auto_now_add=True)
+    # (judge, submission) doubles as the index behind the keyset-paginated queue
+    class Meta: unique_together = ('judge', 'submission')
+
+class JudgeScoreStats(models.Model):
+    """
+    Running score statistics per judge, used to normalize away harsh or lenient
+    judges. Maintained by portal/leaderboard.py whenever a JudgingScore changes.
+    """
+    judge = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='score_stats')
+    score_count = models.PositiveIntegerField(default=0)
+    score_mean = models.FloatField(default=0)
+    score_stddev = models.FloatField(default=0)
+
+class LeaderboardEntry(models.Model):
+    """
+    Materialized per-submission aggregate of JudgingScore rows, so the ranking
+    is read in one indexed query instead of aggregating every score per view.
+    """
+    submission = models.OneToOneField(Submission, on_delete=models.CASCADE, primary_key=True, related_name='leaderboard_entry')
+    # Copy of submission.team.event, so one event's ranking is an index range
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    score_count = models.PositiveIntegerField(default=0)
+    score_sum = models.FloatField(default=0)
+    score_mean = models.FloatField(default=0)
+    score_min = models.FloatField(default=0)
+    score_max = models.FloatField(default=0)
+    # Mean of the judges' z-scores (score relative to that judge's own mean/stddev)
+    normalized_score = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        ordering = ['-score_mean']
+        indexes = [
+            models.Index(fields=['event', '-score_mean', 'submission'], name='leaderboard_event_mean_idx'),
+            models.Index(fields=['event', '-normalized_score', 'submission'], name='leaderboard_event_norm_idx'),
+        ]
+
 class Announcement(models.Model):
+    """
+    A broadcast to everyone following an event, stored once. Users are not
+    given a row each; AnnouncementReadMark records how far each has read.
+    """
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='announcements')
     title = models.CharField(max_length=255)
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    class Meta:
+        indexes = [models.Index(fields=['event', 'created_at'], name='announcement_event_time_idx')]
+
+class AnnouncementReadMark(models.Model):
+    """Per-user read watermark: announcements of the event up to last_read_at are read."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='announcement_read_marks')
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='+')
+    last_read_at = models.DateTimeField()
+    class Meta: unique_together = ('user', 'event')
 
 class Notification(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
     message = models.TextField()
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    class Meta:
+        indexes = [
+            # Unread counts, and the newest-first feed read with a created_at cursor
+            models.Index(fields=['user', 'is_read', 'created_at'], name='notification_unread_idx'),
+            models.Index(fields=['user', 'created_at'], name='notification_feed_idx'),
+        ]
 
 # ==============================================================================
 # 6. INVITE CODE MODEL
@@ -0,0 +1,181 @@
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Announcement, AnnouncementReadMark, Event, Notification
+from .routers import primary_reads
+
+# ==============================================================================
+# NOTIFICATION DELIVERY
+# ==============================================================================
+# Announcements are fanned out on read: a broadcast is one Announcement row,
+# and each user's unread state is a single watermark per event. Personal
+# messages stay as Notification rows. The two are merged when displayed.
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+FEED_PAGE_SIZE = 20
+# Tie-breaker between the two sources in the feed's cursor
+FEED_SOURCES = {Announcement: 'a', Notification: 'n'}
+
+
+def broadcast(event, title, message):
+    """Announces to everyone following the event with a single insert."""
+    return Announcement.objects.create(event=event, title=title, message=message)
+
+
+def notify(user, message):
+    """Sends a personal notification to one user."""
+    return Notification.objects.create(user=user, message=message)
+
+
+def _visible_announcements(user):
+    """Announcements of published events, annotated with the user's watermark for that event."""
+    read_mark = AnnouncementReadMark.objects.filter(user=user, event=OuterRef('event')).values('last_read_at')[:1]
+    return (
+        Announcement.objects.filter(event__event_status='published')
+        .annotate(read_until=Coalesce(Subquery(read_mark), Value(EPOCH)))
+    )
+
+
+def _feed_key(item):
+    """Feed order, newest first: items sharing a timestamp are told apart by source and id."""
+    return item.created_at, FEED_SOURCES[type(item)], item.pk
+
+
+def _older_than(items, source, cursor):
+    """The items of one source that come after the cursor in feed order."""
+    created_at, cursor_source, pk = cursor
+    if source == cursor_source:
+        return items.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    if source < cursor_source:
+        return items.filter(created_at__lte=created_at)
+    return items.filter(created_at__lt=created_at)
+
+
+def format_cursor(cursor):
+    created_at, source, pk = cursor
+    return f"{created_at.isoformat()},{source},{pk}"
+
+
+def parse_cursor(text):
+    """The cursor format_cursor() wrote, or None for anything else."""
+    try:
+        created_at, source, pk = text.rsplit(',', 2)
+        created_at, pk = parse_datetime(created_at), int(pk)
+    except ValueError:
+        return None
+    if created_at is None or source not in FEED_SOURCES.values():
+        return None
+    return created_at, source, pk
+
+
+def feed(user, before=None, limit=FEED_PAGE_SIZE):
+    """
+    One page of the user's personal notifications and announcements, newest
+    first, after the `before` cursor: the (created_at, source, id) of the
+    last item shown, so items sharing a timestamp are neither skipped nor
+    repeated. Each source is read with its own LIMITed index scan and the two
+    are merged here. Every item gets an `is_read` flag; announcements also
+    keep their `title`. Returns (items, next_cursor); next_cursor is None on
+    the last page.
+    """
+    announcements = _visible_announcements(user).order_by('-created_at', '-pk')
+    personal = user.notifications.order_by('-created_at', '-pk')
+    if before is not None:
+        announcements = _older_than(announcements, FEED_SOURCES[Announcement], before)
+        personal = _older_than(personal, FEED_SOURCES[Notification], before)
+    announcements = list(announcements[:limit + 1])
+    for announcement in announcements:
+        announcement.is_read = announcement.created_at <= announcement.read_until
+    items = sorted(announcements + list(personal[:limit + 1]), key=_feed_key, reverse=True)
+    if len(items) > limit:
+        return items[:limit], _feed_key(items[limit - 1])
+    return items, None
+
+
+def mark_read(user, items):
+    """
+    Marks the displayed items read: personal notifications by id, and each
+    event's announcement watermark up to the newest announcement shown.
+    """
+    notification_ids = [item.pk for item in items if isinstance(item, Notification) and not item.is_read]
+    if notification_ids:
+        Notification.objects.filter(pk__in=notification_ids, is_read=False).update(is_read=True)
+        cache.delete(_personal_key(user.pk))
+
+    newest = {}
+    for item in items:
+        if isinstance(item, Announcement) and not item.is_read:
+            newest[item.event_id] = max(item.created_at, newest.get(item.event_id, EPOCH))
+    for event_id, read_until in newest.items():
+        # Only ever moves the watermark forward
+        updated = AnnouncementReadMark.objects.filter(
+            user=user, event_id=event_id, last_read_at__lt=read_until,
+        ).update(last_read_at=read_until)
+        if not updated:
+            AnnouncementReadMark.objects.get_or_create(user=user, event_id=event_id,
+                                                       defaults={'last_read_at': read_until})
+    if newest:
+        cache.delete(_announcement_key(user.pk))
+
+
+# ==============================================================================
+# CACHED UNREAD COUNTER
+# ==============================================================================
+# The badge count is served from the cache. The personal part is adjusted in
+# place by the Notification signals. The announcement part is keyed by a
+# global version that every new announcement bumps, so all users recount
+# once, lazily, instead of the broadcast touching every user's counter.
+ANNOUNCEMENT_VERSION_KEY = 'portal:announcements:version'
+
+
+def _personal_key(user_id):
+    return f"portal:unread:personal:{user_id}"
+
+
+def _announcement_key(user_id):
+    # A time-based version never repeats one a lost (evicted) key had handed out
+    version = cache.get_or_set(ANNOUNCEMENT_VERSION_KEY, time.time_ns, None)
+    return f"portal:unread:announcements:{user_id}:{version}"
+
+
+def unread_count(user):
+    """Unread personal notifications plus announcements past the user's watermarks."""
+    personal_key, announcement_key = _personal_key(user.pk), _announcement_key(user.pk)
+    counts = cache.get_many([personal_key, announcement_key])
+    # Recounted on the primary: the counters are dropped by the writes that change them
+    if personal_key not in counts:
+        with primary_reads():
+            counts[personal_key] = Notification.objects.filter(user=user, is_read=False).count()
+        cache.set(personal_key, counts[personal_key], settings.UNREAD_COUNT_CACHE_TIMEOUT)
+    if announcement_key not in counts:
+        with primary_reads():
+            counts[announcement_key] = _visible_announcements(user).filter(created_at__gt=F('read_until')).count()
+        cache.set(announcement_key, counts[announcement_key], settings.UNREAD_COUNT_CACHE_TIMEOUT)
+    return counts[personal_key] + counts[announcement_key]
+
+
+def personal_unread_changed(user_id, delta):
+    """Adjusts a cached personal counter in place; a missing one is recounted on next read."""
+    try:
+        cache.incr(_personal_key(user_id), delta)
+    except ValueError:
+        pass
+
+
+def personal_unread_reset(user_ids):
+    """Drops many users' cached personal counters at once, e.g. after a bulk_create sent no signals."""
+    cache.delete_many([_personal_key(user_id) for user_id in user_ids])
+
+
+def announcements_changed():
+    """Invalidates every user's cached announcement count in O(1)."""
+    try:
+        cache.incr(ANNOUNCEMENT_VERSION_KEY)
+    except ValueError:
+        cache.set(ANNOUNCEMENT_VERSION_KEY, time.time_ns(), None)
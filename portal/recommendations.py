@@ -0,0 +1,182 @@
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, F, OuterRef
+
+from .models import ProfileSkill, Team, TeamMember, UserProfile
+
+# ==============================================================================
+# TEAMMATE RECOMMENDATIONS
+# ==============================================================================
+# Solo participants are matched with other unteamed participants and with
+# teams that still have free slots. precompute() scores the whole pool at once
+# with NumPy (skills as 0/1 vectors over the indexed skill vocabulary, see
+# portal/skills.py) and caches each participant's top picks; the dashboard only
+# reads that cache. Run it periodically: `manage.py recommend_teammates`.
+#
+# A candidate scores higher for
+#   skills  the share of the pair's combined skills the newcomer brings
+#   branch  coming from another branch (for a team: a branch it has few of)
+#   year    being in (or, for a team, near its average) the same year
+SUGGESTION_COUNT = 5
+SKILL_WEIGHT = 0.6
+BRANCH_WEIGHT = 0.2
+YEAR_WEIGHT = 0.2
+# Rows scored per matrix product; bounds memory to BLOCK_SIZE x pool size floats
+BLOCK_SIZE = 512
+RECOMMENDATION_CACHE_PREFIX = 'portal:teammates'
+
+
+def recommendation_key(event_id, user_id):
+    return f"{RECOMMENDATION_CACHE_PREFIX}:{event_id}:{user_id}"
+
+
+def _unteamed(event_id, participant='user_id'):
+    """Condition: the participant (a field of the outer query) has no team for the event."""
+    return ~Exists(TeamMember.objects.filter(participant=OuterRef(participant), team__event=event_id))
+
+
+def _skill_matrix(profile_ids, rows, vocabulary):
+    """0/1 matrix of (profile, skill) rows, one line per sorted profile id."""
+    matrix = np.zeros((len(profile_ids), len(vocabulary)), dtype=np.float32)
+    if rows:
+        owners, skills = zip(*rows)
+        matrix[np.searchsorted(profile_ids, owners), np.searchsorted(vocabulary, skills)] = 1
+    return matrix
+
+
+def _years(values):
+    return np.array([np.nan if year is None else year for year in values], dtype=np.float32)
+
+
+def _year_closeness(years, others):
+    """1 for the same year, 0 for three apart; 0.5 when either year is unknown."""
+    closeness = 1 - np.abs(years[:, None] - others[None, :]) / 3
+    return np.nan_to_num(np.clip(closeness, 0, 1), nan=0.5)
+
+
+def _top(scores, ids):
+    """The SUGGESTION_COUNT best (id, score) pairs of each row, best first."""
+    count = min(SUGGESTION_COUNT, scores.shape[1])
+    if count == 0:
+        return [[] for _ in range(scores.shape[0])]
+    best = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+    best = np.take_along_axis(best, np.argsort(-np.take_along_axis(scores, best, axis=1), axis=1), axis=1)
+    return [
+        [(int(ids[j]), round(float(row_scores[j]), 3)) for j in row if np.isfinite(row_scores[j])]
+        for row, row_scores in zip(best, scores)
+    ]
+
+
+def precompute(event_id):
+    """Scores every unteamed participant of the event and caches their suggestions; returns how many."""
+    people = list(
+        UserProfile.objects.filter(user_role='Participant').filter(_unteamed(event_id))
+        .order_by('pk').values_list('pk', 'branch', 'year_of_study')
+    )
+    if not people:
+        return 0
+    open_teams = Team.objects.filter(event_id=event_id, member_count__lt=F('max_size'))
+    members = list(
+        TeamMember.objects.filter(team__in=open_teams)
+        .values_list('team_id', 'participant_id', 'participant__userprofile__branch',
+                      'participant__userprofile__year_of_study')
+    )
+    people_skills = list(
+        ProfileSkill.objects.filter(profile__user_role='Participant')
+        .filter(_unteamed(event_id, 'profile_id'))
+        .values_list('profile_id', 'skill')
+    )
+    member_skills = list(
+        ProfileSkill.objects.filter(profile__user__team_memberships__team__in=open_teams)
+        .values_list('profile_id', 'skill').distinct()
+    )
+
+    person_ids = np.array([row[0] for row in people])
+    team_ids = np.unique(np.array([row[0] for row in members], dtype=np.int64))
+    member_ids = np.unique(np.array([row[1] for row in members], dtype=np.int64))
+    vocabulary = np.unique(np.array([skill for _, skill in people_skills + member_skills] or [''], dtype=object))
+    branches = np.unique(np.array([(branch or '').upper() for _, branch, _ in people]
+                                  + [(row[2] or '').upper() for row in members], dtype=object))
+
+    # --- Participant vectors ---
+    skills = _skill_matrix(person_ids, people_skills, vocabulary)
+    skill_counts = skills.sum(axis=1)
+    branch = np.searchsorted(branches, np.array([(b or '').upper() for _, b, _ in people], dtype=object))
+    known_branch = branches[branch] != ''
+    years = _years(year for _, _, year in people)
+
+    # --- Team vectors: union of the members' skills, branch counts, mean year ---
+    team_skills = np.zeros((len(team_ids), len(vocabulary)), dtype=np.float32)
+    team_branches = np.zeros((len(team_ids), len(branches)), dtype=np.float32)
+    team_years = np.full(len(team_ids), np.nan, dtype=np.float32)
+    if members:
+        member_team = np.searchsorted(team_ids, [row[0] for row in members])
+        member_vectors = _skill_matrix(member_ids, member_skills, vocabulary)
+        np.maximum.at(team_skills, member_team, member_vectors[np.searchsorted(member_ids, [row[1] for row in members])])
+        member_branch = np.searchsorted(branches, np.array([(row[2] or '').upper() for row in members], dtype=object))
+        np.add.at(team_branches, (member_team, member_branch), 1)
+        member_years = _years(row[3] for row in members)
+        known = ~np.isnan(member_years)
+        year_sums = np.bincount(member_team[known], member_years[known], minlength=len(team_ids))
+        year_counts = np.bincount(member_team[known], minlength=len(team_ids))
+        np.divide(year_sums, year_counts, out=team_years, where=year_counts > 0)
+    team_skill_counts = team_skills.sum(axis=1)
+    team_sizes = np.maximum(team_branches.sum(axis=1), 1)
+
+    entries = {}
+    for start in range(0, len(people), BLOCK_SIZE):
+        block = slice(start, start + BLOCK_SIZE)
+        rows = np.arange(len(person_ids))[block]
+
+        # Participant x participant: what the candidate adds to the pair
+        shared = skills[block] @ skills.T
+        union = skill_counts[block, None] + skill_counts[None, :] - shared
+        brought = np.divide(skill_counts[None, :] - shared, union, out=np.zeros_like(shared), where=union > 0)
+        other_branch = np.where(
+            known_branch[block, None] & known_branch[None, :],
+            (branch[block, None] != branch[None, :]).astype(np.float32), 0.5,
+        )
+        scores = (SKILL_WEIGHT * brought + BRANCH_WEIGHT * other_branch
+                  + YEAR_WEIGHT * _year_closeness(years[block], years))
+        scores[np.arange(len(rows)), rows] = -np.inf
+        people_top = _top(scores, person_ids)
+
+        # Participant x open team: what the participant adds to the team
+        shared = skills[block] @ team_skills.T
+        union = skill_counts[block, None] + team_skill_counts[None, :] - shared
+        brought = np.divide(skill_counts[block, None] - shared, union, out=np.zeros_like(shared), where=union > 0)
+        branch_share = team_branches[:, branch[block]].T / team_sizes[None, :]
+        new_branch = np.where(known_branch[block, None], 1 - branch_share, 0.5)
+        scores = (SKILL_WEIGHT * brought + BRANCH_WEIGHT * new_branch
+                  + YEAR_WEIGHT * _year_closeness(years[block], team_years))
+        teams_top = _top(scores, team_ids)
+
+        for person_id, suggested_people, suggested_teams in zip(person_ids[block], people_top, teams_top):
+            entries[recommendation_key(event_id, int(person_id))] = {
+                'people': suggested_people, 'teams': suggested_teams,
+            }
+        cache.set_many(entries, settings.RECOMMENDATION_CACHE_TIMEOUT)
+        entries.clear()
+    return len(people)
+
+
+def suggestions(user, event_id):
+    """
+    The cached suggestions for user as (profiles, teams), best first. Anyone
+    who has joined a team and any team that filled up since the last
+    precompute() is left out.
+    """
+    entry = cache.get(recommendation_key(event_id, user.pk))
+    if not entry:
+        return [], []
+    profiles, teams = [], []
+    if entry['people']:
+        found = UserProfile.objects.filter(pk__in=[pk for pk, _ in entry['people']]).filter(_unteamed(event_id))
+        by_id = {profile.pk: profile for profile in found.select_related('user')}
+        profiles = [by_id[pk] for pk, _ in entry['people'] if pk in by_id]
+    if entry['teams']:
+        found = Team.objects.filter(pk__in=[pk for pk, _ in entry['teams']], member_count__lt=F('max_size'))
+        by_id = {team.pk: team for team in found.select_related('leader')}
+        teams = [by_id[pk] for pk, _ in entry['teams'] if pk in by_id]
+    return profiles, teams
@@ -0,0 +1,122 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# ==============================================================================
+# PRIMARY / REPLICA ROUTING
+# ==============================================================================
+# Writes always go to the primary ('default'). Reads go to one of
+# settings.DATABASE_REPLICAS only where ReplicaRoutingMiddleware (or a
+# replica_reads() block) allows it: GET/HEAD requests of a user who has not
+# written in the last REPLICA_STICKY_SECONDS. Everything else, including
+# management commands, reads inside a transaction and cache rebuilds
+# (primary_reads()), stays on the primary, so a flow never reads back older
+# data than it has just written.
+
+# Apps whose rows are read right after being written, by the next request
+PRIMARY_ONLY_APPS = {'sessions'}
+# Set on a response after a write; while present, the browser reads from the primary
+STICKY_COOKIE = 'kvs_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class _Routing:
+    """Routing state of one request, shared with the threads sync_to_async runs it in."""
+    __slots__ = ('replica_ok', 'sticky', 'wrote')
+
+    def __init__(self, replica_ok, sticky=False):
+        self.replica_ok = replica_ok
+        self.sticky = sticky
+        self.wrote = False
+
+
+_routing = ContextVar('portal_db_routing', default=None)
+
+
+def begin_request(request):
+    """Starts routing a request; returns the token end_request() needs."""
+    sticky = STICKY_COOKIE in request.COOKIES
+    return _routing.set(_Routing(replica_ok=request.method in SAFE_METHODS and not sticky, sticky=sticky))
+
+
+def end_request(token):
+    """Stops routing a request and returns whether it wrote to the primary."""
+    state = _routing.get()
+    _routing.reset(token)
+    return state.wrote
+
+
+@contextmanager
+def replica_reads():
+    """
+    Sends the reads of a block to a replica where the request alone would
+    not, e.g. an export started from a POSTed admin action or a batch job.
+    Still the primary for a user who has just written.
+    """
+    state = _routing.get()
+    if state is None:
+        token = _routing.set(_Routing(replica_ok=True))
+        try:
+            yield
+        finally:
+            _routing.reset(token)
+        return
+    previous = state.replica_ok
+    state.replica_ok = not state.sticky and not state.wrote
+    try:
+        yield
+    finally:
+        state.replica_ok = previous and not state.wrote
+
+
+@contextmanager
+def primary_reads():
+    """
+    Sends the reads of a block to the primary. For anything that refills a
+    cache: a replica that has not caught up with the write which emptied it
+    would put the old rows back for the whole cache timeout.
+    """
+    state = _routing.get()
+    if state is None:
+        yield
+        return
+    previous = state.replica_ok
+    state.replica_ok = False
+    try:
+        yield
+    finally:
+        state.replica_ok = previous and not state.wrote
+
+
+class PrimaryReplicaRouter:
+    """Database router sending allowed reads to a random replica; see the comment above."""
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or not state.replica_ok or not settings.DATABASE_REPLICAS:
+            return None
+        if model._meta.app_label in PRIMARY_ONLY_APPS or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db is not None:
+            # Follow a relation on the database its object came from
+            return instance._state.db
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            # The rest of the request reads what it wrote
+            state.replica_ok = False
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,190 @@
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import F
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+
+from . import images, leaderboard, live, notifications
+from .cache import invalidate_event_pages
+from .models import (
+    Event, EventBenefit, Schedule, SubSchedule, FAQ, Organizer, Eligibility,
+    HowToParticipateStep, ProblemStatement, EventMedia, JudgingScore, Team, TeamMember,
+    Announcement, Notification, Submission
+)
+
+# ==============================================================================
+# 1. RENDERED PAGE CACHE INVALIDATION
+# ==============================================================================
+# Every model rendered by event_content.html, so an admin edit shows up on the
+# next request instead of after the cache timeout.
+EVENT_CONTENT_MODELS = (
+    Event, EventBenefit, Schedule, SubSchedule, FAQ, Organizer, Eligibility,
+    HowToParticipateStep, ProblemStatement, EventMedia,
+)
+
+
+def _event_id_for(instance):
+    """
+    Returns the id of the event a piece of event content belongs to.
+    """
+    if isinstance(instance, Event):
+        return instance.pk
+    if isinstance(instance, SubSchedule):
+        try:
+            return instance.schedule.event_id
+        except ObjectDoesNotExist:
+            # The parent schedule is already gone (cascading delete), and its
+            # own signal takes care of the event.
+            return None
+    return instance.event_id
+
+
+def invalidate_event_page_cache(sender, instance, **kwargs):
+    event_id = _event_id_for(instance)
+    if event_id is not None:
+        invalidate_event_pages(event_id)
+
+
+for model in EVENT_CONTENT_MODELS:
+    post_save.connect(invalidate_event_page_cache, sender=model)
+    post_delete.connect(invalidate_event_page_cache, sender=model)
+
+
+# ==============================================================================
+# 2. LEADERBOARD MAINTENANCE
+# ==============================================================================
+def update_leaderboard_on_save(sender, instance, **kwargs):
+    leaderboard.score_changed(instance.judge_id, instance.submission_id)
+
+
+def update_leaderboard_on_delete(sender, instance, **kwargs):
+    leaderboard.score_changed(instance.judge_id, instance.submission_id, deleted=True)
+
+
+post_save.connect(update_leaderboard_on_save, sender=JudgingScore)
+post_delete.connect(update_leaderboard_on_delete, sender=JudgingScore)
+
+
+# ==============================================================================
+# 3. TEAM MEMBER COUNTER
+# ==============================================================================
+def count_added_member(sender, instance, created, **kwargs):
+    # portal.teams.join_team reserves the slot itself before saving
+    if created and not getattr(instance, '_slot_reserved', False):
+        Team.objects.filter(pk=instance.team_id).update(member_count=F('member_count') + 1)
+
+
+def count_removed_member(sender, instance, **kwargs):
+    Team.objects.filter(pk=instance.team_id, member_count__gt=0).update(member_count=F('member_count') - 1)
+
+
+post_save.connect(count_added_member, sender=TeamMember)
+post_delete.connect(count_removed_member, sender=TeamMember)
+
+
+# ==============================================================================
+# 4. UNREAD NOTIFICATION COUNTERS
+# ==============================================================================
+def count_new_notification(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        notifications.personal_unread_changed(instance.user_id, 1)
+
+
+def count_removed_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        notifications.personal_unread_changed(instance.user_id, -1)
+
+
+def recount_announcements(sender, instance, **kwargs):
+    # Publishing or unpublishing an event changes which announcements count too
+    notifications.announcements_changed()
+
+
+post_save.connect(count_new_notification, sender=Notification)
+post_delete.connect(count_removed_notification, sender=Notification)
+for model in (Announcement, Event):
+    post_save.connect(recount_announcements, sender=model)
+    post_delete.connect(recount_announcements, sender=model)
+
+
+# ==============================================================================
+# 5. IMAGE VARIANTS
+# ==============================================================================
+# Variants are built after the upload's transaction commits, off the request
+# path, and the old source's variants are dropped when it is replaced.
+def remember_previous_images(sender, instance, **kwargs):
+    fields = images.IMAGE_FIELDS[sender._meta.label]
+    previous = sender.objects.filter(pk=instance.pk).values(*fields).first() if instance.pk else None
+    instance._previous_images = previous or {}
+
+
+def refresh_image_variants(sender, instance, **kwargs):
+    # Cached event pages were rendered without the new variants' srcset
+    on_done = (lambda event_id=instance.event_id: invalidate_event_pages(event_id)) if sender is EventMedia else None
+    for field in images.IMAGE_FIELDS[sender._meta.label]:
+        old, new = instance._previous_images.get(field), getattr(instance, field).name
+        if new and new != old:
+            transaction.on_commit(lambda name=new: images.schedule_variants(name, on_done))
+        if old and old != new:
+            transaction.on_commit(lambda name=old: images.schedule_cleanup(name))
+
+
+def delete_image_variants(sender, instance, **kwargs):
+    for field in images.IMAGE_FIELDS[sender._meta.label]:
+        name = getattr(instance, field).name
+        if name:
+            transaction.on_commit(lambda name=name: images.schedule_cleanup(name))
+
+
+for model in (EventMedia, Submission):
+    pre_save.connect(remember_previous_images, sender=model)
+    post_save.connect(refresh_image_variants, sender=model)
+    post_delete.connect(delete_image_variants, sender=model)
+
+
+# ==============================================================================
+# 6. LIVE UPDATES
+# ==============================================================================
+# Pushed to open tabs over Server-Sent Events (portal/live.py) once the
+# change is committed.
+def publish_announcement(sender, instance, created, **kwargs):
+    if created and instance.event.event_status == 'published':
+        data = {'id': instance.pk, 'title': instance.title, 'message': instance.message}
+        transaction.on_commit(lambda: live.publish(live.event_channel(instance.event_id), 'announcement', data))
+
+
+def publish_timeline_change(sender, instance, **kwargs):
+    # Streams recompute the phase and released problems from the cache
+    event_id = instance.pk if sender is Event else instance.event_id
+    transaction.on_commit(lambda: live.publish(live.event_channel(event_id), 'timeline'))
+
+
+def _publish_membership(instance, change):
+    recipients = {instance.participant_id}
+    data = {'team_id': instance.team_id, 'participant_id': instance.participant_id,
+            'status': instance.status, 'change': change}
+    # The team is loaded whenever it was just joined (portal/teams.py); don't
+    # query it just to tell the leader.
+    if TeamMember.team.is_cached(instance):
+        recipients.add(instance.team.leader_id)
+        data['team_name'] = instance.team.team_name
+
+    def publish():
+        for user_id in recipients:
+            live.publish(live.user_channel(user_id), 'membership', data)
+    transaction.on_commit(publish)
+
+
+def publish_member_saved(sender, instance, created, **kwargs):
+    _publish_membership(instance, 'joined' if created else 'updated')
+
+
+def publish_member_removed(sender, instance, **kwargs):
+    _publish_membership(instance, 'left')
+
+
+post_save.connect(publish_announcement, sender=Announcement)
+for model in (Event, ProblemStatement):
+    post_save.connect(publish_timeline_change, sender=model)
+    post_delete.connect(publish_timeline_change, sender=model)
+post_save.connect(publish_member_saved, sender=TeamMember)
+post_delete.connect(publish_member_removed, sender=TeamMember)
@@ -0,0 +1,133 @@
+import re
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef
+
+from .models import ProfileSkill, TeamMember, UserProfile
+
+# ==============================================================================
+# SKILL INDEX
+# ==============================================================================
+# UserProfile.skills and technical_skills are free text ("React.js, python;
+# ML"). ProfileSkill keeps them tokenized, case-folded and mapped through
+# SKILL_ALIASES, one row per (skill, profile), so "who knows React" is an
+# index range scan instead of a LIKE over every profile. Profiles saved
+# through the forms are reindexed there; rebuild() redoes everything.
+SKILL_MAX_LENGTH = 50
+REINDEX_BATCH_SIZE = 2000
+SEARCH_PAGE_SIZE = 50
+SKILL_SEPARATORS = re.compile(r'[,;|\n]+')
+# Spelling variants -> the name they are indexed under
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'react.js': 'react',
+    'reactjs': 'react',
+    'react js': 'react',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'node js': 'node.js',
+    'vue.js': 'vue',
+    'vuejs': 'vue',
+    'next.js': 'nextjs',
+    'py': 'python',
+    'python3': 'python',
+    'cpp': 'c++',
+    'golang': 'go',
+    'postgres': 'postgresql',
+    'mongo': 'mongodb',
+    'k8s': 'kubernetes',
+    'tf': 'tensorflow',
+    'sklearn': 'scikit-learn',
+    'html5': 'html',
+    'css3': 'css',
+    'ml': 'machine learning',
+    'dl': 'deep learning',
+    'ai': 'artificial intelligence',
+    'nlp': 'natural language processing',
+    'cv': 'computer vision',
+    'dsa': 'data structures and algorithms',
+}
+
+
+def normalize_skill(text):
+    """The indexed form of one skill, or '' when there is nothing to index."""
+    skill = ' '.join(text.split()).casefold()
+    # List bullets in front, full stops behind (".net" keeps its dot)
+    skill = skill.lstrip('-*• ').rstrip('. ')
+    skill = SKILL_ALIASES.get(skill, skill)
+    return skill if len(skill) <= SKILL_MAX_LENGTH else ''
+
+
+def parse_skills(*texts):
+    """The set of normalized skills listed in any of texts (None is skipped)."""
+    skills = set()
+    for text in texts:
+        for token in SKILL_SEPARATORS.split(text or ''):
+            skill = normalize_skill(token)
+            if skill:
+                skills.add(skill)
+    return skills
+
+
+def index_profile(profile):
+    """Brings one profile's index rows in line with its skill fields, touching only what changed."""
+    wanted = parse_skills(profile.skills, profile.technical_skills)
+    with transaction.atomic():
+        indexed = set(ProfileSkill.objects.filter(profile=profile).values_list('skill', flat=True))
+        if indexed - wanted:
+            ProfileSkill.objects.filter(profile=profile, skill__in=indexed - wanted).delete()
+        if wanted - indexed:
+            ProfileSkill.objects.bulk_create(
+                [ProfileSkill(profile=profile, skill=skill) for skill in wanted - indexed],
+                ignore_conflicts=True,
+            )
+
+
+def index_profiles(profile_ids):
+    """Reindexes many profiles at once, e.g. after bulk_create(), which skips the forms."""
+    profile_ids = list(profile_ids)
+    with transaction.atomic():
+        for start in range(0, len(profile_ids), REINDEX_BATCH_SIZE):
+            batch = profile_ids[start:start + REINDEX_BATCH_SIZE]
+            ProfileSkill.objects.filter(profile_id__in=batch).delete()
+            ProfileSkill.objects.bulk_create(
+                ProfileSkill(profile_id=profile_id, skill=skill)
+                for profile_id, skills, technical in UserProfile.objects.filter(pk__in=batch)
+                .values_list('pk', 'skills', 'technical_skills')
+                for skill in parse_skills(skills, technical)
+            )
+
+
+def rebuild():
+    """Rebuilds the whole index from the profiles and returns the number of rows."""
+    with transaction.atomic():
+        ProfileSkill.objects.all().delete()
+        index_profiles(UserProfile.objects.order_by('pk').values_list('pk', flat=True).iterator())
+        return ProfileSkill.objects.count()
+
+
+def search(skills, match='all', branch=None, year_of_study=None, unteamed_for=None):
+    """
+    Participant profiles listing all (match='all') or any (match='any') of
+    skills, optionally narrowed by branch and year, and to participants with
+    no team for the event unteamed_for. skills may be names or free text; no
+    skills means no skill filter.
+    """
+    wanted = parse_skills(*skills) if isinstance(skills, (list, tuple, set)) else parse_skills(skills)
+    profiles = UserProfile.objects.filter(user_role='Participant')
+    if wanted:
+        postings = ProfileSkill.objects.filter(skill__in=wanted)
+        if match == 'all' and len(wanted) > 1:
+            # A profile holds each skill once (unique index), so counting rows counts skills
+            postings = postings.values('profile').annotate(matched=Count('skill')).filter(matched=len(wanted))
+        profiles = profiles.filter(pk__in=postings.values('profile'))
+    if branch:
+        profiles = profiles.filter(branch__iexact=branch)
+    if year_of_study:
+        profiles = profiles.filter(year_of_study=year_of_study)
+    if unteamed_for is not None:
+        profiles = profiles.filter(~Exists(
+            TeamMember.objects.filter(participant=OuterRef('user_id'), team__event=unteamed_for)
+        ))
+    return profiles.order_by('pk')
@@ -44,6 +44,55 @@ document.addEventListener("DOMContentLoaded", () => {
     setInterval(updateCountdown, 1000);
   }
 
+  // Unread notification badge (served from the cache, not the notification table)
+  const notificationLink = document.getElementById("notification-link");
+  const badge = document.getElementById("notification-badge");
+  function refreshBadge() {
+    if (!notificationLink) return;
+    fetch(notificationLink.dataset.countUrl, { credentials: "same-origin" })
+      .then((response) => (response.ok ? response.json() : null))
+      .then((data) => {
+        if (!data) return;
+        badge.textContent = data.unread > 99 ? "99+" : data.unread;
+        badge.hidden = data.unread <= 0;
+      })
+      .catch(() => {});
+  }
+  refreshBadge();
+
+  function showToast(text) {
+    const toast = document.createElement("div");
+    toast.className = "live-toast";
+    toast.textContent = text;
+    document.body.appendChild(toast);
+    setTimeout(() => toast.remove(), 8000);
+  }
+
+  // Live updates: one Server-Sent Events connection per tab. Each message is
+  // re-dispatched on document as a "live:<type>" event for the page scripts.
+  const liveUrl = document.body.dataset.liveUrl;
+  if (liveUrl && window.EventSource) {
+    const source = new EventSource(liveUrl);
+    ["announcement", "membership", "phase", "problems"].forEach((type) => {
+      source.addEventListener(type, (message) => {
+        document.dispatchEvent(
+          new CustomEvent("live:" + type, { detail: JSON.parse(message.data) })
+        );
+      });
+    });
+    // Anything missed while disconnected shows up in the count
+    source.addEventListener("open", refreshBadge);
+  }
+
+  document.addEventListener("live:announcement", (e) => {
+    showToast(e.detail.title + ": " + e.detail.message);
+    refreshBadge();
+  });
+  document.addEventListener("live:membership", (e) => {
+    const team = e.detail.team_name || "your team";
+    showToast(e.detail.change === "left" ? "A member left " + team + "." : "Team update for " + team + ".");
+  });
+
   // Theme Switcher
   const themeToggle = document.getElementById("theme-toggle");
   const htmlEl = document.documentElement;
@@ -75,4 +124,4 @@ document.addEventListener("DOMContentLoaded", () => {
       setDarkTheme();
     }
   });
-});
\ No newline at end of file
+});
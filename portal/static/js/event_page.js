@@ -47,17 +47,6 @@ document.addEventListener("DOMContentLoaded", function () {
       setupDotRing("minutes-ring", 60, accentColor);
       setupDotRing("seconds-ring", 60, accentColor);
 
-      // Get dates from data attributes
-      const regEndDate = new Date(
-        countdownSection.dataset.regEnd
-      ).getTime();
-      const eventStartDate = new Date(
-        countdownSection.dataset.eventStart
-      ).getTime();
-      const revealTimeDate = new Date(
-        countdownSection.dataset.revealTime
-      ).getTime();
-
       // Get DOM elements to update
       const titleEl = document.getElementById("countdown-title");
       const buttonEl = document.getElementById("register-button");
@@ -67,8 +56,38 @@ document.addEventListener("DOMContentLoaded", function () {
       const secondsEl = document.getElementById("seconds");
       const countdownEl = document.getElementById("countdown");
 
-      const countdownInterval = setInterval(function () {
+      // Phase boundaries come from timeline.json, which the browser caches
+      // until the next boundary. It is fetched again whenever one passes.
+      let regEndDate, eventStartDate, revealTimeDate, nextBoundary;
+      let countdownInterval = null;
+
+      function toTime(value) {
+        return value ? new Date(value).getTime() : -Infinity;
+      }
+
+      function loadTimeline(revalidate) {
+        // A live update means the browser's cached copy may be stale
+        return fetch(countdownSection.dataset.timelineUrl, revalidate ? { cache: "no-cache" } : {})
+          .then((response) => (response.ok ? response.json() : null))
+          .then((timeline) => {
+            if (!timeline) return;
+            regEndDate = toTime(timeline.registration_end);
+            eventStartDate = toTime(timeline.event_start);
+            revealTimeDate = toTime(timeline.problem_release);
+            nextBoundary = timeline.next_boundary ? toTime(timeline.next_boundary) : Infinity;
+            if (countdownInterval === null) {
+              countdownInterval = setInterval(tick, 1000);
+              tick();
+            }
+          });
+      }
+
+      function tick() {
         const now = new Date().getTime();
+        if (now >= nextBoundary) {
+          nextBoundary = Infinity;
+          loadTimeline();
+        }
         let targetDate, targetTitle;
         let maxDays = 30; // Default max days for ring display
 
@@ -108,7 +127,7 @@ document.addEventListener("DOMContentLoaded", function () {
           );
         } else {
           // Event is live or over
-          titleEl.textContent = "The Event is Live!";
+          if(titleEl) titleEl.textContent = "The Event is Live!";
           if(countdownEl) countdownEl.style.display = "none";
           clearInterval(countdownInterval);
           return;
@@ -139,9 +158,26 @@ document.addEventListener("DOMContentLoaded", function () {
         updateDotRing("hours-ring", hours, 24, accentColor);
         updateDotRing("minutes-ring", minutes, 60, accentColor);
         updateDotRing("seconds-ring", seconds, 60, accentColor);
-      }, 1000);
+      }
+
+      loadTimeline();
+      document.addEventListener("live:phase", () => loadTimeline(true));
     }
 
+    // Newly released problem statements are swapped in without a reload
+    document.addEventListener("live:problems", () => {
+      const challenges = document.getElementById("challenges");
+      if (!challenges) return;
+      fetch(window.location.href, { cache: "no-cache", credentials: "same-origin" })
+        .then((response) => (response.ok ? response.text() : null))
+        .then((html) => {
+          if (!html) return;
+          const fresh = new DOMParser().parseFromString(html, "text/html").getElementById("challenges");
+          if (fresh) challenges.replaceWith(fresh);
+        })
+        .catch(() => {});
+    });
+
     // --- 3. FAQ Accordion ---
     document.querySelectorAll(".accordion-question").forEach(function (btn) {
       btn.addEventListener("click", function () {
@@ -0,0 +1,46 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.mjs', '.json', '.map', '.svg', '.txt', '.xml', '.html', '.ico')
+# Below this many bytes the compressed copy saves less than its headers cost
+MIN_COMPRESS_SIZE = 256
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Content-hashed static files (css/base.3f2a1c9d8e7b.css) plus a .gz copy
+    of every text asset, and a .br copy when the brotli package is installed.
+    collectstatic writes them all; PrecompressedStaticMiddleware serves them.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(self.hashed_files) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.lower().endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                yield from self._compress(name)
+
+    def _compress(self, name):
+        with self.open(name) as handle:
+            data = handle.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(data)))
+        for suffix, compressed in variants:
+            if len(compressed) >= len(data):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
+            yield name, name + suffix, True
@@ -0,0 +1,119 @@
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import Team, TeamMember, ReservedTeamCode, generate_team_code
+
+# Attempts at drawing a code before team creation gives up
+TEAM_CODE_ATTEMPTS = 5
+
+
+class TeamError(Exception):
+    """A team change refused for a reason the participant can be told."""
+
+
+class TeamFull(TeamError):
+    pass
+
+
+class AlreadyOnTeam(TeamError):
+    pass
+
+
+class TeamNameTaken(TeamError):
+    pass
+
+# ==============================================================================
+# TEAM MEMBERSHIP
+# ==============================================================================
+def join_team(team, participant, role='Member'):
+    """
+    Adds a participant to a team if it still has a free slot.
+
+    The slot is reserved with a single conditional UPDATE on Team.member_count,
+    so capacity is enforced by the database row itself: concurrent joins
+    serialize on that one row only for the length of this short transaction,
+    and a team can never go over max_size. If creating the member fails, the
+    reservation is rolled back with it.
+
+    One team per event is checked under a lock on the participant's user row,
+    so two joins of the same participant to different teams serialize and the
+    second sees the first.
+    Returns the new TeamMember; raises AlreadyOnTeam or TeamFull.
+    """
+    with transaction.atomic():
+        list(User.objects.select_for_update().filter(pk=participant.pk).values_list('pk'))
+        if TeamMember.objects.filter(participant=participant, team__event_id=team.event_id).exists():
+            raise AlreadyOnTeam(f"User {participant.pk} is already in a team for event {team.event_id}.")
+        reserved = Team.objects.filter(
+            pk=team.pk, member_count__lt=F('max_size')
+        ).update(member_count=F('member_count') + 1)
+        if not reserved:
+            raise TeamFull(f"Team {team.pk} is full.")
+        member = TeamMember(team=team, participant=participant, role=role, status='accepted')
+        # Tells the post_save signal the counter has already been bumped
+        member._slot_reserved = True
+        member.save()
+    return member
+
+
+
+# ==============================================================================
+# TEAM CODES
+# ==============================================================================
+def allocate_team_code():
+    """
+    Returns a team code, preferring the pre-generated pool. A pooled code is
+    claimed by locking and deleting its row. The lock skips rows other
+    workers hold, so concurrent team creations each take a different code
+    instead of queuing on the head of the pool until the first commits.
+    Falls back to a random code.
+    """
+    with transaction.atomic():
+        for _ in range(TEAM_CODE_ATTEMPTS):
+            reserved = ReservedTeamCode.objects.select_for_update(skip_locked=True).order_by('pk').first()
+            if reserved is None:
+                break
+            # Backends without row locks (SQLite) can still lose the race here
+            deleted, _ = ReservedTeamCode.objects.filter(pk=reserved.pk).delete()
+            if deleted:
+                return reserved.code
+    return generate_team_code()
+
+
+def save_new_team(team):
+    """
+    Saves a new team under a freshly allocated code, retrying a bounded number
+    of times if the code is already taken. Raises TeamNameTaken when the event
+    already has a team of that name; other integrity errors are raised as-is.
+    """
+    for _ in range(TEAM_CODE_ATTEMPTS):
+        team.team_code = allocate_team_code()
+        try:
+            with transaction.atomic():
+                team.save()
+            return team
+        except IntegrityError:
+            if Team.objects.filter(event_id=team.event_id, team_name=team.team_name).exists():
+                raise TeamNameTaken(f"Event {team.event_id} already has a team named {team.team_name!r}.")
+            if not Team.objects.filter(team_code=team.team_code).exists():
+                raise
+    raise IntegrityError(f"No free team code after {TEAM_CODE_ATTEMPTS} attempts.")
+
+
+def reserve_team_codes(count, batch_size=1000):
+    """
+    Tops the pool up with `count` new codes that clash with no team or
+    reserved code. Returns the number of codes added.
+    """
+    added = 0
+    while added < count:
+        wanted = min(batch_size, count - added)
+        candidates = {generate_team_code() for _ in range(wanted)}
+        candidates -= set(Team.objects.filter(team_code__in=candidates).values_list('team_code', flat=True))
+        candidates -= set(ReservedTeamCode.objects.filter(code__in=candidates).values_list('code', flat=True))
+        ReservedTeamCode.objects.bulk_create(
+            (ReservedTeamCode(code=code) for code in candidates), ignore_conflicts=True
+        )
+        added += len(candidates)
+    return added
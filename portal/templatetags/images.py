@@ -0,0 +1,42 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+from portal import images
+
+register = template.Library()
+
+
+def _srcset(name, widths, ext):
+    return ", ".join(f"{default_storage.url(images.variant_name(name, width, ext))} {width}w" for width in widths)
+
+
+@register.simple_tag
+def responsive_image(image, alt='', sizes='100vw', css_class=''):
+    """
+    Renders an uploaded image as a <picture> with a WebP srcset, plus a
+    srcset in the original format for browsers without WebP, from the
+    variants in portal/images.py. Until the variants exist it is a plain
+    <img> of the original. Renders nothing for an empty field.
+
+        {% load images %}
+        {% responsive_image event.media.banner_image alt=event.title sizes="(min-width: 1024px) 960px, 100vw" %}
+    """
+    if not image:
+        return ''
+    name = image.name
+    widths = images.available_widths(name)
+    fallback = images.variant_exts(name)[1:]
+    if widths and fallback:
+        img = format_html(
+            '<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" loading="lazy" decoding="async">',
+            image.url, _srcset(name, widths, fallback[0]), sizes, alt, css_class,
+        )
+    else:
+        img = format_html('<img src="{}" alt="{}" class="{}" loading="lazy" decoding="async">', image.url, alt, css_class)
+    if not widths:
+        return img
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">{}</picture>',
+        _srcset(name, widths, '.webp'), sizes, img,
+    )
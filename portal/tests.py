@@ -1,5 +1,67 @@
-from django.test import TestCase, Client
-from django.urls import reverse
+import asyncio
+import csv
+import gzip
+import json
+import posixpath
+import re
+import tempfile
+import time
+import unittest
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections, router, OperationalError
+from django.db.models import Count
+from concurrent.futures import ThreadPoolExecutor
+
+from django.http import HttpResponse
+from django.test import (
+    SimpleTestCase, TestCase, TransactionTestCase, Client, AsyncRequestFactory, RequestFactory,
+    override_settings
+)
+from django.test.utils import CaptureQueriesContext
+from asgiref.sync import sync_to_async
+from django.urls import include, path, reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from PIL import Image as PILImage
+
+from . import urls as portal_urls
+from .models import (
+    Event, FAQ, UserProfile, EventBenefit, ProblemStatement, Schedule, SubSchedule,
+    HowToParticipateStep, Organizer, Eligibility, Team, TeamMember, Submission,
+    JudgingScore, Notification, LeaderboardEntry, JudgeAssignment, ReservedTeamCode,
+    TEAM_CODE_ALPHABET, Announcement, EventMedia, JudgeScoreStats, ProfileSkill
+)
+from . import notifications
+from . import images
+from . import live
+from . import bulk
+from . import exports
+from . import routers
+from . import recommendations
+from . import skills
+from . import timeline
+from .cache import page_cache_key, single_flight
+from .pagination import EstimatedCountPaginator
+from .middleware import PrecompressedStaticMiddleware, ReplicaRoutingMiddleware, accepted_encodings
+from . import leaderboard
+from .assignments import assign_submissions, unscored_queue
+from .teams import AlreadyOnTeam, TeamFull, join_team, save_new_team, reserve_team_codes
+from .forms import ParticipantRegistrationForm
+from .views import role_required
 
 class LoginPageTest(TestCase):
     def setUp(self):
@@ -23,4 +85,1609 @@ class LoginPageTest(TestCase):
         self.assertContains(response, 'Login to Your Account')
         self.assertContains(response, '<form method="POST"')
         self.assertContains(response, 'csrfmiddlewaretoken')
-        self.assertContains(response, 'type="submit"')
\ No newline at end of file
+        self.assertContains(response, 'type="submit"')
+
+class EventPageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.event = Event.objects.create(
+            event_name='CodeFest', title='CodeFest 2025', hero_section_details='Build things',
+            event_status='published', registration_end=now + timedelta(days=1),
+            event_start=now + timedelta(days=2),
+        )
+        self.detail_url = reverse('event_detail', args=[self.event.id])
+
+    def test_anonymous_page_is_served_from_cache(self):
+        """Test that a repeat anonymous visit does not touch the database"""
+        self.client.get(self.detail_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.detail_url)
+        self.assertContains(response, 'CodeFest 2025')
+
+    def test_content_change_invalidates_cached_page(self):
+        """Test that saving event content drops the cached pages"""
+        self.client.get(reverse('index'))
+        self.client.get(self.detail_url)
+        FAQ.objects.create(event=self.event, question='Is it free?', answer='Yes')
+        self.assertContains(self.client.get(reverse('index')), 'Is it free?')
+        self.assertContains(self.client.get(self.detail_url), 'Is it free?')
+
+    def test_landing_page_skips_draft_events(self):
+        """Test that a newer draft does not replace the published event and its countdown on the landing page"""
+        self.client.get(reverse('index'))
+        Event.objects.create(event_name='Draft', title='Next Year', hero_section_details='Soon')
+        response = self.client.get(reverse('index'))
+        self.assertContains(response, 'CodeFest 2025')
+        self.assertContains(response, f'data-timeline-url="{reverse("event_timeline", args=[self.event.id])}"')
+        self.assertNotContains(response, 'Next Year')
+
+
+class EventTimelineTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.now()
+        self.event = Event.objects.create(
+            event_name='CodeFest', title='CodeFest 2025', hero_section_details='Build things',
+            event_status='published', registration_start=self.now - timedelta(days=1),
+            registration_end=self.now + timedelta(hours=2), event_start=self.now + timedelta(days=2),
+            event_end=self.now + timedelta(days=3),
+        )
+        ProblemStatement.objects.create(event=self.event, title='Later', description='Solve it',
+                                        time_to_unlock=self.now + timedelta(days=2, hours=2))
+        ProblemStatement.objects.create(event=self.event, title='First', description='Solve it',
+                                        time_to_unlock=self.now + timedelta(days=2, hours=1))
+        self.url = reverse('event_timeline', args=[self.event.id])
+
+    def test_payload_expires_at_next_boundary(self):
+        """Test that the timeline lists every boundary and is cacheable until the next one"""
+        response = self.client.get(self.url)
+        data = response.json()
+        self.assertEqual(data['phase'], 'registration_open')
+        self.assertEqual(data['next_boundary'], data['registration_end'])
+        # the first problem's unlock time, to the millisecond JSON keeps
+        self.assertAlmostEqual(parse_datetime(data['problem_release']), self.now + timedelta(days=2, hours=1),
+                               delta=timedelta(milliseconds=1))
+        max_age = int(response['Cache-Control'].split('max-age=')[1].split(',')[0])
+        self.assertTrue(0 < max_age <= 2 * 60 * 60)
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_repeat_requests_are_free_and_revalidate(self):
+        """Test that the timeline is served from the cache and answers If-None-Match with 304"""
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('max-age', response['Cache-Control'])
+
+    def test_date_change_invalidates_timeline(self):
+        """Test that editing the event's dates changes the timeline and its ETag"""
+        etag = self.client.get(self.url)['ETag']
+        self.event.registration_end = self.now - timedelta(hours=1)
+        self.event.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['phase'], 'registration_closed')
+
+    def test_unpublished_event_is_not_found(self):
+        """Test that drafts have no public timeline"""
+        self.event.event_status = 'draft'
+        self.event.save()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+
+class ProblemReleaseTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.event = Event.objects.create(
+            event_name='CodeFest', title='CodeFest 2025', hero_section_details='Build things',
+            event_status='published', event_start=now - timedelta(hours=1),
+        )
+        ProblemStatement.objects.create(event=self.event, title='Open problem', description='Solve it',
+                                        time_to_unlock=now - timedelta(minutes=5))
+        self.locked = ProblemStatement.objects.create(event=self.event, title='Secret problem', description='Later',
+                                                      time_to_unlock=now + timedelta(hours=1))
+        self.url = reverse('event_detail', args=[self.event.id])
+
+    def test_locked_statements_are_hidden_until_unlock(self):
+        """Test that the page shows a problem statement only once it unlocks"""
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Open problem')
+        self.assertNotContains(response, 'Secret problem')
+        released, next_unlock = timeline.released_problems(self.event.id, now=self.locked.time_to_unlock)
+        self.assertEqual([p.title for p in released], ['Open problem', 'Secret problem'])
+        self.assertIsNone(next_unlock)
+
+    def test_cached_page_flips_at_unlock_without_queries(self):
+        """Test that a cached page expires exactly at the unlock and the release itself is free"""
+        self.locked.time_to_unlock = timezone.now() + timedelta(seconds=0.3)
+        self.locked.save()
+        self.assertNotContains(self.client.get(self.url), 'Secret problem')
+        time.sleep(0.35)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertContains(self.client.get(self.url), 'Secret problem')
+        self.assertFalse([q for q in queries if 'portal_problemstatement' in q['sql']])
+
+    def test_concurrent_misses_rebuild_once(self):
+        """Test that a burst of cache misses runs the rebuild in a single worker"""
+        calls = []
+
+        def rebuild():
+            calls.append(1)
+            time.sleep(0.05)
+            return 'value', None
+
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            values = list(pool.map(lambda _: single_flight('test:single-flight', rebuild, 60), range(20)))
+        self.assertEqual(values, ['value'] * 20)
+        self.assertEqual(len(calls), 1)
+
+
+class ReleaseLoadTestCommandTest(TransactionTestCase):
+    def test_reports_percentiles_and_single_rebuild(self):
+        """Test that the load test fires the refreshes and the release hits the database once"""
+        cache.clear()
+        event = Event.objects.create(event_name='CodeFest', title='CodeFest', hero_section_details='Build',
+                                     event_status='published')
+        ProblemStatement.objects.create(event=event, title='Problem', description='Solve',
+                                        time_to_unlock=timezone.now())
+        out = StringIO()
+        call_command('load_test_release', requests=40, concurrency=8, stdout=out)
+        self.assertIn('40 refreshes', out.getvalue())
+        self.assertIn('p99', out.getvalue())
+        self.assertIn('problem statement queries: 1', out.getvalue())
+
+
+class QueryBudgetTest(TestCase):
+    """
+    Renders every route in portal/urls.py as each role and checks it stays within
+    a fixed query budget, both on the seeded data and after it grows 10x.
+    """
+    ROLES = ('anonymous', 'Participant', 'Judge', 'superuser')
+
+    # (url name, role) -> max queries. Session and user (with profile) lookups are included.
+    QUERY_BUDGETS = {
+        ('index', 'anonymous'): 9, ('index', 'Participant'): 11,
+        ('index', 'Judge'): 11, ('index', 'superuser'): 11,
+        ('event_detail', 'anonymous'): 9, ('event_detail', 'Participant'): 11,
+        ('event_detail', 'Judge'): 11, ('event_detail', 'superuser'): 11,
+        ('event_timeline', 'anonymous'): 1, ('event_timeline', 'Participant'): 1,
+        ('event_timeline', 'Judge'): 1, ('event_timeline', 'superuser'): 1,
+        ('home', 'anonymous'): 1, ('home', 'Participant'): 3,
+        ('home', 'Judge'): 3, ('home', 'superuser'): 3,
+        ('login', 'anonymous'): 0, ('login', 'Participant'): 2,
+        ('login', 'Judge'): 2, ('login', 'superuser'): 2,
+        ('logout', 'anonymous'): 0, ('logout', 'Participant'): 4,
+        ('logout', 'Judge'): 4, ('logout', 'superuser'): 4,
+        ('profile', 'anonymous'): 0, ('profile', 'Participant'): 2,
+        ('profile', 'Judge'): 2, ('profile', 'superuser'): 2,
+        ('team_create', 'anonymous'): 0, ('team_create', 'Participant'): 4,
+        ('team_create', 'Judge'): 2, ('team_create', 'superuser'): 2,
+        ('team_join', 'anonymous'): 0, ('team_join', 'Participant'): 2,
+        ('team_join', 'Judge'): 2, ('team_join', 'superuser'): 2,
+        ('notifications', 'anonymous'): 0, ('notifications', 'Participant'): 10,
+        ('notifications', 'Judge'): 10, ('notifications', 'superuser'): 10,
+        ('notifications_unread_count', 'anonymous'): 0, ('notifications_unread_count', 'Participant'): 4,
+        ('notifications_unread_count', 'Judge'): 4, ('notifications_unread_count', 'superuser'): 4,
+        ('live_updates', 'anonymous'): 0, ('live_updates', 'Participant'): 0,
+        ('live_updates', 'Judge'): 0, ('live_updates', 'superuser'): 0,
+        ('participant_search', 'anonymous'): 0, ('participant_search', 'Participant'): 5,
+        ('participant_search', 'Judge'): 2, ('participant_search', 'superuser'): 5,
+        ('participant_dashboard', 'anonymous'): 0, ('participant_dashboard', 'Participant'): 6,
+        ('participant_dashboard', 'Judge'): 2, ('participant_dashboard', 'superuser'): 2,
+        ('judge_dashboard', 'anonymous'): 0, ('judge_dashboard', 'Participant'): 2,
+        ('judge_dashboard', 'Judge'): 3, ('judge_dashboard', 'superuser'): 2,
+        ('leaderboard', 'anonymous'): 0, ('leaderboard', 'Participant'): 2,
+        ('leaderboard', 'Judge'): 5, ('leaderboard', 'superuser'): 5,
+        ('event_export', 'anonymous'): 0, ('event_export', 'Participant'): 2,
+        ('event_export', 'Judge'): 2, ('event_export', 'superuser'): 4,
+    }
+    # Seconds allowed for a single render, generous enough for a slow CI box.
+    TIME_BUDGET = 1.0
+
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.event = Event.objects.create(
+            event_name='CodeFest', title='CodeFest 2025', hero_section_details='Build things',
+            event_status='published', registration_end=now + timedelta(days=1),
+            event_start=now + timedelta(days=2),
+        )
+        self.users = {
+            'Participant': self._create_user('participant', 'Participant'),
+            'Judge': self._create_user('judge', 'Judge'),
+            'superuser': self._create_user('admin', 'Admin', is_superuser=True, is_staff=True),
+        }
+        self.team = Team.objects.create(
+            event=self.event, team_name='Team 0', team_code='TEAM0000',
+            leader=self.users['Participant'], max_size=100,
+        )
+        TeamMember.objects.create(team=self.team, participant=self.users['Participant'], role='Leader', status='accepted')
+        self.scale = 0
+
+    def _create_user(self, username, role, **extra):
+        user = User.objects.create_user(username=username, first_name=username, **extra)
+        UserProfile.objects.create(user=user, user_role=role)
+        return user
+
+    def _grow_data(self, scale):
+        """Seeds data until the event holds `scale` units of everything."""
+        now = timezone.now()
+        for i in range(self.scale, scale):
+            EventBenefit.objects.create(event=self.event, item_name=f'Benefit {i}', description='Swag')
+            ProblemStatement.objects.create(event=self.event, title=f'Problem {i}', description='Solve it', time_to_unlock=now)
+            schedule = Schedule.objects.create(event=self.event, day_number=i, title=f'Day {i}', date=now.date())
+            SubSchedule.objects.bulk_create(
+                SubSchedule(schedule=schedule, title=f'Slot {j}', time=f'{9 + j}:00', description='Talk') for j in range(3)
+            )
+            HowToParticipateStep.objects.create(event=self.event, step_number=i, step_description='Sign up')
+            Organizer.objects.create(event=self.event, name=f'Organizer {i}', role='Lead')
+            Eligibility.objects.create(event=self.event, description='Students')
+            FAQ.objects.create(event=self.event, question=f'Question {i}?', answer='Yes')
+
+            member = self._create_user(f'member{i}', 'Participant')
+            TeamMember.objects.create(team=self.team, participant=member, status='accepted')
+            leader = self._create_user(f'leader{i}', 'Participant')
+            team = Team.objects.create(event=self.event, team_name=f'Team {i + 1}', team_code=f'TEAM{i + 1:04d}', leader=leader)
+            TeamMember.objects.create(team=team, participant=leader, role='Leader', status='accepted')
+            submission = Submission.objects.create(team=team, project_title=f'Project {i}', project_description='Demo')
+            JudgingScore.objects.create(judge=self.users['Judge'], submission=submission, score=7)
+            unscored = Submission.objects.create(team=Team.objects.create(
+                event=self.event, team_name=f'Late Team {i}', team_code=f'LATE{i:04d}', leader=leader,
+            ), project_title=f'Late project {i}', project_description='Demo')
+            JudgeAssignment.objects.create(judge=self.users['Judge'], submission=unscored)
+            Notification.objects.bulk_create(
+                Notification(user=user, message=f'Update {i}') for user in self.users.values()
+            )
+            Announcement.objects.create(event=self.event, title=f'Announcement {i}', message='Hello')
+        self.scale = scale
+
+    def _render(self, url_name, role):
+        self.client.logout()
+        if role != 'anonymous':
+            self.client.force_login(self.users[role])
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            args = [self.event.id] if url_name in ('event_detail', 'event_timeline') else []
+            if url_name == 'event_export':
+                args = [self.event.id, 'members', 'csv']
+            response = self.client.get(reverse(url_name, args=args))
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = time.perf_counter() - started
+        self.assertLess(response.status_code, 500, f'{url_name} as {role}')
+        return len(queries), elapsed
+
+    def _assert_within_budget(self):
+        for (url_name, role), budget in self.QUERY_BUDGETS.items():
+            with self.subTest(url=url_name, role=role, scale=self.scale):
+                num_queries, elapsed = self._render(url_name, role)
+                self.assertLessEqual(num_queries, budget)
+                self.assertLess(elapsed, self.TIME_BUDGET)
+
+    def test_budget_covers_every_route(self):
+        """Test that every named route has a budget for every role"""
+        names = {pattern.name for pattern in portal_urls.urlpatterns}
+        self.assertEqual(names, {url_name for url_name, _ in self.QUERY_BUDGETS})
+        for name in names:
+            for role in self.ROLES:
+                self.assertIn((name, role), self.QUERY_BUDGETS)
+
+    def test_views_stay_within_budget_as_data_grows(self):
+        """Test that every view keeps its query budget at 1x and 10x data"""
+        self._grow_data(3)
+        self._assert_within_budget()
+        self._grow_data(30)
+        self._assert_within_budget()
+
+
+
+class SeedPortalCommandTest(TestCase):
+    def seed(self, prefix='seed', seed=7):
+        call_command(
+            'seed_portal', participants=60, teams=12, judges=4, judges_per_submission=2,
+            notifications=2, batch_size=25, seed=seed, prefix=prefix, stdout=StringIO(),
+        )
+
+    def test_seeds_requested_volumes(self):
+        """Test that the command creates the requested rows and respects team sizes"""
+        self.seed()
+        self.assertEqual(UserProfile.objects.filter(user_role='Participant').count(), 60)
+        self.assertEqual(UserProfile.objects.filter(user_role='Judge').count(), 4)
+        self.assertEqual(Team.objects.count(), 12)
+        self.assertEqual(Notification.objects.count(), 120)
+        self.assertEqual(JudgingScore.objects.count(), Submission.objects.count() * 2)
+        largest = Team.objects.annotate(size=Count('members')).order_by('-size').first()
+        self.assertLessEqual(largest.size, largest.max_size)
+
+    def test_same_seed_gives_same_dataset(self):
+        """Test that seeding is deterministic for a given seed and prefix"""
+        self.seed()
+        first = list(Team.objects.order_by('team_name').values_list('team_name', 'team_code'))
+        Event.objects.all().delete()
+        User.objects.all().delete()
+        self.seed()
+        self.assertEqual(first, list(Team.objects.order_by('team_name').values_list('team_name', 'team_code')))
+
+
+
+class LeaderboardTest(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(event_name='CodeFest', title='CodeFest', hero_section_details='Build')
+        self.judges = [User.objects.create_user(username=f'judge{i}') for i in range(3)]
+        self.submissions = []
+        for i in range(4):
+            leader = User.objects.create_user(username=f'leader{i}')
+            team = Team.objects.create(event=self.event, team_name=f'Team {i}', team_code=f'LEAD{i:04d}', leader=leader)
+            self.submissions.append(Submission.objects.create(team=team, project_title=f'Project {i}', project_description='Demo'))
+
+    def snapshot(self):
+        return list(LeaderboardEntry.objects.order_by('submission_id').values_list(
+            'submission_id', 'score_count', 'score_sum', 'score_min', 'score_max', 'normalized_score'))
+
+    def test_scores_update_entries_incrementally(self):
+        """Test that saving and deleting scores keeps the aggregates current"""
+        submission = self.submissions[0]
+        JudgingScore.objects.create(judge=self.judges[0], submission=submission, score=6)
+        score = JudgingScore.objects.create(judge=self.judges[1], submission=submission, score=9)
+        entry = LeaderboardEntry.objects.get(submission=submission)
+        self.assertEqual((entry.score_count, entry.score_mean, entry.score_min, entry.score_max), (2, 7.5, 6, 9))
+
+        score.score = 3
+        score.save()
+        entry.refresh_from_db()
+        self.assertEqual((entry.score_sum, entry.score_min), (9, 3))
+
+        JudgingScore.objects.filter(submission=submission).delete()
+        self.assertFalse(LeaderboardEntry.objects.filter(submission=submission).exists())
+
+    def test_incremental_entries_match_rebuild(self):
+        """Test that incremental maintenance agrees with a full rebuild"""
+        for j, judge in enumerate(self.judges):
+            for s, submission in enumerate(self.submissions):
+                JudgingScore.objects.create(judge=judge, submission=submission, score=(j + 2) * (s + 1) % 10)
+        JudgingScore.objects.filter(judge=self.judges[2], submission=self.submissions[1]).delete()
+        incremental = self.snapshot()
+        leaderboard.rebuild()
+        for row, rebuilt in zip(incremental, self.snapshot()):
+            self.assertEqual(row[:5], rebuilt[:5])
+            self.assertAlmostEqual(row[5], rebuilt[5])
+
+    def test_ranking_orders_by_mean_score(self):
+        """Test that the ranked leaderboard lists the best submission first"""
+        for s, submission in enumerate(self.submissions):
+            JudgingScore.objects.create(judge=self.judges[0], submission=submission, score=s)
+        ranked = [entry.submission_id for entry in leaderboard.ranked_entries(self.event)]
+        self.assertEqual(ranked, [submission.id for submission in reversed(self.submissions)])
+
+    def test_ranking_is_per_event(self):
+        """Test that each event ranks only its own submissions, also after a rebuild"""
+        other = Event.objects.create(event_name='HackNight', title='HackNight', hero_section_details='Hack')
+        team = Team.objects.create(event=other, team_name='Night Owls', team_code='NITE0000', leader=self.judges[0])
+        outsider = Submission.objects.create(team=team, project_title='Elsewhere', project_description='Demo')
+        for submission in [outsider, *self.submissions]:
+            JudgingScore.objects.create(judge=self.judges[0], submission=submission, score=5)
+        for _ in range(2):
+            self.assertEqual([entry.submission_id for entry in leaderboard.ranked_entries(other)], [outsider.id])
+            self.assertEqual(leaderboard.ranked_entries(self.event).count(), 4)
+            leaderboard.rebuild()
+
+        self.client.force_login(self.judges[0])
+        UserProfile.objects.create(user=self.judges[0], user_role='Judge')
+        response = self.client.get(reverse('leaderboard'), {'event': other.id})
+        self.assertEqual([entry.submission_id for entry in response.context['page']], [outsider.id])
+        self.assertEqual(self.client.get(reverse('leaderboard'), {'event': 'x'}).status_code, 404)
+
+
+
+class JudgeAssignmentTest(TestCase):
+    def setUp(self):
+        event = Event.objects.create(event_name='CodeFest', title='CodeFest', hero_section_details='Build')
+        ProblemStatement.objects.create(event=event, title='P', description='D', time_to_unlock=timezone.now())
+        self.judges = []
+        for i in range(4):
+            judge = User.objects.create_user(username=f'judge{i}')
+            UserProfile.objects.create(user=judge, user_role='Judge')
+            self.judges.append(judge)
+        self.submissions = []
+        for i in range(10):
+            leader = User.objects.create_user(username=f'leader{i}')
+            team = Team.objects.create(event=event, team_name=f'Team {i}', team_code=f'QUEU{i:04d}', leader=leader)
+            self.submissions.append(Submission.objects.create(team=team, project_title=f'Project {i}', project_description='Demo'))
+        # judge0 mentors team 0 and must never judge it
+        TeamMember.objects.create(team=self.submissions[0].team, participant=self.judges[0])
+
+    def test_assignments_are_balanced_and_conflict_free(self):
+        """Test that each submission gets N judges, spread evenly, without conflicts"""
+        self.assertEqual(assign_submissions(judges_per_submission=2), 20)
+        loads = dict(JudgeAssignment.objects.values_list('judge').annotate(n=Count('id')).order_by())
+        self.assertLessEqual(max(loads.values()) - min(loads.values()), 1)
+        self.assertFalse(JudgeAssignment.objects.filter(judge=self.judges[0], submission=self.submissions[0]).exists())
+        self.assertEqual(assign_submissions(judges_per_submission=2), 0)
+
+    def test_queue_is_keyset_paginated_and_skips_scored(self):
+        """Test that the queue pages in constant queries and hides scored work"""
+        judge = self.judges[1]
+        JudgeAssignment.objects.bulk_create(JudgeAssignment(judge=judge, submission=s) for s in self.submissions)
+        JudgingScore.objects.create(judge=judge, submission=self.submissions[3], score=5)
+        seen, cursor = [], None
+        while True:
+            with self.assertNumQueries(1):
+                page, cursor = unscored_queue(judge, after=cursor, page_size=4)
+            seen.extend(submission.pk for submission in page)
+            if cursor is None:
+                break
+        self.assertEqual(seen, [s.pk for s in self.submissions if s != self.submissions[3]])
+
+
+
+class TeamJoinTest(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(event_name='CodeFest', title='CodeFest', hero_section_details='Build',
+                                          event_status='published')
+        leader = User.objects.create_user(username='leader')
+        self.team = Team.objects.create(event=self.event, team_name='Full House', team_code='JOIN0001',
+                                        leader=leader, max_size=2)
+        join_team(self.team, leader, role='Leader')
+
+    def test_join_enforces_capacity_with_counter(self):
+        """Test that joins stop at max_size and the counter tracks deletes"""
+        self.assertIsNotNone(join_team(self.team, User.objects.create_user(username='second')))
+        with self.assertRaises(TeamFull):
+            join_team(self.team, User.objects.create_user(username='third'))
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.member_count, 2)
+        TeamMember.objects.filter(participant__username='second').delete()
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.member_count, 1)
+
+    def test_join_view_reports_full_team(self):
+        """Test that the join view refuses a full team without a COUNT query"""
+        join_team(self.team, User.objects.create_user(username='second'))
+        user = User.objects.create_user(username='latecomer')
+        UserProfile.objects.create(user=user, user_role='Participant')
+        self.client.force_login(user)
+        response = self.client.post(reverse('team_join'), {'team_code': 'join0001'}, follow=True)
+        self.assertIn('already full', str(list(response.context['messages'])[0]))
+        self.assertFalse(TeamMember.objects.filter(participant=user).exists())
+
+    def test_one_team_per_event(self):
+        """Test that joining a second team of the event is refused by join_team and the view"""
+        user = User.objects.create_user(username='hopper')
+        UserProfile.objects.create(user=user, user_role='Participant')
+        other = Team.objects.create(event=self.event, team_name='Other', team_code='JOIN0002', leader=user)
+        join_team(other, user, role='Leader')
+        with self.assertRaises(AlreadyOnTeam):
+            join_team(self.team, user)
+        self.client.force_login(user)
+        response = self.client.post(reverse('team_join'), {'team_code': 'join0001'}, follow=True)
+        self.assertIn('already in a team', str(list(response.context['messages'])[0]))
+        self.assertEqual(TeamMember.objects.filter(participant=user).count(), 1)
+
+    def test_create_view_reports_a_taken_name_and_a_second_team(self):
+        """Test that the create view turns a duplicate name or a second team into messages, not errors"""
+        user = User.objects.create_user(username='founder')
+        UserProfile.objects.create(user=user, user_role='Participant')
+        self.client.force_login(user)
+        response = self.client.post(reverse('team_create'), {'team_name': 'Full House', 'max_size': 4}, follow=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('already exists', str(list(response.context['messages'])[0]))
+        self.assertFalse(Team.objects.filter(leader=user).exists())
+
+        self.client.post(reverse('team_create'), {'team_name': 'Night Owls', 'max_size': 4})
+        response = self.client.post(reverse('team_create'), {'team_name': 'Early Birds', 'max_size': 4}, follow=True)
+        self.assertIn('already in a team', str(list(response.context['messages'])[-1]))
+        self.assertEqual(list(Team.objects.filter(leader=user).values_list('team_name', flat=True)), ['Night Owls'])
+
+
+class TeamJoinStressTest(TransactionTestCase):
+    """
+    Fires hundreds of parallel joins at one team. On MySQL they race on the
+    team row; on SQLite the database is locked for a writer at a time and a
+    join may be refused with a lock error, which is retried as a client would.
+    Either way the team must end up exactly full, never over max_size.
+    """
+    JOINS = 200
+    LOCK_RETRIES = 500
+
+    def test_parallel_joins_never_overflow(self):
+        event = Event.objects.create(event_name='CodeFest', title='CodeFest', hero_section_details='Build')
+        leader = User.objects.create_user(username='leader')
+        team = Team.objects.create(event=event, team_name='Popular', team_code='RUSH0001', leader=leader, max_size=5)
+        join_team(team, leader, role='Leader')
+        User.objects.bulk_create(User(username=f'student{i}') for i in range(self.JOINS))
+        users = list(User.objects.filter(username__startswith='student'))
+
+        def attempt(user):
+            try:
+                for _ in range(self.LOCK_RETRIES):
+                    try:
+                        join_team(team, user)
+                        return True
+                    except TeamFull:
+                        return False
+                    except OperationalError:
+                        # Lock wait timeout / deadlock / "database is locked"
+                        time.sleep(0.01)
+                raise AssertionError(f'{user.username} could not get the lock')
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            joined = sum(pool.map(attempt, users))
+
+        team.refresh_from_db()
+        self.assertEqual(joined, team.max_size - 1)
+        self.assertEqual(team.member_count, team.max_size)
+        self.assertEqual(team.members.count(), team.member_count)
+
+    def test_parallel_joins_of_one_user_pick_one_team(self):
+        event = Event.objects.create(event_name='CodeFest', title='CodeFest', hero_section_details='Build')
+        leader = User.objects.create_user(username='leader')
+        teams = [Team.objects.create(event=event, team_name=f'Team {i}', team_code=f'PICK{i:04d}', leader=leader)
+                 for i in range(8)]
+        user = User.objects.create_user(username='undecided')
+
+        def attempt(team):
+            try:
+                for _ in range(self.LOCK_RETRIES):
+                    try:
+                        join_team(team, user)
+                        return True
+                    except AlreadyOnTeam:
+                        return False
+                    except OperationalError:
+                        time.sleep(0.01)
+                raise AssertionError(f'{team.team_name} could not get the lock')
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            self.assertEqual(sum(pool.map(attempt, teams)), 1)
+        self.assertEqual(TeamMember.objects.filter(participant=user).count(), 1)
+
+
+class TeamCodeTest(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(event_name='CodeFest', title='CodeFest', hero_section_details='Build')
+        self.leader = User.objects.create_user(username='leader')
+
+    def new_team(self, name):
+        return save_new_team(Team(event=self.event, team_name=name, leader=self.leader))
+
+    def test_each_team_gets_its_own_unambiguous_code(self):
+        """Test that codes are generated per team from the unambiguous alphabet"""
+        codes = {self.new_team(f'Team {i}').team_code for i in range(20)}
+        self.assertEqual(len(codes), 20)
+        self.assertTrue(all(set(code) <= set(TEAM_CODE_ALPHABET) for code in codes))
+
+    def test_pooled_codes_are_used_first_and_collisions_retried(self):
+        """Test that reserved codes are claimed and a taken code is skipped"""
+        reserve_team_codes(2)
+        first, second = ReservedTeamCode.objects.order_by('pk').values_list('code', flat=True)
+        Team.objects.create(event=self.event, team_name='Squatter', team_code=first, leader=self.leader)
+        team = self.new_team('Late')
+        self.assertEqual(team.team_code, second)
+        self.assertFalse(ReservedTeamCode.objects.exists())
+
+    def test_codes_edited_in_the_admin_are_stored_upper_case(self):
+        """Test that a hand-typed code is normalized on save, so the exact-match join lookup finds it"""
+        team = self.new_team('Renamed')
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='x')
+        self.client.force_login(admin)
+        response = self.client.post(reverse('admin:portal_team_change', args=[team.pk]), {
+            'event': self.event.pk, 'team_name': 'Renamed', 'team_code': ' abcd2345 ',
+            'leader': self.leader.pk, 'max_size': 5,
+        })
+        self.assertEqual(response.status_code, 302)
+        team.refresh_from_db()
+        self.assertEqual(team.team_code, 'ABCD2345')
+
+
+
+class ImportParticipantsCommandTest(TestCase):
+    HEADER = 'username,email,full_name,student_roll_number,branch,year_of_study,password\n'
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.roster = self.tmp / 'roster.csv'
+        self.roster.write_text(self.HEADER + (
+            'asha,asha@example.com,Asha,21CS001,CSE,3,\n'
+            'ravi,ravi@example.com,Ravi,21CS002,CSE,2,\n'
+            'bad,bad@example.com,Bad Year,21CS003,CSE,7,\n'
+            'copy,copy@example.com,Copy,21CS001,CSE,1,\n'
+            'meena,meena@example.com,Meena,21EE004,EEE,4,\n'
+        ))
+
+    def run_import(self, *args, **options):
+        err = StringIO()
+        call_command('import_participants', str(self.roster), *args, workers=0, batch_size=2,
+                     stdout=StringIO(), stderr=err, **options)
+        return err.getvalue()
+
+    def test_imports_valid_rows_and_reports_errors(self):
+        """Test that valid rows are created and bad rows are reported by number"""
+        errors = self.run_import()
+        self.assertEqual(sorted(UserProfile.objects.values_list('student_roll_number', flat=True)),
+                         ['21CS001', '21CS002', '21EE004'])
+        self.assertIn('row 3: year_of_study', errors)
+        self.assertIn('row 4: student_roll_number: already registered', errors)
+
+    def test_skip_existing_makes_reruns_idempotent(self):
+        """Test that a re-run in idempotent mode creates nothing and reports nothing"""
+        self.run_import()
+        errors = self.run_import(skip_existing=True)
+        self.assertEqual(User.objects.count(), 3)
+        self.assertNotIn('already registered', errors)
+
+    def test_resume_continues_after_checkpoint(self):
+        """Test that --resume skips the rows recorded in the checkpoint"""
+        Path(f'{self.roster}.progress').write_text('2')
+        self.run_import(resume=True)
+        self.assertEqual(list(User.objects.order_by('username').values_list('username', flat=True)), ['copy', 'meena'])
+        self.assertFalse(Path(f'{self.roster}.progress').exists())
+
+    def test_jsonl_rows_must_be_objects(self):
+        """Test that JSONL lines holding anything but an object are reported, not crashed on"""
+        self.roster = self.tmp / 'roster.jsonl'
+        self.roster.write_text(
+            '[1, 2]\n"asha"\nnull\n'
+            '{"username": "ravi", "email": "ravi@example.com", "full_name": "Ravi", '
+            '"student_roll_number": "21CS002", "branch": "CSE", "year_of_study": 2}\n'
+        )
+        errors = self.run_import()
+        self.assertEqual(list(User.objects.values_list('username', flat=True)), ['ravi'])
+        for line, kind in [(1, 'list'), (2, 'str'), (3, 'NoneType')]:
+            self.assertIn(f'row {line}: expected a JSON object, got {kind}', errors)
+
+    def test_passwords_are_hashed_in_worker_processes(self):
+        """Test that the process pool produces usable password hashes"""
+        self.roster.write_text(self.HEADER + 'asha,,Asha,21CS001,CSE,3,s3cret-pass\n')
+        call_command('import_participants', str(self.roster), workers=2, stdout=StringIO())
+        self.assertTrue(User.objects.get(username='asha').check_password('s3cret-pass'))
+
+
+
+class AnnouncementDeliveryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = Event.objects.create(event_name='CodeFest', title='CodeFest', hero_section_details='Build',
+                                          event_status='published')
+        self.users = [User.objects.create_user(username=f'student{i}') for i in range(50)]
+
+    def test_broadcast_is_one_row_regardless_of_audience(self):
+        """Test that announcing to every participant writes a single row"""
+        with self.assertNumQueries(1):
+            notifications.broadcast(self.event, 'Kickoff', 'We start at 9')
+        self.assertEqual(Notification.objects.count(), 0)
+        self.assertEqual(notifications.unread_count(self.users[0]), 1)
+
+    def test_read_watermark_merges_with_personal_notifications(self):
+        """Test that the feed merges both kinds and reading clears only this user"""
+        user = self.users[0]
+        notifications.broadcast(self.event, 'Kickoff', 'We start at 9')
+        notifications.notify(user, 'Your team is complete')
+        items, _ = notifications.feed(user)
+        self.assertEqual([item.is_read for item in items], [False, False])
+        self.assertEqual(notifications.unread_count(user), 2)
+
+        notifications.mark_read(user, items)
+        self.assertEqual(notifications.unread_count(user), 0)
+        self.assertEqual(notifications.unread_count(self.users[1]), 1)
+        notifications.broadcast(self.event, 'Lunch', 'Food is here')
+        self.assertEqual(notifications.unread_count(user), 1)
+
+
+
+class NotificationPaginationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='student')
+        Notification.objects.bulk_create(Notification(user=self.user, message=f'Update {i}') for i in range(45))
+        # bulk_create bypasses auto_now_add ordering guarantees, so spread the timestamps
+        base = timezone.now()
+        for i, notification in enumerate(Notification.objects.order_by('pk')):
+            Notification.objects.filter(pk=notification.pk).update(created_at=base + timedelta(seconds=i))
+        self.client.force_login(self.user)
+
+    def test_cursor_pages_through_everything_once(self):
+        """Test that following the cursor visits each notification exactly once"""
+        seen, cursor = [], None
+        while True:
+            items, cursor = notifications.feed(self.user, before=cursor)
+            seen.extend(item.message for item in items)
+            if cursor is None:
+                break
+        self.assertEqual(seen, [f'Update {i}' for i in reversed(range(45))])
+
+    def test_cursor_keeps_items_sharing_a_timestamp(self):
+        """Test that paging neither skips nor repeats items created in the same instant, of either kind"""
+        event = Event.objects.create(event_name='CodeFest', title='CodeFest', hero_section_details='Build',
+                                     event_status='published')
+        Announcement.objects.bulk_create(Announcement(event=event, title=f'News {i}', message='') for i in range(15))
+        instant = timezone.now()
+        Notification.objects.update(created_at=instant)
+        Announcement.objects.update(created_at=instant)
+        seen, cursor = [], None
+        while True:
+            response = self.client.get(reverse('notifications'), {'before': cursor} if cursor else {})
+            seen.extend(response.context['notifications'])
+            cursor = response.context['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), 60)
+        self.assertEqual(len({(type(item), item.pk) for item in seen}), 60)
+
+    def test_visit_marks_only_the_shown_page_read(self):
+        """Test that viewing the first page leaves older pages unread"""
+        self.client.get(reverse('notifications'))
+        self.assertEqual(Notification.objects.filter(is_read=False).count(), 45 - notifications.FEED_PAGE_SIZE)
+
+    def test_badge_count_is_cached_and_maintained(self):
+        """Test that the badge endpoint is served from the cache and tracks new notifications"""
+        url = reverse('notifications_unread_count')
+        self.assertEqual(self.client.get(url).json(), {'unread': 45})
+        notifications.notify(self.user, 'One more')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).json(), {'unread': 46})
+        self.assertFalse([q for q in queries if 'portal_notification' in q['sql']])
+
+
+class IndexReportCommandTest(TestCase):
+    def setUp(self):
+        call_command('seed_portal', participants=30, teams=6, judges=3, judges_per_submission=2,
+                     batch_size=50, prefix='idx', stdout=StringIO())
+        self.judge = User.objects.filter(userprofile__user_role='Judge').first()
+
+    def test_reports_every_view_and_leaves_data_untouched(self):
+        """Test that the index report explains each view's queries without writing anything"""
+        notifications_before = Notification.objects.filter(is_read=False).count()
+        out = StringIO()
+        call_command('index_report', user=[self.judge.username], stdout=out)
+        output = out.getvalue()
+        for name in ('index', 'event_detail', 'judge_dashboard', 'leaderboard'):
+            self.assertIn(f'{name} [anonymous]', output)
+            self.assertIn(f'{name} [{self.judge.username}]', output)
+        self.assertEqual(Notification.objects.filter(is_read=False).count(), notifications_before)
+
+
+class ProfileBackendTest(TestCase):
+    def test_role_and_profile_come_with_the_user(self):
+        """Test that a role-protected page loads the user and its profile in one query"""
+        user = User.objects.create_user(username='asha', first_name='Asha')
+        UserProfile.objects.create(user=user, user_role='Participant', student_roll_number='21CS001')
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertContains(self.client.get(reverse('participant_dashboard')), '21CS001')
+        self.assertFalse([q for q in queries if q['sql'].startswith('SELECT') and
+                          'FROM "portal_userprofile"' in q['sql']])
+
+    def test_user_without_profile_is_refused(self):
+        """Test that role_required still rejects accounts without a profile"""
+        self.client.force_login(User.objects.create_user(username='noprofile'))
+        self.assertEqual(self.client.get(reverse('participant_dashboard')).status_code, 403)
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 404)
+
+
+class SessionStorageTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='asha', first_name='Asha')
+        UserProfile.objects.create(user=self.user, user_role='Participant')
+
+    def test_signed_cookie_sessions_never_touch_the_session_table(self):
+        """Test that with signed-cookie sessions a logged-in page does not query django_session"""
+        with override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies'):
+            self.client.force_login(self.user)
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(reverse('participant_dashboard')).status_code, 200)
+        self.assertFalse([q for q in queries if 'django_session' in q['sql']])
+
+    def test_flash_messages_are_stored_in_a_cookie(self):
+        """Test that messages.success() does not write the session"""
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('logout'))
+        self.assertIn('messages', response.cookies)
+        self.assertFalse([q for q in queries if 'django_session' in q['sql'] and 'UPDATE' in q['sql']])
+
+    def test_expired_sessions_are_cleared_in_batches(self):
+        """Test that only expired sessions are deleted, across several batches"""
+        now = timezone.now()
+        Session.objects.bulk_create(
+            Session(session_key=f'expired{i:04d}', session_data='', expire_date=now - timedelta(days=1))
+            for i in range(25)
+        )
+        Session.objects.create(session_key='live', session_data='', expire_date=now + timedelta(days=1))
+        out = StringIO()
+        call_command('clear_expired_sessions', batch_size=10, pause=0, stdout=out)
+        self.assertIn('Deleted 25', out.getvalue())
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['live'])
+
+
+class StaticPipelineTest(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        storage = {'BACKEND': 'portal.storage.CompressedManifestStaticFilesStorage'}
+        self.settings = override_settings(STATIC_ROOT=self.root, STORAGES={**settings.STORAGES, 'staticfiles': storage})
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        self.hashed = staticfiles_storage.stored_name('css/base.css')
+        self.middleware = PrecompressedStaticMiddleware(lambda request: HttpResponse(status=404))
+
+    def test_collectstatic_writes_hashed_and_compressed_copies(self):
+        """Test that collectstatic emits a content-hashed name with a smaller gzip twin"""
+        self.assertRegex(self.hashed, r'^css/base\.[0-9a-f]{12}\.css$')
+        original = (self.root / self.hashed).stat().st_size
+        self.assertLess((self.root / f'{self.hashed}.gz').stat().st_size, original)
+
+    def test_hashed_files_are_served_compressed_and_immutable(self):
+        """Test that the middleware picks the gzip copy and caches hashed names forever"""
+        request = RequestFactory().get(f'/static/{self.hashed}', HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        response = self.middleware(request)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        body = gzip.decompress(b''.join(response.streaming_content))
+        self.assertEqual(body, (self.root / self.hashed).read_bytes())
+
+    def test_unhashed_and_plain_requests(self):
+        """Test that unhashed names get a short cache and clients without gzip get the raw file"""
+        response = self.middleware(RequestFactory().get('/static/css/base.css'))
+        self.assertNotIn('Content-Encoding', response)
+        self.assertNotIn('immutable', response['Cache-Control'])
+        missing = self.middleware(RequestFactory().get('/static/../../etc/passwd'))
+        self.assertEqual(missing.status_code, 404)
+
+    def test_accept_encoding_q_values(self):
+        """Test that codings refused with q=0 are never served and q-values are parsed per token"""
+        self.assertEqual(accepted_encodings('gzip;q=0, br; q=0.5, *;q=0.1'), {'gzip': 0, 'br': 0.5, '*': 0.1})
+        for header, expected in [('gzip;q=0', None), ('br, gzip;q=0', None), ('*;q=0', None),
+                                 ('x-gzip-ish', None), ('*', 'gzip'), ('GZIP;Q=0.3', 'gzip')]:
+            response = self.middleware(RequestFactory().get(f'/static/{self.hashed}', HTTP_ACCEPT_ENCODING=header))
+            self.assertEqual(response.get('Content-Encoding'), expected, header)
+
+
+class ImageVariantTest(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        media = override_settings(MEDIA_ROOT=tmp.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        cache.clear()
+        self.event = Event.objects.create(event_name='CodeFest', title='CodeFest 2025', hero_section_details='Build',
+                                          event_status='published')
+
+    def _upload(self, filename, size=(2000, 1000), fmt='JPEG'):
+        buffer = BytesIO()
+        PILImage.new('RGB', size, (111, 66, 193)).save(buffer, fmt)
+        return SimpleUploadedFile(filename, buffer.getvalue())
+
+    def _save_media(self, media):
+        with self.captureOnCommitCallbacks(execute=True):
+            media.save()
+        images.wait_for_pending()
+
+    def test_upload_gets_webp_and_resized_variants(self):
+        """Test that an upload gets WebP and same-format variants below its own width, and a srcset"""
+        media = EventMedia(event=self.event, banner_image=self._upload('banner.jpg'),
+                           logo=self._upload('logo.png', size=(500, 500), fmt='PNG'))
+        self._save_media(media)
+        banner, logo = media.banner_image.name, media.logo.name
+        self.assertEqual(images.available_widths(banner), [320, 640, 1280])
+        self.assertEqual(images.available_widths(logo), [320])
+        for ext in ('.webp', '.jpg'):
+            self.assertTrue(default_storage.exists(images.variant_name(banner, 640, ext)))
+        with PILImage.open(default_storage.open(images.variant_name(banner, 640, '.webp'))) as variant:
+            self.assertEqual((variant.format, variant.size), ('WEBP', (640, 320)))
+
+        response = self.client.get(reverse('event_detail', args=[self.event.id]))
+        self.assertContains(response, '<source type="image/webp"')
+        self.assertContains(response, 'banner.jpg.1280w.webp 1280w')
+
+    def test_sources_sharing_a_stem_keep_their_own_variants(self):
+        """Test that shot.png and shot.jpg get separate variant files"""
+        media = EventMedia(event=self.event, banner_image=self._upload('shot.jpg'),
+                           logo=self._upload('shot.png', size=(2000, 1000), fmt='PNG'))
+        self._save_media(media)
+        banner, logo = media.banner_image.name, media.logo.name
+        self.assertNotEqual(images.variant_name(banner, 640, '.webp'), images.variant_name(logo, 640, '.webp'))
+        for name, fmt in ((banner, 'JPEG'), (logo, 'PNG')):
+            with PILImage.open(default_storage.open(images.variant_name(name, 640, posixpath.splitext(name)[1]))) as variant:
+                self.assertEqual(variant.format, fmt)
+        images.delete_variants(banner)
+        self.assertTrue(default_storage.exists(images.variant_name(logo, 640, '.webp')))
+
+    def test_replacing_the_source_removes_stale_variants(self):
+        """Test that the old image's variants are deleted once a new one is uploaded"""
+        media = EventMedia(event=self.event, banner_image=self._upload('old.jpg'), logo=self._upload('logo.jpg'))
+        self._save_media(media)
+        old = media.banner_image.name
+        media.banner_image = self._upload('new.jpg')
+        self._save_media(media)
+        self.assertFalse(default_storage.exists(images.variant_name(old, 640, '.webp')))
+        self.assertEqual(images.available_widths(media.banner_image.name), [320, 640, 1280])
+
+    def test_command_backfills_and_prunes(self):
+        """Test that image_variants generates missing variants and deletes orphans"""
+        media = EventMedia(event=self.event, banner_image=self._upload('banner.jpg'), logo=self._upload('logo.jpg'))
+        media.save()  # outside a commit hook: no variants yet
+        orphan = images.variant_name('event_media/gone.jpg', 320, '.webp')
+        default_storage.save(orphan, ContentFile(b'stale'))
+        out = StringIO()
+        call_command('image_variants', prune=True, stdout=out)
+        self.assertIn('Generated variants for 2 images', out.getvalue())
+        self.assertIn('Deleted 1 orphaned', out.getvalue())
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertTrue(default_storage.exists(images.variant_name(media.logo.name, 1280, '.jpg')))
+
+
+class ExportTest(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(event_name='CodeFest', title='CodeFest 2025', hero_section_details='Build')
+        self.admin = User.objects.create_user(username='admin', is_staff=True, is_superuser=True)
+        UserProfile.objects.create(user=self.admin, user_role='Admin')
+        self.judge = User.objects.create_user(username='judge')
+        UserProfile.objects.create(user=self.judge, user_role='Judge')
+        self.client.force_login(self.admin)
+        self.add_teams(0, 3)
+
+    def add_teams(self, start, stop):
+        for i in range(start, stop):
+            leader = User.objects.create_user(username=f'leader{i}', email=f'leader{i}@example.com')
+            UserProfile.objects.create(user=leader, user_role='Participant', student_roll_number=f'21CS{i:03d}', branch='CSE')
+            team = Team.objects.create(event=self.event, team_name=f'Team {i}', team_code=f'TEAM{i:04d}', leader=leader)
+            TeamMember.objects.create(team=team, participant=leader, role='Leader', status='accepted')
+            submission = Submission.objects.create(team=team, project_title=f'Project {i}', project_description='Demo')
+            JudgingScore.objects.create(judge=self.judge, submission=submission, score=i + 5)
+
+    def download(self, kind, fmt):
+        response = self.client.get(reverse('event_export', args=[self.event.id, kind, fmt]))
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_members_csv_joins_team_and_profile(self):
+        """Test that the members export carries team and profile columns per row"""
+        rows = list(csv.DictReader(self.download('members', 'csv').splitlines()))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(
+            (rows[0]['team_code'], rows[0]['username'], rows[0]['roll_number'], rows[0]['branch']),
+            ('TEAM0000', 'leader0', '21CS000', 'CSE'),
+        )
+
+    def test_submissions_jsonl_includes_scores(self):
+        """Test that each submission line holds its leaderboard aggregates"""
+        lines = [json.loads(line) for line in self.download('submissions', 'jsonl').splitlines()]
+        self.assertEqual([line['score_mean'] for line in lines], [5.0, 6.0, 7.0])
+        self.assertEqual(lines[2]['team_name'], 'Team 2')
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Test that an export runs the same queries for 3 teams as for 30"""
+        with CaptureQueriesContext(connection) as small:
+            self.download('scores', 'csv')
+        self.add_teams(3, 30)
+        with CaptureQueriesContext(connection) as large:
+            body = self.download('scores', 'csv')
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(len(body.splitlines()), 31)
+
+    def test_rows_are_read_in_primary_key_pages(self):
+        """Test that an export reads LIMITed keyset pages and still yields every row once"""
+        self.add_teams(3, 7)
+        chunk_size, exports.EXPORT_CHUNK_SIZE = exports.EXPORT_CHUNK_SIZE, 3
+        self.addCleanup(setattr, exports, 'EXPORT_CHUNK_SIZE', chunk_size)
+        with CaptureQueriesContext(connection) as queries:
+            rows = list(exports.export_rows('teams', event_id=self.event.id))
+        self.assertEqual([row[2] for row in rows[1:]], [f'TEAM{i:04d}' for i in range(7)])
+        pages = [query['sql'] for query in queries if 'portal_team' in query['sql']]
+        self.assertEqual(len(pages), 3)
+        self.assertTrue(all('LIMIT 3' in sql for sql in pages))
+
+    def test_only_admins_can_export(self):
+        """Test that judges are refused and unknown exports are 404s"""
+        self.assertEqual(self.client.get(reverse('event_export', args=[self.event.id, 'teams', 'xml'])).status_code, 404)
+        self.client.force_login(self.judge)
+        self.assertEqual(self.client.get(reverse('event_export', args=[self.event.id, 'teams', 'csv'])).status_code, 403)
+
+    def test_admin_action_exports_the_selection(self):
+        """Test that the changelist action streams only the selected teams"""
+        selected = Team.objects.filter(team_code__in=['TEAM0000', 'TEAM0002']).values_list('pk', flat=True)
+        response = self.client.post(reverse('admin:portal_team_changelist'), {
+            'action': 'export_csv', '_selected_action': [str(pk) for pk in selected],
+        })
+        rows = list(csv.DictReader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual([row['team_code'] for row in rows], ['TEAM0000', 'TEAM0002'])
+        self.assertEqual(rows[0]['project_title'], 'Project 0')
+
+
+class AdminChangelistTest(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(event_name='CodeFest', title='CodeFest 2025', hero_section_details='Build')
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='x')
+        self.client.force_login(self.admin)
+        self.rows = 0
+        self.add_rows(5)
+
+    def add_rows(self, rows):
+        for i in range(self.rows, rows):
+            user = User.objects.create_user(username=f'user{i}')
+            team = Team.objects.create(event=self.event, team_name=f'Team {i}', team_code=f'TEAM{i:04d}', leader=user)
+            TeamMember.objects.create(team=team, participant=user, role='Leader', status='accepted')
+            Submission.objects.create(team=team, project_title=f'Project {i}', project_description='Demo')
+            Notification.objects.create(user=user, message=f'Welcome {i}')
+        self.rows = rows
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_changelists_do_not_query_per_row(self):
+        """Test that the large-table changelists and forms run the same queries for 5 rows as for 40"""
+        member = TeamMember.objects.first()
+        urls = [reverse(f'admin:portal_{name}_changelist') for name in
+                ('team', 'teammember', 'submission', 'judgingscore', 'notification', 'feedback')]
+        urls.append(reverse('admin:portal_teammember_change', args=[member.pk]))
+        urls.append(reverse('admin:portal_teammember_changelist') + '?q=TEAM0001')
+        small = [self.count_queries(url) for url in urls]
+        self.add_rows(40)
+        self.assertEqual([self.count_queries(url) for url in urls], small)
+
+    def test_change_form_uses_autocomplete(self):
+        """Test that the member form does not list every user in a select"""
+        response = self.client.get(reverse('admin:portal_teammember_change', args=[TeamMember.objects.first().pk]))
+        self.assertContains(response, 'admin-autocomplete')
+        self.assertNotContains(response, 'user4</option>')
+
+    def test_paginator_estimates_unfiltered_counts(self):
+        """Test that large unfiltered listings take their count from table statistics"""
+        class Paginator(EstimatedCountPaginator):
+            threshold = 5
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.add_rows(8)  # statistics still say 5
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(Paginator(Notification.objects.order_by('id'), 2).count, 5)
+        self.assertFalse([q for q in queries if 'COUNT(' in q['sql'].upper()])
+        self.assertEqual(Paginator(Notification.objects.filter(is_read=False).order_by('id'), 2).count, 8)
+        self.assertEqual(EstimatedCountPaginator(Notification.objects.order_by('id'), 2).count, 8)
+
+
+class BulkAdminActionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = Event.objects.create(event_name='CodeFest', title='CodeFest 2025', hero_section_details='Build')
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='x')
+        self.judge = User.objects.create_user(username='judge')
+        self.client.force_login(self.admin)
+        self.teams = 0
+        self.add_teams(3)
+
+    def add_teams(self, teams):
+        for i in range(self.teams, teams):
+            leader = User.objects.create_user(username=f'leader{i}')
+            member = User.objects.create_user(username=f'member{i}')
+            team = Team.objects.create(event=self.event, team_name=f'Team {i}', team_code=f'TEAM{i:04d}', leader=leader)
+            TeamMember.objects.create(team=team, participant=leader, role='Leader', status='accepted')
+            TeamMember.objects.create(team=team, participant=member, status='accepted')
+            submission = Submission.objects.create(team=team, project_title=f'Project {i}', project_description='Demo')
+            JudgingScore.objects.create(judge=self.judge, submission=submission, score=i)
+        self.teams = teams
+
+    def run_action(self, model, action, pks, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse(f'admin:portal_{model}_changelist'), {
+                'action': action, ACTION_CHECKBOX_NAME: [str(pk) for pk in pks], **data,
+            })
+
+    def test_event_status_actions_update_and_invalidate(self):
+        """Test that publishing events is one update and drops their cached pages"""
+        other = Event.objects.create(event_name='HackNight', title='HackNight', hero_section_details='Hack')
+        cache.set(page_cache_key('event', self.event.id), 'stale')
+        with CaptureQueriesContext(connection) as queries:
+            self.run_action('event', 'publish_events', [self.event.id, other.id])
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('UPDATE "portal_event"')]), 1)
+        self.assertEqual(set(Event.objects.values_list('event_status', flat=True)), {'published'})
+        self.assertIsNone(cache.get(page_cache_key('event', self.event.id)))
+
+    def test_notify_members_asks_for_a_message_then_sends(self):
+        """Test that the notify action shows its form, then bulk-creates one notification per member"""
+        member = User.objects.get(username='member0')
+        self.assertEqual(notifications.unread_count(member), 0)
+        pks = Team.objects.values_list('pk', flat=True)
+        self.assertContains(self.run_action('team', 'notify_members', pks), 'name="message"')
+        with CaptureQueriesContext(connection) as queries:
+            self.run_action('team', 'notify_members', pks, apply='1', message='Judging starts at 5')
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('INSERT INTO "portal_notification"')]), 1)
+        self.assertEqual(Notification.objects.filter(message='Judging starts at 5').count(), 6)
+        self.assertEqual(notifications.unread_count(member), 1)
+
+    def test_confirm_page_reposts_a_select_all_selection(self):
+        """Test that "Select all" through the confirm page runs the action on every matching team"""
+        self.add_teams(5)
+        first = Team.objects.order_by('pk').first()
+        # The changelist posts the checked rows of the page along with select_across
+        page = self.run_action('team', 'notify_members', [first.pk], select_across='1', index='0')
+        fields = re.findall(r'<input type="hidden" name="([^"]+)" value="([^"]*)"', page.content.decode())
+        data = {}
+        for name, value in fields:
+            data.setdefault(name, []).append(value)
+        self.assertEqual(data[ACTION_CHECKBOX_NAME], [str(first.pk)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('admin:portal_team_changelist'),
+                                        {**data, 'apply': 'Yes', 'message': 'Judging starts at 5'})
+        self.assertRedirects(response, reverse('admin:portal_team_changelist'))
+        self.assertEqual(Notification.objects.filter(message='Judging starts at 5').count(), 10)
+
+    def test_disband_is_set_based_and_keeps_the_leaderboard_right(self):
+        """Test that disbanding runs the same queries for 2 teams as for 20 and rescores the rest"""
+        def disband(pks):
+            with CaptureQueriesContext(connection) as queries:
+                self.run_action('team', 'disband_teams', pks, apply='1')
+            return len(queries)
+
+        small = disband(Team.objects.filter(team_code__in=['TEAM0000', 'TEAM0001']).values_list('pk', flat=True))
+        self.assertEqual(list(Team.objects.values_list('team_code', flat=True)), ['TEAM0002'])
+        self.assertFalse(TeamMember.objects.filter(team__isnull=True).exists())
+        stats = JudgeScoreStats.objects.get(judge=self.judge)
+        self.assertEqual((stats.score_count, stats.score_mean), (1, 2))
+
+        self.add_teams(23)
+        large = disband(Team.objects.exclude(team_code='TEAM0002').values_list('pk', flat=True))
+        self.assertEqual(large, small)
+        self.assertEqual(TeamMember.objects.count(), 2)
+        self.assertEqual(list(LeaderboardEntry.objects.values_list('submission__team__team_code', flat=True)), ['TEAM0002'])
+
+    def test_disqualified_submissions_leave_the_leaderboard(self):
+        """Test that disqualifying submissions removes them from the ranking"""
+        disqualified = Submission.objects.get(project_title='Project 2')
+        self.run_action('submission', 'disqualify', [disqualified.pk])
+        self.assertTrue(Submission.objects.get(pk=disqualified.pk).is_disqualified)
+        ranked = [entry.submission_id for entry in leaderboard.ranked_entries(self.event)]
+        self.assertEqual(len(ranked), 2)
+        self.assertNotIn(disqualified.pk, ranked)
+
+
+@role_required(['Judge'])
+async def judges_only_view(request):
+    return HttpResponse('ok')
+
+
+# Serves an async role_required view next to the portal's own pages
+urlpatterns = [path('judges-only/', judges_only_view), path('', include('KVSRITspc.urls'))]
+
+
+@override_settings(ROOT_URLCONF='portal.tests')
+class AsyncViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = Event.objects.create(
+            event_name='CodeFest', title='CodeFest 2025', hero_section_details='Build things',
+            event_status='published',
+        )
+        self.user = User.objects.create_user(username='asha', first_name='Asha', password='s3cret-pass')
+        UserProfile.objects.create(user=self.user, user_role='Participant')
+        self.judge = User.objects.create_user(username='ravi', password='s3cret-pass')
+        UserProfile.objects.create(user=self.judge, user_role='Judge')
+
+    async def login(self, user):
+        self.assertTrue(await self.async_client.alogin(username=user.username, password='s3cret-pass'))
+
+    async def test_pages_render_under_asgi(self):
+        """Test that the async pages render through the ASGI handler, anonymously and logged in"""
+        detail_url = reverse('event_detail', args=[self.event.id])
+        for url in (reverse('index'), detail_url, reverse('home')):
+            self.assertEqual((await self.async_client.get(url)).status_code, 200)
+        self.assertIsNotNone(await cache.aget(page_cache_key('event', self.event.id)))
+
+        await self.login(self.user)
+        response = await self.async_client.get(detail_url)
+        self.assertContains(response, 'Logout')
+        response = await self.async_client.get(reverse('home'))
+        self.assertContains(response, 'Welcome, Asha')
+        # The role links read user.userprofile, loaded with the user by the backend
+        self.assertContains(response, 'Participant Dashboard')
+        self.assertContains(response, reverse('participant_dashboard'))
+
+    async def test_notifications_are_read_and_marked(self):
+        """Test that the async notifications page shows unread items and marks them read"""
+        await Notification.objects.acreate(user=self.user, message='Judging starts at 5')
+        await self.login(self.user)
+        response = await self.async_client.get(reverse('notifications'))
+        self.assertContains(response, 'Judging starts at 5')
+        self.assertContains(response, 'Participant Dashboard')
+        self.assertFalse(await Notification.objects.filter(user=self.user, is_read=False).aexists())
+
+    async def test_role_required_wraps_async_views(self):
+        """Test that role_required checks the role of a logged-in user on an async view"""
+        self.assertEqual((await self.async_client.get('/judges-only/')).status_code, 302)
+        await self.login(self.user)
+        self.assertEqual((await self.async_client.get('/judges-only/')).status_code, 403)
+        await self.async_client.alogout()
+        await self.login(self.judge)
+        self.assertEqual((await self.async_client.get('/judges-only/')).content, b'ok')
+
+
+class BenchmarkHandlersCommandTest(TransactionTestCase):
+    def test_compares_both_handlers(self):
+        """Test that the benchmark drives the WSGI and ASGI stacks and reports both"""
+        cache.clear()
+        Event.objects.create(event_name='CodeFest', title='CodeFest', hero_section_details='Build',
+                             event_status='published')
+        out = StringIO()
+        call_command('benchmark_handlers', requests=20, concurrency=4, stdout=out)
+        rows = {line.split()[0]: line.split() for line in out.getvalue().splitlines()[2:]}
+        self.assertEqual(set(rows), {'wsgi', 'asgi'})
+        self.assertEqual([row[-1] for row in rows.values()], ['0', '0'])
+
+
+class LiveUpdatesTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = Event.objects.create(
+            event_name='CodeFest', title='CodeFest 2025', hero_section_details='Build things',
+            event_status='published',
+        )
+        self.leader = User.objects.create_user(username='leader')
+        self.member = User.objects.create_user(username='member')
+        self.team = Team.objects.create(event=self.event, team_name='Team', team_code='TEAM0000', leader=self.leader)
+
+    def collect(self, channels, action):
+        """Messages published to channels while action() runs and commits."""
+        loop = asyncio.new_event_loop()
+        try:
+            subscription = live.get_broker().subscribe(channels)
+            queue = loop.run_until_complete(subscription.__aenter__())
+            with self.captureOnCommitCallbacks(execute=True):
+                action()
+            loop.run_until_complete(asyncio.sleep(0))
+            messages = [queue.get_nowait() for _ in range(queue.qsize())]
+            loop.run_until_complete(subscription.__aexit__(None, None, None))
+        finally:
+            loop.close()
+        return messages
+
+    async def read_event(self, chunks):
+        """The next non-keepalive chunk of a stream."""
+        while True:
+            chunk = await asyncio.wait_for(anext(chunks), 5)
+            if not chunk.startswith(b':'):
+                return chunk.decode()
+
+    async def disconnect(self, chunks):
+        """Cancels a pending read, as the ASGI handler does when the client goes away."""
+        reading = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0.01)
+        reading.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await reading
+        self.assertEqual(live.get_broker()._subscribers, {})
+
+    async def test_stream_pushes_published_messages(self):
+        """Test that the ASGI stream forwards what is published to the event's channel"""
+        response = await self.async_client.get(reverse('live_updates'), {'event': self.event.id})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        self.assertTrue((await self.read_event(chunks)).startswith('retry:'))
+        live.publish(live.event_channel(self.event.id), 'announcement', {'title': 'Lunch', 'message': 'Now'})
+        self.assertEqual(await self.read_event(chunks),
+                         'event: announcement\ndata: {"title": "Lunch", "message": "Now"}\n\n')
+        await self.disconnect(chunks)
+
+    @override_settings(LIVE_KEEPALIVE=0.05)
+    async def test_stream_announces_phase_boundaries(self):
+        """Test that the stream sends the new phase when a boundary passes, without any write"""
+        self.event.registration_end = timezone.now() + timedelta(milliseconds=300)
+        self.event.event_start = timezone.now() + timedelta(days=1)
+        await self.event.asave()
+        await sync_to_async(cache.clear)()
+        response = await self.async_client.get(reverse('live_updates'), {'event': self.event.id})
+        chunks = aiter(response.streaming_content)
+        await self.read_event(chunks)
+        self.assertIn('"phase": "registration_closed"', await self.read_event(chunks))
+        await self.disconnect(chunks)
+
+    def test_wsgi_and_empty_subscriptions_get_no_content(self):
+        """Test that the stream is refused outside ASGI so EventSource stops retrying"""
+        response = self.client.get(reverse('live_updates'), {'event': self.event.id})
+        self.assertEqual(response.status_code, 204)
+
+    def test_announcements_and_membership_are_published(self):
+        """Test that new announcements and team joins reach the event's and users' channels"""
+        messages = self.collect([live.event_channel(self.event.id)],
+                                lambda: notifications.broadcast(self.event, 'Lunch', 'Now'))
+        self.assertEqual([(m['type'], m['data']['title']) for m in messages], [('announcement', 'Lunch')])
+
+        channels = [live.user_channel(self.leader.pk), live.user_channel(self.member.pk)]
+        messages = self.collect(channels, lambda: join_team(self.team, self.member))
+        self.assertEqual([(m['type'], m['data']['change'], m['data']['team_name']) for m in messages],
+                         [('membership', 'joined', 'Team')] * 2)
+
+    def test_bulk_actions_publish_what_their_skipped_signals_would(self):
+        """Test that disbanding tells the members they left and publishing events refreshes the timeline"""
+        join_team(self.team, self.member)
+        channels = [live.user_channel(self.leader.pk), live.user_channel(self.member.pk)]
+        messages = self.collect(channels, lambda: bulk.disband_teams(Team.objects.filter(pk=self.team.pk)))
+        self.assertEqual([(m['type'], m['data']['participant_id'], m['data']['change']) for m in messages],
+                         [('membership', self.member.pk, 'left')] * 2)
+
+        messages = self.collect([live.event_channel(self.event.id)],
+                                lambda: bulk.set_event_status(Event.objects.filter(pk=self.event.pk), 'completed'))
+        self.assertEqual([m['type'] for m in messages], ['timeline'])
+
+    def test_pages_subscribe_to_their_event(self):
+        """Test that event pages point base.js at the stream for their event"""
+        response = self.client.get(reverse('event_detail', args=[self.event.id]))
+        self.assertContains(response, f'data-live-url="{reverse("live_updates")}?event={self.event.id}"')
+        self.assertContains(response, 'id="challenges"')
+
+
+class SkillIndexTest(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(event_name='CodeFest', title='CodeFest 2025', hero_section_details='Build',
+                                          event_status='published')
+        self.profiles = {
+            name: self.add_participant(name, branch, year, skills_text)
+            for name, branch, year, skills_text in [
+                ('asha', 'CSE', 3, 'ReactJS, Python; ML'),
+                ('ben', 'CSE', 3, 'react.js'),
+                ('chitra', 'ECE', 3, 'Python, Django'),
+                ('dev', 'CSE', 2, 'React, Python'),
+            ]
+        }
+        team = Team.objects.create(event=self.event, team_name='Team', team_code='TEAM0000',
+                                   leader=self.profiles['ben'].user)
+        TeamMember.objects.create(team=team, participant=self.profiles['ben'].user, role='Leader', status='accepted')
+
+    def add_participant(self, username, branch, year, skills_text):
+        user = User.objects.create_user(username=username, first_name=username.title())
+        profile = UserProfile.objects.create(user=user, user_role='Participant', branch=branch,
+                                             year_of_study=year, skills=skills_text)
+        skills.index_profile(profile)
+        return profile
+
+    def names(self, profiles):
+        return sorted(profile.user.username for profile in profiles)
+
+    def test_skills_are_tokenized_case_folded_and_aliased(self):
+        """Test that free-text skill lists index under one canonical name per skill"""
+        self.assertEqual(skills.parse_skills('ReactJS, python3 ;\n- ML.', 'JS | .NET', None),
+                         {'react', 'python', 'machine learning', 'javascript', '.net'})
+        self.assertEqual(
+            set(ProfileSkill.objects.filter(profile=self.profiles['asha']).values_list('skill', flat=True)),
+            {'react', 'python', 'machine learning'},
+        )
+
+    def test_search_matches_all_or_any_skill(self):
+        """Test that multi-skill queries support AND and OR"""
+        self.assertEqual(self.names(skills.search('react, python')), ['asha', 'dev'])
+        self.assertEqual(self.names(skills.search(['Django', 'React.js'], match='any')),
+                         ['asha', 'ben', 'chitra', 'dev'])
+        self.assertEqual(self.names(skills.search('rust')), [])
+
+    def test_search_filters_by_branch_year_and_team(self):
+        """Test that "unteamed 3rd-years in CSE who know React" excludes team members"""
+        self.assertEqual(self.names(skills.search('react', branch='cse', year_of_study=3)), ['asha', 'ben'])
+        self.assertEqual(
+            self.names(skills.search('react', branch='CSE', year_of_study=3, unteamed_for=self.event)),
+            ['asha'],
+        )
+
+    def test_profile_form_updates_the_index_incrementally(self):
+        """Test that saving the profile form adds and removes only the changed skills"""
+        profile = self.profiles['asha']
+        kept = ProfileSkill.objects.get(profile=profile, skill='react').pk
+        self.client.force_login(profile.user)
+        self.client.post(reverse('profile'), {'skills': 'React, Figma', 'technical_skills': 'Go'})
+        indexed = dict(ProfileSkill.objects.filter(profile=profile).values_list('skill', 'pk'))
+        self.assertEqual(set(indexed), {'react', 'figma', 'go'})
+        self.assertEqual(indexed['react'], kept)
+
+    def test_registration_and_rebuild_index_profiles(self):
+        """Test that registering indexes the new profile and the command rebuilds from scratch"""
+        form = ParticipantRegistrationForm({
+            'username': 'esha', 'email': 'esha@example.com', 'full_name': 'Esha',
+            'student_roll_number': '21CS999', 'branch': 'CSE', 'year_of_study': 1,
+            'phone_number': '9999999999', 'skills': 'Flutter, Node',
+            'password1': 'a-Long-passw0rd', 'password2': 'a-Long-passw0rd',
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        user = form.save()
+        self.assertEqual(self.names(skills.search('flutter, node.js')), ['esha'])
+
+        ProfileSkill.objects.all().delete()
+        call_command('rebuild_skill_index', stdout=StringIO())
+        self.assertEqual(ProfileSkill.objects.filter(profile_id=user.pk).count(), 2)
+        self.assertEqual(self.names(skills.search('react, python')), ['asha', 'dev'])
+
+    def test_search_view_pages_json(self):
+        """Test that the search endpoint filters on the active event and pages by cursor"""
+        self.client.force_login(self.profiles['dev'].user)
+        url = reverse('participant_search')
+        data = self.client.get(url, {'skills': 'react', 'unteamed': 'on'}).json()
+        self.assertEqual([row['username'] for row in data['results']], ['asha', 'dev'])
+        self.assertEqual(data['results'][0]['skills'], ['machine learning', 'python', 'react'])
+
+        data = self.client.get(url, {'skills': 'python', 'after': self.profiles['asha'].pk}).json()
+        self.assertEqual([row['username'] for row in data['results']], ['chitra', 'dev'])
+        self.assertIsNone(data['next_cursor'])
+        self.assertEqual(self.client.get(url, {'year_of_study': 9}).status_code, 400)
+
+
+class RecommendationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = Event.objects.create(event_name='CodeFest', title='CodeFest 2025', hero_section_details='Build',
+                                          event_status='published')
+        self.solo = self.add_participant('solo', 'CSE', 3, 'React, JavaScript')
+        self.backend = self.add_participant('backend', 'ECE', 3, 'Python, Django, SQL')
+        self.twin = self.add_participant('twin', 'CSE', 3, 'React, JavaScript')
+        self.senior = self.add_participant('senior', 'CSE', 1, 'React')
+        self.open_team = self.add_team('Open', 'OPEN0000', [('lead', 'ECE', 3, 'Python, Django')], max_size=4)
+        self.full_team = self.add_team('Full', 'FULL0000', [('full', 'MECH', 3, 'Figma')], max_size=1)
+
+    def add_participant(self, username, branch, year, skills_text):
+        user = User.objects.create_user(username=username, first_name=username.title())
+        profile = UserProfile.objects.create(user=user, user_role='Participant', branch=branch,
+                                             year_of_study=year, skills=skills_text)
+        skills.index_profile(profile)
+        return user
+
+    def add_team(self, name, code, members, max_size):
+        users = [self.add_participant(*member) for member in members]
+        team = Team.objects.create(event=self.event, team_name=name, team_code=code, leader=users[0], max_size=max_size)
+        for user in users:
+            join_team(team, user)
+        return team
+
+    def test_pool_is_ranked_by_complementary_skills_branch_and_year(self):
+        """Test that the batch ranks complementary, other-branch, same-year candidates first"""
+        self.assertEqual(recommendations.precompute(self.event.id), 4)
+        entry = cache.get(recommendations.recommendation_key(self.event.id, self.solo.pk))
+        self.assertEqual([pk for pk, _ in entry['people']], [self.backend.pk, self.twin.pk, self.senior.pk])
+        self.assertEqual([pk for pk, _ in entry['teams']], [self.open_team.pk])
+        self.assertIsNone(cache.get(recommendations.recommendation_key(self.event.id, self.open_team.leader_id)))
+
+    def test_suggestions_drop_candidates_that_joined_a_team(self):
+        """Test that a cached pick who has since found a team is not suggested"""
+        call_command('recommend_teammates', stdout=StringIO())
+        join_team(self.open_team, self.backend)
+        people, teams = recommendations.suggestions(self.solo, self.event.id)
+        self.assertEqual([profile.user for profile in people], [self.twin, self.senior])
+        self.assertEqual(teams, [self.open_team])
+
+    def test_dashboard_reads_suggestions_from_the_cache(self):
+        """Test that the dashboard shows the precomputed picks and scores nothing per request"""
+        self.client.force_login(self.solo)
+        self.assertNotContains(self.client.get(reverse('participant_dashboard')), 'Suggested Teammates')
+        call_command('recommend_teammates', event=self.event.id, stdout=StringIO())
+        response = self.client.get(reverse('participant_dashboard'))
+        self.assertContains(response, 'Suggested Teammates')
+        self.assertContains(response, 'Backend')
+        self.assertContains(response, 'Ask Lead for the invite code')
+        self.assertNotContains(response, 'FULL0000')
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], REPLICA_STICKY_SECONDS=10)
+class PrimaryReplicaRouterTest(SimpleTestCase):
+    def route(self, method='GET', sticky=False, write=False):
+        """Runs a request through ReplicaRoutingMiddleware; returns (reads before, after the view's write, response)."""
+        seen = []
+
+        def view(request):
+            seen.append(router.db_for_read(Event))
+            if write:
+                router.db_for_write(Team)
+            seen.append(router.db_for_read(Event))
+            return HttpResponse()
+        request = RequestFactory().generic(method, '/')
+        if sticky:
+            request.COOKIES[routers.STICKY_COOKIE] = '1'
+        response = ReplicaRoutingMiddleware(view)(request)
+        return seen[0], seen[1], response
+
+    def test_safe_requests_read_from_a_replica(self):
+        """Test that GET reads go to the replica and POST reads stay on the primary"""
+        self.assertEqual(self.route('GET')[:2], ('replica', 'replica'))
+        self.assertEqual(self.route('POST')[:2], ('default', 'default'))
+        self.assertEqual(router.db_for_read(Event), 'default')
+
+    def test_writes_make_the_browser_sticky_to_the_primary(self):
+        """Test that a write moves the rest of the request and the next few seconds to the primary"""
+        before, after, response = self.route('GET', write=True)
+        self.assertEqual((before, after), ('replica', 'default'))
+        self.assertEqual(response.cookies[routers.STICKY_COOKIE]['max-age'], 10)
+        self.assertEqual(self.route('GET', sticky=True)[:2], ('default', 'default'))
+        self.assertNotIn(routers.STICKY_COOKIE, self.route('GET')[2].cookies)
+
+    def test_sessions_and_explicit_replica_blocks(self):
+        """Test that sessions never read from a replica, and blocks can opt in or out"""
+        with routers.replica_reads():
+            self.assertEqual(router.db_for_read(Session), 'default')
+            self.assertEqual(router.db_for_read(Event), 'replica')
+            with routers.primary_reads():
+                self.assertEqual(router.db_for_read(Event), 'default')
+            self.assertEqual(router.db_for_read(Event), 'replica')
+            self.assertEqual(router.db_for_write(Event), 'default')
+            self.assertEqual(router.db_for_read(Event), 'default')
+        self.assertEqual(router.db_for_read(Event), 'default')
+
+    async def test_async_views_share_the_request_routing(self):
+        """Test that the routing reaches the ORM's thread under ASGI"""
+        seen = []
+
+        async def view(request):
+            seen.append(await sync_to_async(router.db_for_read)(Event))
+            await sync_to_async(router.db_for_write)(Team)
+            seen.append(router.db_for_read(Event))
+            return HttpResponse()
+        response = await ReplicaRoutingMiddleware(view)(AsyncRequestFactory().get('/'))
+        self.assertEqual(seen, ['replica', 'default'])
+        self.assertIn(routers.STICKY_COOKIE, response.cookies)
+
+
+@unittest.skipUnless('replica' in settings.DATABASE_REPLICAS,
+                     "needs a 'replica' database, e.g. KVS_DATABASE=sqlite_replica")
+class ReplicaRoutingTest(TransactionTestCase):
+    # Not 'replica' outright: the runner sets up the databases of skipped tests too
+    databases = {'default', *settings.DATABASE_REPLICAS}
+
+    def setUp(self):
+        cache.clear()
+        # Only on the primary: nothing replicates between the two test databases
+        self.event = Event.objects.create(event_name='CodeFest', title='CodeFest 2025', hero_section_details='Build',
+                                          event_status='published')
+        user = User.objects.create_user(username='asha', password='a-Long-passw0rd')
+        UserProfile.objects.create(user=user, user_role='Participant')
+
+    def test_login_reads_its_writes_from_the_primary(self):
+        """Test that a user who just logged in is read from the primary for a while, then the replica"""
+        url = reverse('notifications')
+        response = self.client.post(reverse('login'), {'username': 'asha', 'password': 'a-Long-passw0rd'})
+        self.assertRedirects(response, reverse('home'), fetch_redirect_response=False)
+        self.assertIn(routers.STICKY_COOKIE, response.cookies)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        # Once the window is over the replica answers, and it has no such user
+        del self.client.cookies[routers.STICKY_COOKIE]
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+    def test_cache_rebuilds_read_the_primary(self):
+        """Test that caches emptied by a write are not refilled from a lagging replica"""
+        user = User.objects.get(username='asha')
+        # The replica has the event and user, but not the latest edit and announcement
+        User.objects.using('replica').create(pk=user.pk, username='asha', password=user.password)
+        UserProfile.objects.using('replica').create(user_id=user.pk, user_role='Participant')
+        Event.objects.using('replica').create(pk=self.event.pk, event_name='CodeFest', title='Old title',
+                                              hero_section_details='Build', event_status='published')
+        notifications.broadcast(self.event, 'Lunch', 'Now')
+
+        page = self.client.get(reverse('event_detail', args=[self.event.id]))
+        self.assertContains(page, 'CodeFest 2025')
+        self.assertNotContains(page, 'Old title')
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(reverse('notifications_unread_count')).json(), {'unread': 1})
+
+    def test_exports_read_from_the_replica(self):
+        """Test that an export streams the replica's rows"""
+        admin = User.objects.create_user(username='admin', is_staff=True, is_superuser=True)
+        UserProfile.objects.create(user=admin, user_role='Admin')
+        # The replica's copy of what the export reads
+        User.objects.using('replica').create(pk=admin.pk, username='admin', password=admin.password,
+                                            is_staff=True, is_superuser=True)
+        UserProfile.objects.using('replica').create(user_id=admin.pk, user_role='Admin')
+        Event.objects.using('replica').create(pk=self.event.pk, event_name='CodeFest', title='CodeFest 2025',
+                                              hero_section_details='Build', event_status='published')
+        Team.objects.using('replica').create(event_id=self.event.pk, team_name='Replicated', team_code='REPL0000',
+                                             leader_id=admin.pk)
+        self.client.force_login(admin)
+        response = self.client.get(reverse('event_export', args=[self.event.id, 'teams', 'csv']))
+        self.assertIn('Replicated', b''.join(response.streaming_content).decode())
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+
+from .cache import page_cache_key, single_flight
+from .models import Event, ProblemStatement
+from .routers import primary_reads
+
+# ==============================================================================
+# EVENT PHASE TIMELINE
+# ==============================================================================
+# The countdown on the event pages only needs the event's phase boundaries.
+# They are cached per event and dropped with the event's cached pages, so the
+# timeline endpoint does not touch the database between edits.
+
+# Boundaries in chronological order, each with the phase it ends.
+PHASES = (
+    ('registration_start', 'upcoming'),
+    ('registration_end', 'registration_open'),
+    ('event_start', 'registration_closed'),
+    ('problem_release', 'starting'),
+    ('event_end', 'live'),
+)
+FINAL_PHASE = 'ended'
+
+
+def boundaries(event_id):
+    """
+    The phase boundaries of a published event, or None if there is no such
+    event. problem_release is the first problem statement's unlock time.
+    """
+    key = page_cache_key('timeline', event_id)
+    bounds = cache.get(key)
+    if bounds is None:
+        with primary_reads():
+            bounds = (
+                Event.objects.filter(id=event_id, event_status='published')
+                .annotate(problem_release=Min('problem_statements__time_to_unlock'))
+                .values(*(name for name, _ in PHASES))
+                .first()
+            )
+        if bounds is None:
+            return None
+        cache.set(key, bounds, settings.PAGE_CACHE_TIMEOUT)
+    return bounds
+
+
+def current_phase(bounds, now):
+    """Returns (phase, next_boundary); next_boundary is None once the event has ended."""
+    for name, phase in PHASES:
+        at = bounds[name]
+        if at is not None and now < at:
+            return phase, at
+    return FINAL_PHASE, None
+
+
+# ==============================================================================
+# PROBLEM STATEMENT RELEASE
+# ==============================================================================
+# An event's problem statements are cached once, sorted by unlock time, so the
+# released set at any instant is a prefix of that list worked out in memory.
+# Nothing expires at the unlock second itself, so the refresh spike that
+# follows it does not reach the database; a rebuild after an edit or an
+# eviction is single-flight.
+
+
+def _problem_schedule(event_id):
+    def rebuild():
+        problems = ProblemStatement.objects.filter(event_id=event_id).order_by('time_to_unlock', 'pk')
+        return list(problems), None
+    return single_flight(page_cache_key('problems', event_id), rebuild, settings.PAGE_CACHE_TIMEOUT)
+
+
+def released_problems(event_id, now=None):
+    """
+    Returns (problem statements unlocked at `now`, when the next one unlocks).
+    The second item is None once everything is released.
+    """
+    now = now or timezone.now()
+    schedule = _problem_schedule(event_id)
+    released = [problem for problem in schedule if problem.time_to_unlock <= now]
+    next_unlock = schedule[len(released)].time_to_unlock if len(released) < len(schedule) else None
+    return released, next_unlock
@@ -5,6 +5,7 @@ urlpatterns = [
     # Public Pages
     path('', views.index_view, name='index'), # Public landing page
     path('event/<int:event_id>/', views.event_detail_view, name='event_detail'),
+    path('event/<int:event_id>/timeline.json', views.event_timeline_view, name='event_timeline'),
     path('home/', views.home_view, name='home'), # Authenticated dashboard
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
@@ -13,10 +14,16 @@ urlpatterns = [
     # Participant Pages
     path('profile/', views.profile_view, name='profile'),
     path('team/create/', views.team_create_view, name='team_create'),
+    path('team/join/', views.team_join_view, name='team_join'),
     path('notifications/', views.notifications_view, name='notifications'),
+    path('notifications/unread-count/', views.unread_count_view, name='notifications_unread_count'),
+    path('live/', views.live_updates_view, name='live_updates'),
+    path('participants/search/', views.participant_search_view, name='participant_search'),
     path('participant/dashboard/', views.participant_dashboard_view, name='participant_dashboard'),
 
 
     # Judge Pages
     path('judge/dashboard/', views.judge_dashboard_view, name='judge_dashboard'),
+    path('leaderboard/', views.leaderboard_view, name='leaderboard'),
+    path('event/<int:event_id>/export/<slug:kind>.<slug:fmt>', views.event_export_view, name='event_export'),
 ]
\ No newline at end of file
@@ -1,17 +1,24 @@
 from django.shortcuts import render
-from django.http import HttpResponseServerError
+from django.http import HttpResponseServerError, JsonResponse
 # Global error handler
 def custom_error_view(request, exception=None):
     return render(request, 'portal/error.html', status=500)
-from django.shortcuts import render, redirect, get_object_or_404
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
 from functools import wraps
+import math
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
 from django.contrib.auth.forms import AuthenticationForm
+from django.core.paginator import Paginator
 from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, set_response_etag
 
 # Import all necessary models and forms from your application
 from .models import (
@@ -19,7 +26,22 @@ from .models import (
 )
 from .forms import (
     ParticipantRegistrationForm, UserProfileForm, TeamCreateForm, 
-    TeamJoinForm, SubmissionForm, AnnouncementForm, EventForm
+    TeamJoinForm, SubmissionForm, AnnouncementForm, EventForm, ParticipantSearchForm
+)
+from .cache import cache_anonymous_page
+from . import exports, leaderboard, live, notifications, recommendations, skills, timeline
+from .assignments import unscored_queue
+from .teams import AlreadyOnTeam, TeamFull, TeamNameTaken, join_team, save_new_team
+
+# Everything event_content.html renders, fetched up front instead of per loop.
+# Problem statements come from timeline.released_problems() instead.
+EVENT_CONTENT_PREFETCH = (
+    'benefits',
+    'schedules__sub_schedules',
+    'faqs',
+    'eligibility',
+    'steps',
+    'organizers',
 )
 
 # ==============================================================================
@@ -28,49 +50,92 @@ from .forms import (
 def role_required(allowed_roles=[]):
     """
     Decorator to restrict access to views based on the user's role.
+    Works on both sync and async views.
     """
+    def check_role(user):
+        try:
+            if user.userprofile.user_role not in allowed_roles:
+                raise PermissionDenied
+        except UserProfile.DoesNotExist:
+            raise PermissionDenied
+
     def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped_view(request, *args, **kwargs):
+                user = await _resolve_user(request)
+                if not user.is_authenticated:
+                    return redirect('login')
+                check_role(user)
+                return await view_func(request, *args, **kwargs)
+            return _wrapped_view
+
         @wraps(view_func)
         def _wrapped_view(request, *args, **kwargs):
             if not request.user.is_authenticated:
                 return redirect('login')
-            
-            try:
-                if request.user.userprofile.user_role in allowed_roles:
-                    return view_func(request, *args, **kwargs)
-                else:
-                    raise PermissionDenied
-            except UserProfile.DoesNotExist:
-                raise PermissionDenied
+            check_role(request.user)
+            return view_func(request, *args, **kwargs)
         return _wrapped_view
     return decorator
 
+async def _resolve_user(request):
+    """
+    Loads the user through the async auth API and pins it on request.user, so
+    templates reading {{ user }} in an async view do not trigger a
+    synchronous lookup (SynchronousOnlyOperation).
+    """
+    request.user = await request.auser()
+    return request.user
+
 # ==============================================================================
 # 2. PUBLIC & AUTHENTICATION VIEWS
 # ==============================================================================
-def home_view(request):
+# The read-heavy pages below are async views. Under KVSRITspc.asgi a request
+# waiting on the database or cache then holds no worker thread; under WSGI
+# Django runs them in an event loop per request, with the same queries.
+# Everything a template renders is fetched before render(), since a lazy
+# queryset evaluated inside the template would query from the event loop.
+
+async def home_view(request):
     """
     The main homepage. Displays a list of all published events.
     """
-    events = Event.objects.filter(event_status='published').order_by('-event_start')
+    await _resolve_user(request)
+    events = [event async for event in Event.objects.filter(event_status='published').order_by('-event_start')]
     return render(request, 'portal/home.html', {'events': events})
 
-def event_detail_view(request, event_id):
+@cache_anonymous_page('event')
+async def event_detail_view(request, event_id):
     """
     Displays all details for a single event.
     """
-    event = get_object_or_404(
-        Event.objects.prefetch_related(
-            'schedules__sub_schedules', 
-            'faqs',
-            'eligibility',
-            'steps',
-            'organizers'
-        ), 
+    await _resolve_user(request)
+    event = await aget_object_or_404(
+        Event.objects.select_related('media').prefetch_related(*EVENT_CONTENT_PREFETCH),
         id=event_id, 
         event_status='published'
     )
-    return render(request, 'portal/event_detail.html', {'event': event})
+    return await _render_event_page(request, 'portal/event_detail.html', event)
+
+def event_timeline_view(request, event_id):
+    """
+    The event's phase boundaries as JSON, for the countdown. The response can
+    be cached by browsers and proxies until the next boundary (at most
+    TIMELINE_MAX_AGE) and is revalidated with its ETag.
+    """
+    bounds = timeline.boundaries(event_id)
+    if bounds is None:
+        raise Http404("No published event with this id.")
+    phase, next_boundary = timeline.current_phase(bounds, timezone.now())
+    response = JsonResponse({'event': event_id, 'phase': phase, 'next_boundary': next_boundary, **bounds})
+
+    max_age = settings.TIMELINE_MAX_AGE
+    if next_boundary is not None:
+        max_age = min(max_age, max(0, math.ceil((next_boundary - timezone.now()).total_seconds())))
+    patch_cache_control(response, public=True, max_age=max_age)
+    set_response_etag(response)
+    return get_conditional_response(request, etag=response['ETag'], response=response)
 
 def register_view(request):
     """
@@ -114,29 +179,35 @@ def logout_view(request):
     messages.info(request, "You have been successfully logged out.")
     return redirect('home')
 
-def index_view(request):
+@cache_anonymous_page('index')
+async def index_view(request):
     """
                 if user.is_superuser:
                     return redirect('/admin/')
                 return redirect('home')
     If no event exists, show a message.
     """
-    event = Event.objects.order_by('-id').first()
-    countdown = None
-    event_message = None
-    now = timezone.now()
-    if not event:
-        event_message = "Event will be updated soon."
-    else:
-        if hasattr(event, 'registration_end') and now < event.registration_end:
-            countdown = {'type': 'registration_end', 'target': event.registration_end}
-        elif hasattr(event, 'event_start') and now < event.event_start:
-            countdown = {'type': 'event_start', 'target': event.event_start}
-        elif hasattr(event, 'problem_statements') and event.problem_statements.exists():
-            problem = event.problem_statements.order_by('time_to_unlock').first()
-            if problem and now < problem.time_to_unlock:
-                countdown = {'type': 'problem_release', 'target': problem.time_to_unlock}
-    return render(request, 'portal/index.html', {'event': event, 'countdown': countdown, 'event_message': event_message, 'now': now})
+    await _resolve_user(request)
+    # Published only, like event_timeline_view: a draft's countdown would never load
+    event = await (
+        Event.objects.filter(event_status='published').select_related('media')
+        .prefetch_related(*EVENT_CONTENT_PREFETCH).order_by('-id').afirst()
+    )
+    event_message = None if event else "Event will be updated soon."
+    # The countdown phase is worked out client-side from event_timeline_view.
+    return await _render_event_page(request, 'portal/index.html', event, {'event_message': event_message})
+
+async def _render_event_page(request, template, event, context=None):
+    """
+    Renders a page built on event_content.html with only the problem
+    statements released so far. A cached copy expires when the next unlocks.
+    """
+    problem_statements, next_unlock = (
+        await sync_to_async(timeline.released_problems)(event.id) if event else ([], None)
+    )
+    response = render(request, template, {'event': event, 'problem_statements': problem_statements, **(context or {})})
+    response.page_cache_expires_at = next_unlock
+    return response
 
 # ==============================================================================
 # 3. PARTICIPANT-SPECIFIC VIEWS
@@ -147,17 +218,26 @@ def participant_dashboard_view(request):
     """
     Main hub for participants. Shows team status and allows creating/joining teams.
     """
+    members = []
     try:
-        team_membership = TeamMember.objects.select_related('team__event').get(participant=request.user)
+        team_membership = TeamMember.objects.select_related('team__event', 'team__submission').get(participant=request.user)
         team = team_membership.team
+        members = list(team.members.select_related('participant'))
     except TeamMember.DoesNotExist:
         team = None
 
     active_event = Event.objects.filter(event_status='published').first()
+    suggested_people, suggested_teams = [], []
+    if team is None and active_event is not None:
+        # Precomputed by `manage.py recommend_teammates`
+        suggested_people, suggested_teams = recommendations.suggestions(request.user, active_event.id)
 
     context = {
         'team': team,
+        'members': members,
         'active_event': active_event,
+        'suggested_people': suggested_people,
+        'suggested_teams': suggested_teams,
         'team_create_form': TeamCreateForm(),
         'team_join_form': TeamJoinForm(),
     }
@@ -168,7 +248,11 @@ def profile_view(request):
     """
     Allows a user to view and edit their own profile details.
     """
-    profile = get_object_or_404(UserProfile, user=request.user)
+    try:
+        # Already loaded with the user by ProfileModelBackend
+        profile = request.user.userprofile
+    except UserProfile.DoesNotExist:
+        raise Http404("This account has no profile.")
     if request.method == 'POST':
         form = UserProfileForm(request.POST, instance=profile)
         if form.is_valid():
@@ -190,14 +274,21 @@ def team_create_view(request):
         form = TeamCreateForm(request.POST)
         active_event = Event.objects.filter(event_status='published').first()
         if form.is_valid() and active_event:
-            if TeamMember.objects.filter(participant=request.user, team__event=active_event).exists():
+            team = form.save(commit=False)
+            team.event = active_event
+            team.leader = request.user
+            try:
+                # A refused leader join takes the new team back with it
+                with transaction.atomic():
+                    save_new_team(team)
+                    join_team(team, request.user, role='Leader')
+            except AlreadyOnTeam:
                 messages.error(request, "You are already in a team for this event.")
+            except TeamNameTaken:
+                messages.error(request, f"A team named '{team.team_name}' already exists. Please pick another name.")
+            except TeamFull:
+                messages.error(request, "A team needs room for at least its leader.")
             else:
-                team = form.save(commit=False)
-                team.event = active_event
-                team.leader = request.user
-                team.save()
-                TeamMember.objects.create(team=team, participant=request.user, status='accepted', role='Leader')
                 messages.success(request, f"Team '{team.team_name}' created successfully! Your invite code is {team.team_code}")
     return redirect('participant_dashboard')
 
@@ -213,28 +304,119 @@ def team_join_view(request):
         if form.is_valid() and active_event:
             team_code = form.cleaned_data['team_code']
             try:
-                team_to_join = Team.objects.get(team_code__iexact=team_code, event=active_event)
-                if TeamMember.objects.filter(participant=request.user, team__event=active_event).exists():
-                    messages.error(request, "You are already in a team for this event.")
-                elif team_to_join.members.count() >= team_to_join.max_size:
-                     messages.error(request, f"Team '{team_to_join.team_name}' is already full.")
-                else:
-                    TeamMember.objects.create(team=team_to_join, participant=request.user, status='accepted')
-                    messages.success(request, f"You have successfully joined team '{team_to_join.team_name}'.")
+                # TeamJoinForm upper-cases the code, so this is an exact unique-index lookup
+                team_to_join = Team.objects.get(team_code=team_code, event=active_event)
+                # join_team checks "one team per event" under a lock, so a
+                # concurrent join to another team is refused here too
+                join_team(team_to_join, request.user)
+                messages.success(request, f"You have successfully joined team '{team_to_join.team_name}'.")
             except Team.DoesNotExist:
                 messages.error(request, "Invalid team code. Please try again.")
+            except TeamFull:
+                messages.error(request, f"Team '{team_to_join.team_name}' is already full.")
+            except AlreadyOnTeam:
+                messages.error(request, "You are already in a team for this event.")
     return redirect('participant_dashboard')
 
 @login_required
-def notifications_view(request):
+@role_required(['Participant', 'Admin'])
+def participant_search_view(request):
+    """
+    Participants by skill, branch and year as JSON, read from the skill index
+    (portal/skills.py) and keyset-paginated on the profile id.
+    """
+    form = ParticipantSearchForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    filters = form.cleaned_data
+    unteamed_for = None
+    if filters['unteamed']:
+        unteamed_for = Event.objects.filter(event_status='published').values_list('id', flat=True).first()
+        if unteamed_for is None:
+            return JsonResponse({'results': [], 'next_cursor': None})
+    profiles = skills.search(
+        filters['skills'], match=filters['match'] or 'all', branch=filters['branch'],
+        year_of_study=filters['year_of_study'], unteamed_for=unteamed_for,
+    )
+    if filters['after'] is not None:
+        profiles = profiles.filter(pk__gt=filters['after'])
+    page_size = skills.SEARCH_PAGE_SIZE
+    page = list(profiles.select_related('user').prefetch_related('indexed_skills')[:page_size + 1])
+    next_cursor = page[page_size - 1].pk if len(page) > page_size else None
+    return JsonResponse({
+        'results': [
+            {
+                'user_id': profile.pk,
+                'username': profile.user.username,
+                'name': profile.user.first_name,
+                'branch': profile.branch,
+                'year_of_study': profile.year_of_study,
+                'highlight': profile.highlight,
+                'skills': sorted(skill.skill for skill in profile.indexed_skills.all()),
+            }
+            for profile in page[:page_size]
+        ],
+        'next_cursor': next_cursor,
+    })
+
+@login_required
+async def notifications_view(request):
     """
-    Display user notifications, marking them as read.
+    Display one page of the user's notifications, marking the shown ones as read.
     """
-    if not request.user.is_authenticated:
+    user = await _resolve_user(request)
+    if not user.is_authenticated:
         return redirect('login')
-    notifications = request.user.notifications.order_by('-created_at')
-    request.user.notifications.filter(is_read=False).update(is_read=True, updated_at=timezone.now())
-    return render(request, 'portal/notifications.html', {'notifications': notifications})
+    before = notifications.parse_cursor(request.GET.get('before', ''))
+
+    def read_page():
+        # Evaluate the page before marking it read, so new items still show as new
+        items, next_cursor = notifications.feed(user, before=before)
+        notifications.mark_read(user, items)
+        return items, next_cursor
+
+    # One hop to the ORM's thread for the whole read-then-mark sequence,
+    # rather than one per query through the async ORM methods.
+    items, next_cursor = await sync_to_async(read_page)()
+    context = {
+        'notifications': items,
+        'next_cursor': notifications.format_cursor(next_cursor) if next_cursor else None,
+    }
+    return render(request, 'portal/notifications.html', context)
+
+async def live_updates_view(request):
+    """
+    Server-Sent Events stream of live updates for one tab (see portal/live.py):
+    the event's channel when ?event=<id> is given, and the user's own
+    channel when logged in. Only served under ASGI, where an open stream
+    costs no thread; elsewhere 204 tells EventSource not to reconnect.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    channels = []
+    user = await _resolve_user(request)
+    if user.is_authenticated:
+        channels.append(live.user_channel(user.pk))
+    try:
+        event_id = int(request.GET['event'])
+    except (KeyError, ValueError):
+        event_id = None
+    else:
+        channels.append(live.event_channel(event_id))
+    if not channels:
+        return HttpResponse(status=204)
+    response = StreamingHttpResponse(live.stream(channels, event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@login_required
+def unread_count_view(request):
+    """
+    Unread notification count for the navbar badge, served from the cache.
+    """
+    return JsonResponse({'unread': notifications.unread_count(request.user)})
 
 # ==============================================================================
 # 4. EVENT MANAGER & JUDGE VIEWS
@@ -251,9 +433,54 @@ def manager_dashboard_view(request):
 @role_required(['Judge'])
 def judge_dashboard_view(request):
     """
-    Main dashboard for Judges to view and score submissions.
+    Main dashboard for Judges: their queue of assigned, not yet scored submissions.
+    """
+    try:
+        after = int(request.GET['after'])
+    except (KeyError, ValueError):
+        after = None
+    submissions, next_cursor = unscored_queue(request.user, after=after)
+    context = {
+        'submissions': submissions,
+        'next_cursor': next_cursor,
+        'now': timezone.now(),
+    }
+    return render(request, 'portal/judge_dashboard.html', context)
+
+@login_required
+@role_required(['Judge', 'Admin'])
+def leaderboard_view(request):
+    """
+    Ranked, paginated leaderboard of one event (?event=<id>, by default the
+    published one) read from the materialized LeaderboardEntry table.
     """
-    return render(request, 'portal/judge_dashboard.html')
+    events = Event.objects.only('id', 'title')
+    try:
+        event = events.get(id=int(request.GET['event']))
+    except KeyError:
+        event = events.filter(event_status='published').first()
+    except (ValueError, Event.DoesNotExist):
+        event = None
+    if event is None:
+        raise Http404("No such event.")
+    normalized = request.GET.get('rank') == 'normalized'
+    paginator = Paginator(leaderboard.ranked_entries(event, normalized=normalized), 50)
+    page = paginator.get_page(request.GET.get('page'))
+    return render(request, 'portal/leaderboard.html', {'page': page, 'normalized': normalized, 'event': event})
+
+@login_required
+@role_required(['Admin'])
+def event_export_view(request, event_id, kind, fmt):
+    """
+    Streams one of an event's rosters or results (see portal/exports.py) as a
+    CSV or JSON Lines download.
+    """
+    if kind not in exports.EXPORTS or fmt not in exports.FORMATS:
+        raise Http404("Unknown export.")
+    event = get_object_or_404(Event.objects.only('id'), id=event_id)
+    return exports.streaming_response(
+        kind, fmt, event_id=event.id, filename=f"event-{event.id}-{kind}",
+    )
 
 # (Add other manager/judge specific views here as needed)
 